@@ -0,0 +1,157 @@
+"""Glass-to-prediction latency: inline read() vs a read thread vs LatestFrameGrabber.
+
+A simulated camera exposes a frame every 1/--fps seconds into a driver queue
+of --buffers slots (like V4L2; new frames are dropped while it is full) and
+takes --decode-ms to decode a frame. The consumer "recognizes" each frame
+for --infer-ms. Latency is measured from the moment the frame was exposed
+to the end of recognition.
+
+    inline   the original loop: read() then recognize, one after the other
+    thread   a thread read()s (and decodes) every frame into a LatestSlot
+    grabber  LatestFrameGrabber: grab() every frame, decode only when asked
+
+    python benchmarks/bench_capture_latency.py [--seconds 5] [--infer-ms 60]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from frame_sources import LatestFrameGrabber
+from vision_pipeline import LatestSlot
+
+
+class BufferedCamera:
+    """Frames carry their exposure time; read() returns the oldest buffered one"""
+
+    live = True
+
+    def __init__(self, fps=30.0, buffers=4, decode_ms=4.0):
+        self.fps = fps
+        self.decode = decode_ms / 1000
+        self.queue = deque()
+        self.buffers = buffers
+        self.available = threading.Condition()
+        self.grabbed = None
+        self.decoded = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._expose, daemon=True)
+        self.thread.start()
+
+    def _expose(self):
+        next_frame = time.perf_counter()
+        while self.running:
+            next_frame += 1 / self.fps
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+            with self.available:
+                if len(self.queue) < self.buffers:
+                    self.queue.append(time.perf_counter())
+                    self.available.notify()
+
+    def isOpened(self):
+        return self.running
+
+    def grab(self):
+        with self.available:
+            self.available.wait_for(lambda: self.queue or not self.running)
+            if not self.queue:
+                return False
+            self.grabbed = self.queue.popleft()
+        return True
+
+    def retrieve(self):
+        time.sleep(self.decode)
+        self.decoded += 1
+        return True, np.array([self.grabbed])
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        self.running = False
+        with self.available:
+            self.available.notify_all()
+
+
+def recognize(frame, infer):
+    time.sleep(infer)
+    return time.perf_counter() - frame[0]
+
+
+def run_inline(camera, seconds, infer):
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        ok, frame = camera.read()
+        if ok:
+            latencies.append(recognize(frame, infer))
+    return latencies
+
+
+def run_thread(camera, seconds, infer):
+    slot = LatestSlot()
+
+    def capture():
+        while camera.running:
+            ok, frame = camera.read()
+            if ok:
+                slot.put(frame)
+
+    thread = threading.Thread(target=capture, daemon=True)
+    thread.start()
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame = slot.get(timeout=0.5)
+        if frame is not None:
+            latencies.append(recognize(frame, infer))
+    return latencies
+
+
+def run_grabber(camera, seconds, infer):
+    grabber = LatestFrameGrabber(camera)
+    grabber.start()
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame, _ = grabber.latest(timeout=0.5)
+        if frame is not None:
+            latencies.append(recognize(frame, infer))
+    grabber.running = False
+    return latencies
+
+
+MODES = {"inline": run_inline, "thread": run_thread, "grabber": run_grabber}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--buffers", type=int, default=4, help="driver queue length")
+    parser.add_argument("--decode-ms", type=float, default=4.0)
+    parser.add_argument("--infer-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{args.fps:.0f} fps camera, {args.buffers} driver buffers, decode {args.decode_ms:.0f} ms, "
+          f"recognize {args.infer_ms:.0f} ms\n")
+    print(f"{'mode':<10}{'results/s':>10}{'mean ms':>10}{'p95 ms':>9}{'decoded':>9}")
+    for name, run in MODES.items():
+        camera = BufferedCamera(args.fps, args.buffers, args.decode_ms)
+        latencies = np.array(run(camera, args.seconds, args.infer_ms / 1000)) * 1000
+        camera.release()
+        print(f"{name:<10}{len(latencies) / args.seconds:>10.1f}{latencies.mean():>10.1f}"
+              f"{np.percentile(latencies, 95):>9.1f}{camera.decoded:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Cost of the expensive recognizer alone vs behind the cheap skin/motion cascade.
+
+Runs the lecture-like session from bench_motion_gate.py (mostly idle, some
+held signs, some signing) through the expensive stage on every frame, then
+through CascadeRecognizer. Reports time per frame, how often the expensive
+stage ran, agreement of the per-frame predictions and the words emitted.
+
+The expensive stage is MediaPipe + the landmark classifier when
+--expensive mediapipe is given (needs mediapipe and real hands in the
+frames - use replay.py --recognizer cascade on a recorded clip). The default
+stand-in is the skin detector at full resolution without ROI tracking,
+which runs on the synthetic frames.
+
+    python benchmarks/bench_cascade.py [--seconds 60] [--expensive skin]
+"""
+import argparse
+import os
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from bench_motion_gate import lecture_frames
+from recognizers import CascadeRecognizer, LandmarkRecognizer, SkinRecognizer
+
+EXPENSIVE = {
+    "skin": lambda: SkinRecognizer(detection_scale=1.0, roi_tracking=False),
+    "mediapipe": LandmarkRecognizer,
+}
+
+
+def run(recognizer, frames):
+    predictions, words = [], []
+    start = time.perf_counter()
+    for frame in frames:
+        prediction, confidence, word = recognizer.process(frame)
+        predictions.append(prediction if confidence > recognizer.threshold else "")
+        if word:
+            words.append(word)
+    elapsed = time.perf_counter() - start
+    recognizer.close()
+    return elapsed, predictions, words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--expensive", choices=sorted(EXPENSIVE), default="skin")
+    args = parser.parse_args()
+    frames = lecture_frames(args.seconds * args.fps)
+    make = EXPENSIVE[args.expensive]
+
+    alone_time, alone_predictions, alone_words = run(make(), frames)
+    cascade = CascadeRecognizer(make(), fps=args.fps)
+    cascade_time, cascade_predictions, cascade_words = run(cascade, frames)
+    agree = sum(a == b for a, b in zip(alone_predictions, cascade_predictions)) / len(frames)
+
+    print(f"{len(frames)} frames ({args.seconds}s at {args.fps} fps), expensive stage: {args.expensive}\n")
+    print(f"{'mode':<10}{'ms/frame':>10}{'expensive runs':>16}{'agree':>8}{'words':>7}")
+    print(f"{'alone':<10}{alone_time / len(frames) * 1000:>10.2f}{len(frames):>16}{1:>8.1%}"
+          f"{len(alone_words):>7}")
+    print(f"{'cascade':<10}{cascade_time / len(frames) * 1000:>10.2f}{cascade.expensive_runs:>16}"
+          f"{agree:>8.1%}{len(cascade_words):>7}")
+    print(f"\n{cascade.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark skin/contour hand detection at several detection scales.
+
+Runs EnhancedSignLanguageRecognition.detect_fingers_skeletal over a sequence
+of synthetic 640x480 frames (a skin-coloured hand showing 0-5 fingers while
+moving across a noisy background) at 1x, 0.5x and 0.25x detection scale and
+reports frames per second plus finger-count and gesture agreement with 1x.
+
+    python benchmarks/bench_detection_scale.py [--frames 600] [--no-roi]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import synthetic_hand_frame
+from mute_studentpage import EnhancedSignLanguageRecognition
+
+
+def run(frames, scale, roi):
+    recognizer = EnhancedSignLanguageRecognition(session_code=None)
+    recognizer.detection_scale = scale
+    recognizer.roi_tracking = roi
+    gestures, fingers = [], []
+    start = time.perf_counter()
+    for frame in frames:
+        gesture, _, _ = recognizer.detect_fingers_skeletal(frame)
+        gestures.append(gesture)
+        fingers.append(recognizer.last_finger_count)
+    elapsed = time.perf_counter() - start
+    return len(frames) / elapsed, gestures, fingers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--no-roi", action="store_true", help="disable hand ROI tracking")
+    args = parser.parse_args()
+    frames = [synthetic_hand_frame(i) for i in range(args.frames)]
+    _, base_gestures, base_fingers = run(frames, 1.0, not args.no_roi)
+
+    print(f"{args.frames} frames, ROI tracking {'off' if args.no_roi else 'on'}\n")
+    print(f"{'scale':<8}{'fps':>8}{'finger agree':>14}{'gesture agree':>15}")
+    for scale in (1.0, 0.5, 0.25):
+        fps, gestures, fingers = run(frames, scale, not args.no_roi)
+        finger_agree = np.mean([a == b for a, b in zip(fingers, base_fingers)])
+        gesture_agree = np.mean([a == b for a, b in zip(gestures, base_gestures)])
+        print(f"{scale:<8}{fps:>8.0f}{finger_agree:>14.1%}{gesture_agree:>15.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""DTW template matching time as the template library grows: exhaustive vs pruned.
+
+Builds libraries of synthetic sign windows (sign lang/synthetic_landmarks.py,
+eight signs, random speed, phase, size and position) and matches held-out
+windows against them, once by exact DTW against every template and once
+with DTWMatcher's LB_Kim / LB_Keogh pruning and early abandoning. Reports
+time per query, DTWs computed, accuracy and how often the pruned search
+finished within the per-frame budget.
+
+    python benchmarks/bench_dtw.py [--sizes 50 100 200 400 800] [--queries 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, "sign lang"))
+
+from dtw_matcher import DTWMatcher
+from synthetic_landmarks import synthetic_dataset
+
+
+def timed(match, queries, labels):
+    times, correct = [], 0
+    for query, label in zip(queries, labels):
+        start = time.perf_counter()
+        predicted, _ = match(query)
+        times.append(time.perf_counter() - start)
+        correct += predicted == label
+    return np.array(times) * 1000, correct / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400, 800])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--exhaustive-queries", type=int, default=20,
+                        help="queries for the (slow) exhaustive search")
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    queries, query_labels = synthetic_dataset(args.queries, seed=12345)
+
+    print(f"{args.queries} queries, budget {args.budget_ms:.0f} ms\n")
+    print(f"{'templates':>9}{'exhaustive ms':>15}{'pruned ms':>11}{'p95 ms':>8}{'DTWs':>7}"
+          f"{'in budget':>11}{'accuracy':>10}")
+    for size in args.sizes:
+        windows, labels = synthetic_dataset(size, seed=size)
+        matcher = DTWMatcher(budget=args.budget_ms / 1000)
+        matcher.add(labels, windows)
+
+        exhaustive, _ = timed(matcher.exhaustive, queries[:args.exhaustive_queries],
+                              query_labels[:args.exhaustive_queries])
+        computed = complete = 0
+
+        def pruned_match(query):
+            nonlocal computed, complete
+            result = matcher.match(query)
+            computed += matcher.last["computed"]
+            complete += matcher.last["complete"]
+            return result
+
+        pruned, accuracy = timed(pruned_match, queries, query_labels)
+        print(f"{size:>9}{exhaustive.mean():>15.2f}{pruned.mean():>11.2f}"
+              f"{np.percentile(pruned, 95):>8.2f}{computed / len(queries):>7.1f}"
+              f"{complete / len(queries):>11.0%}{accuracy:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
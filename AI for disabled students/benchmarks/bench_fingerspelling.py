@@ -0,0 +1,138 @@
+"""Fingerspelling decode time per frame as the lexicon grows, with accuracy and how early the word shows.
+
+Lexicons are made of random pronounceable words with Zipf-like priors.
+Each test word is spelled as a noisy letter recognizer would see it: every
+letter held for 4-8 frames, a few transition (blank) frames between
+letters, a share of frames where a similar-looking letter wins, and a
+pause at the end. Reports decode time per frame, word accuracy of the
+lexicon-constrained beam search against greedy letter decoding (best
+letter per frame, kept after 3 frames in a row), and how much of the word
+was spelled when the displayed guess first became the right word.
+
+    python benchmarks/bench_fingerspelling.py [--sizes 100 1000 10000 50000] [--words 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fingerspelling import ALPHABET, BLANK, FingerspellingDecoder, LexiconTrie
+
+CONSONANTS = "BCDFGHJKLMNPRSTVWXZ"
+VOWELS = "AEIOUY"
+# Handshapes that are easy to confuse
+SIMILAR = {"A": "SE", "E": "SA", "S": "AE", "M": "NT", "N": "MT", "T": "MN",
+           "U": "VR", "V": "UK", "R": "UV", "K": "VP", "P": "KQ", "Q": "PG",
+           "G": "HQ", "H": "GU", "I": "JY", "J": "IY", "D": "LZ", "Z": "DX",
+           "C": "OE", "O": "CE", "F": "BW", "B": "FE", "W": "FV", "X": "ZD",
+           "L": "DY", "Y": "IL"}
+
+
+def lexicon_words(size, rng):
+    words = set()
+    while len(words) < size:
+        syllables = rng.integers(1, 5)
+        words.add("".join(rng.choice(list(CONSONANTS)) + rng.choice(list(VOWELS))
+                          for _ in range(syllables)) + rng.choice(["", "N", "S", "T", "X"]))
+    words = sorted(words)
+    priors = 1.0 / np.arange(1, size + 1)
+    return [words[i] for i in rng.permutation(size)], priors
+
+
+def frame_probabilities(letter, rng, confusion):
+    """{letter: p} for one frame showing letter (BLANK for a transition)"""
+    noise = rng.dirichlet(np.full(len(ALPHABET) + 1, 0.3)) * 0.2
+    probabilities = dict(zip(ALPHABET + BLANK, noise.tolist()))
+    if letter != BLANK and rng.random() < confusion:
+        letter, runner_up = rng.choice(list(SIMILAR[letter])), letter
+    else:
+        runner_up = rng.choice(list(SIMILAR.get(letter, "AE")))
+    top = rng.uniform(0.45, 0.8)
+    probabilities[letter] += top
+    probabilities[runner_up] += (0.8 - top) * 0.8
+    total = sum(probabilities.values())
+    return {key: p / total for key, p in probabilities.items()}
+
+
+def spelled(word, rng, confusion, pause):
+    """(probabilities per frame, number of letters shown by each frame)"""
+    frames, shown = [], []
+    for position, letter in enumerate(word):
+        for _ in range(rng.integers(2, 5) if position else 0):
+            frames.append(frame_probabilities(BLANK, rng, confusion))
+            shown.append(position)
+        for _ in range(rng.integers(4, 9)):
+            frames.append(frame_probabilities(letter, rng, confusion))
+            shown.append(position + 1)
+    frames += [None] * pause
+    shown += [len(word)] * pause
+    return frames, shown
+
+
+def greedy(frames, repeats=3):
+    """Best letter per frame, kept once it wins repeats frames in a row (like RepeatFilter)"""
+    letters, previous, run, accepted = [], BLANK, 0, False
+    for probabilities in frames:
+        letter = BLANK if probabilities is None else max(probabilities, key=probabilities.get)
+        run = run + 1 if letter == previous else 1
+        if letter != previous:
+            accepted = False
+        if run >= repeats and not accepted:
+            accepted = True
+            if letter != BLANK:
+                letters.append(letter)
+        previous = letter
+    return "".join(letters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--beam", type=int, default=8)
+    parser.add_argument("--confusion", type=float, default=0.2,
+                        help="share of frames where a similar letter wins")
+    args = parser.parse_args()
+
+    print(f"{args.words} spelled words per lexicon, beam {args.beam}, "
+          f"{args.confusion:.0%} confused frames\n")
+    print(f"{'lexicon':>8}{'trie nodes':>12}{'us/frame':>10}{'p99 us':>8}{'beam acc':>10}"
+          f"{'greedy acc':>12}{'spelled at guess':>18}")
+    for size in args.sizes:
+        rng = np.random.default_rng(size)
+        words, priors = lexicon_words(size, rng)
+        lexicon = LexiconTrie()
+        for word, prior in zip(words, priors):
+            lexicon.add(word, prior)
+        decoder = FingerspellingDecoder(lexicon, beam_width=args.beam)
+
+        targets = rng.choice(size, args.words, p=priors / priors.sum())
+        times, correct, greedy_correct, early = [], 0, 0, []
+        for target in targets:
+            word = words[target]
+            frames, shown = spelled(word, rng, args.confusion, decoder.pause_frames + 2)
+            decoder.reset()
+            committed, guessed_at = "", None
+            for probabilities, letters_shown in zip(frames, shown):
+                start = time.perf_counter()
+                _, guess, done = decoder.step(probabilities)
+                times.append(time.perf_counter() - start)
+                if guessed_at is None and guess == word:
+                    guessed_at = letters_shown / len(word)
+                committed = committed or done
+            correct += committed == word
+            greedy_correct += greedy(frames) == word
+            early.append(1.0 if guessed_at is None else guessed_at)
+
+        us = np.array(times) * 1e6
+        print(f"{size:>8}{lexicon.nodes:>12}{us.mean():>10.1f}{np.percentile(us, 99):>8.1f}"
+              f"{correct / args.words:>10.1%}{greedy_correct / args.words:>12.1%}"
+              f"{np.mean(early):>18.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Per-frame cost of building the sign_to_text landmark window.
+
+Compares the old path (extend a Python list over 21 landmark objects, pad or
+slice it, append to a deque, re-stack the deque for the model) with
+LandmarkWindow (write in place into a preallocated float32 ring, take the
+contiguous window view). Both include wrist-relative normalization of the
+window. Reports microseconds per frame and peak traced Python memory.
+
+    python benchmarks/bench_landmark_window.py [--frames 20000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sign lang"))
+
+from landmark_buffer import LandmarkWindow
+from landmark_classifier import SEQUENCE_LENGTH, normalize_windows
+from synthetic_landmarks import synthetic_dataset
+
+
+def mediapipe_like(frames):
+    """Landmark objects with x/y/z attributes, like results.multi_hand_landmarks[0].landmark"""
+    return [[SimpleNamespace(x=float(p[0]), y=float(p[1]), z=float(p[2])) for p in frame.reshape(21, 3)]
+            for frame in frames]
+
+
+def list_deque(hands):
+    sequence = deque(maxlen=SEQUENCE_LENGTH)
+    for landmarks in hands:
+        hand_landmarks = []
+        for lm in landmarks:
+            hand_landmarks.extend([lm.x, lm.y, lm.z])
+        if len(hand_landmarks) < 63:
+            hand_landmarks += [0] * (63 - len(hand_landmarks))
+        else:
+            hand_landmarks = hand_landmarks[:63]
+        sequence.append(hand_landmarks)
+        if len(sequence) == SEQUENCE_LENGTH:
+            normalize_windows(np.array(sequence, dtype=np.float32))
+
+
+def ring(hands):
+    window = LandmarkWindow(SEQUENCE_LENGTH)
+    for landmarks in hands:
+        window.push_landmarks(landmarks)
+        if window.full:
+            window.normalized()
+
+
+def measure(function, hands):
+    start = time.perf_counter()
+    function(hands)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(hands)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(hands) * 1e6, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    windows, _ = synthetic_dataset(args.frames // SEQUENCE_LENGTH + 1)
+    hands = mediapipe_like(windows.reshape(-1, 63)[:args.frames])
+
+    print(f"{len(hands)} frames\n")
+    print(f"{'path':<12}{'us/frame':>10}{'peak bytes':>12}")
+    for name, function in (("list+deque", list_deque), ("ring", ring)):
+        us, peak = measure(function, hands)
+        print(f"{name:<12}{us:>10.1f}{peak:>12,}")
+
+
+if __name__ == "__main__":
+    main()
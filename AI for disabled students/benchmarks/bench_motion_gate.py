@@ -0,0 +1,81 @@
+"""Measure how many frames the motion gate saves on a lecture-like sequence.
+
+Builds a synthetic session of 640x480 frames in which the student is mostly
+idle (empty, noisy background), sometimes holds a sign still and sometimes
+signs with a moving hand, then runs detect_fingers_skeletal on every frame
+and again behind MotionGate (reusing the last result on static frames).
+Reports the skipped fraction, detector time and gesture agreement.
+
+    python benchmarks/bench_motion_gate.py [--seconds 120] [--fps 30]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import synthetic_hand_frame
+from mute_studentpage import EnhancedSignLanguageRecognition
+from vision_pipeline import MotionGate
+
+# (activity, share of the session) - a student signs in short bursts
+ACTIVITIES = (("idle", 0.6), ("holding", 0.15), ("signing", 0.25))
+
+
+def lecture_frames(count, seed=0):
+    rng = np.random.default_rng(seed)
+    background = rng.integers(20, 70, size=(480, 640, 3), dtype=np.uint8)
+    frames, index = [], 0
+    while len(frames) < count:
+        activity = rng.choice([a for a, _ in ACTIVITIES], p=[p for _, p in ACTIVITIES])
+        length = int(rng.integers(30, 150))
+        held = synthetic_hand_frame(index)
+        for i in range(length):
+            if activity == "signing":
+                frame = synthetic_hand_frame(index + i)
+            elif activity == "holding":
+                frame = held.copy()
+            else:
+                frame = background.copy()
+            # Camera sensor noise on every frame
+            noise = rng.integers(-4, 5, size=frame.shape, dtype=np.int16)
+            frames.append(np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+        index += length
+    return frames[:count]
+
+
+def run(frames, gated):
+    recognizer = EnhancedSignLanguageRecognition(session_code=None)
+    gate = MotionGate() if gated else None
+    gestures, result = [], ("NO_HAND", 0.0, None)
+    detector_time = 0.0
+    for frame in frames:
+        if gate is None or gate.changed(frame):
+            start = time.perf_counter()
+            result = recognizer.detect_fingers_skeletal(frame)
+            detector_time += time.perf_counter() - start
+        gestures.append(result[0])
+    return detector_time, gestures, gate.skip_ratio if gate else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=120)
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+    frames = lecture_frames(args.seconds * args.fps)
+    base_time, base_gestures, _ = run(frames, False)
+    gated_time, gated_gestures, skipped = run(frames, True)
+    agree = np.mean([a == b for a, b in zip(base_gestures, gated_gestures)])
+
+    print(f"{len(frames)} frames ({args.seconds}s at {args.fps} fps)\n")
+    print(f"{'mode':<10}{'detector s':>12}{'skipped':>10}{'gesture agree':>15}")
+    print(f"{'every':<10}{base_time:>12.2f}{0:>10.0%}{1:>15.1%}")
+    print(f"{'gated':<10}{gated_time:>12.2f}{skipped:>10.0%}{agree:>15.1%}")
+
+
+if __name__ == "__main__":
+    main()
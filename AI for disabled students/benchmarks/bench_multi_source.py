@@ -0,0 +1,95 @@
+"""Aggregate throughput of several signing stations: threads vs processes.
+
+Every station is a SyntheticSource of --frames frames. The same stations are
+recognized (a) by one thread per station inside a single process, which
+share the interpreter lock, and (b) by MultiSourceRecognizer with one worker
+process per station fed through shared memory. Reports total frames per
+second for 1..--stations stations. Process scaling needs as many free cores
+as stations.
+
+The default recognizer is the skin/finger detector at full resolution
+(no mediapipe needed); --recognizer mediapipe uses sign_to_text.SignToText.
+
+    python benchmarks/bench_multi_source.py [--stations 4] [--frames 300]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.join(APP_DIR, "sign lang"))
+
+from frame_sources import SyntheticSource
+from multi_source import MultiSourceRecognizer, sign_to_text_recognizer
+from recognizers import SkinRecognizer
+
+
+def skin_station():
+    """Skin recognizer with a full-frame, full-resolution search: a per-frame cost closer to MediaPipe"""
+    return SkinRecognizer(detection_scale=1.0, roi_tracking=False)
+
+
+FACTORIES = {"skin": skin_station, "mediapipe": sign_to_text_recognizer}
+
+
+def run_threads(stations, frames, factory):
+    def work(recognizer, source):
+        while source.isOpened():
+            ok, frame = source.read()
+            if not ok:
+                break
+            recognizer.process(frame)
+
+    # Built on the main thread: the skin recognizer is a QThread, and creating
+    # and destroying QObjects on several plain threads at once crashes Qt
+    recognizers = [factory() for _ in range(stations)]
+    threads = [threading.Thread(target=work, args=(recognizer, SyntheticSource(frames, seed=i)))
+               for i, recognizer in enumerate(recognizers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for recognizer in recognizers:
+        recognizer.close()
+    return stations * frames / elapsed
+
+
+def run_processes(stations, frames, factory):
+    sources = [SyntheticSource(frames, seed=i) for i in range(stations)]
+    recognizer = MultiSourceRecognizer(sources, factory=factory, wait_for_worker=True)
+    recognizer.start()
+    processed = 0
+    start = None
+    for result in recognizer:
+        # Start the clock at the first result so worker start-up is excluded
+        if start is None:
+            start = time.perf_counter()
+        processed += 1
+    elapsed = time.perf_counter() - start
+    recognizer.close()
+    return (processed - 1) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=300, help="frames per station")
+    parser.add_argument("--recognizer", choices=sorted(FACTORIES), default="skin")
+    args = parser.parse_args()
+    factory = FACTORIES[args.recognizer]
+
+    print(f"{args.recognizer} recognizer, {args.frames} frames per station, {os.cpu_count()} CPUs\n")
+    print(f"{'stations':<10}{'threads fps':>13}{'processes fps':>15}")
+    for stations in range(1, args.stations + 1):
+        threads = run_threads(stations, args.frames, factory)
+        processes = run_processes(stations, args.frames, factory)
+        print(f"{stations:<10}{threads:>13.0f}{processes:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
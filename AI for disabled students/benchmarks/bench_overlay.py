@@ -0,0 +1,79 @@
+"""Per-frame cost of the preview text: cv2.putText every frame vs CachedOverlay.
+
+Draws the recognizer's legend and status lines onto 640x480 frames. The
+status changes every --change-every frames (a new gesture or word), which
+is when the cached layer is redrawn.
+
+    python benchmarks/bench_overlay.py [--frames 600] [--change-every 15]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mute_studentpage import EnhancedSignLanguageRecognition
+from preview_overlay import CachedOverlay
+
+GESTURES = ("OPEN_HAND", "FIST", "VICTORY", "POINT", "NO_HAND")
+
+
+def status(recognizer, index, change_every):
+    step = index // change_every
+    gesture = GESTURES[step % len(GESTURES)]
+    return recognizer.status_lines(gesture, 0.85, step % 6, "HELLO" if step % 3 == 0 else "")
+
+
+def put_text(frame, items):
+    for text, org, scale, color, thickness in items:
+        cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    return len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--change-every", type=int, default=15)
+    args = parser.parse_args()
+
+    recognizer = EnhancedSignLanguageRecognition(session_code=None)
+    recognizer.current_sentence = "HELLO I HAVE A DOUBT ON THIS "
+    frames = [np.random.default_rng(i).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+              for i in range(8)]
+
+    rendered = 0
+    start = time.perf_counter()
+    for i in range(args.frames):
+        frame = frames[i % len(frames)].copy()
+        rendered += put_text(frame, recognizer.PREVIEW_LEGEND)
+        rendered += put_text(frame, status(recognizer, i, args.change_every))
+    every_frame = (time.perf_counter() - start) / args.frames
+
+    legend, lines = CachedOverlay(), CachedOverlay()
+    start = time.perf_counter()
+    for i in range(args.frames):
+        frame = frames[i % len(frames)].copy()
+        legend.update(recognizer.PREVIEW_LEGEND, frame.shape)
+        lines.update(status(recognizer, i, args.change_every), frame.shape)
+        legend.blend(frame)
+        lines.blend(frame)
+    cached = (time.perf_counter() - start) / args.frames
+
+    # The frame copy is in both loops; measure it to report the text cost alone
+    start = time.perf_counter()
+    for i in range(args.frames):
+        frames[i % len(frames)].copy()
+    copy = (time.perf_counter() - start) / args.frames
+
+    print(f"{args.frames} frames, status changes every {args.change_every} frames\n")
+    print(f"{'mode':<10}{'us/frame':>10}{'strings rendered':>18}")
+    print(f"{'putText':<10}{(every_frame - copy) * 1e6:>10.0f}{rendered:>18}")
+    print(f"{'cached':<10}{(cached - copy) * 1e6:>10.0f}{legend.redraws + lines.redraws:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""GUI-thread cost and queue growth of the camera preview: QImage per frame vs pooled buffers.
+
+old     the worker emits a QImage of every 640x480 frame; the GUI converts it
+        to a pixmap and scales it to 500x400
+pooled  the worker scales into a PreviewBuffers buffer and emits only when
+        nothing is pending; the GUI copies the newest buffer into a pixmap
+
+Both are timed per frame on the GUI side, then --burst frames are produced
+while the GUI is stalled to count the events and frame data left queued.
+
+    python benchmarks/bench_preview.py [--frames 300] [--burst 60]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mute_studentpage import EnhancedSignLanguageRecognition
+
+
+def old_worker(frame):
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb.shape
+    return QImage(rgb.data, w, h, ch * w, QImage.Format.Format_RGB888), rgb
+
+
+def old_gui(image):
+    return QPixmap.fromImage(image).scaled(500, 400, Qt.AspectRatioMode.KeepAspectRatio)
+
+
+def pooled_gui(buffers):
+    frame = buffers.take()
+    if frame is None:
+        return None
+    h, w, ch = frame.shape
+    pixmap = QPixmap.fromImage(QImage(frame.data, w, h, ch * w, QImage.Format.Format_RGB888))
+    buffers.release(frame)
+    return pixmap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--burst", type=int, default=60)
+    args = parser.parse_args()
+    app = QApplication(sys.argv)
+    frames = [np.random.default_rng(i).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+              for i in range(8)]
+    recognizer = EnhancedSignLanguageRecognition(session_code=None)
+    recognizer.set_preview_size(500, 400)
+
+    worker = gui = 0.0
+    for i in range(args.frames):
+        start = time.perf_counter()
+        image, _ = old_worker(frames[i % len(frames)])
+        middle = time.perf_counter()
+        old_gui(image)
+        worker += middle - start
+        gui += time.perf_counter() - middle
+    old = (worker / args.frames * 1000, gui / args.frames * 1000)
+
+    worker = gui = 0.0
+    for i in range(args.frames):
+        start = time.perf_counter()
+        recognizer.publish_preview(frames[i % len(frames)])
+        middle = time.perf_counter()
+        pooled_gui(recognizer.preview_buffers)
+        worker += middle - start
+        gui += time.perf_counter() - middle
+    pooled = (worker / args.frames * 1000, gui / args.frames * 1000)
+
+    # GUI stalled for a burst: every old frame is a queued event holding its pixels
+    queued = [old_worker(frames[i % len(frames)]) for i in range(args.burst)]
+    old_events, old_bytes = len(queued), sum(rgb.nbytes for _, rgb in queued)
+    events = sum(recognizer.publish_preview(frames[i % len(frames)]) for i in range(args.burst))
+    pooled_bytes = recognizer.preview_buffers.count * recognizer.preview_buffers.shape[0] * \
+        recognizer.preview_buffers.shape[1] * 3
+
+    print(f"{args.frames} frames 640x480 -> 500x400 preview; GUI stalled for {args.burst} frames\n")
+    print(f"{'mode':<8}{'worker ms':>11}{'GUI ms':>9}{'queued events':>15}{'frame MB':>10}")
+    print(f"{'old':<8}{old[0]:>11.3f}{old[1]:>9.3f}{old_events:>15}{old_bytes / 1e6:>10.1f}")
+    print(f"{'pooled':<8}{pooled[0]:>11.3f}{pooled[1]:>9.3f}{events:>15}{pooled_bytes / 1e6:>10.1f}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
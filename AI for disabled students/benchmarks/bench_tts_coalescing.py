@@ -0,0 +1,94 @@
+"""Compare per-word TTS, phrase coalescing and cached phrase playback.
+
+Replays the words from mute_student_transcript.txt as they would arrive from
+the mute student (one gesture phrase per upload) through TextToSpeechEngine
+with a FakeBackend that charges a fixed synthesis start-up cost plus a
+per-character speaking time. Live speech is audible only after the start-up
+cost; cached clips are played straight away. Reports arrival -> audible start
+latency and total speaking time for each mode.
+
+    python benchmarks/bench_tts_coalescing.py [--phrases 40] [--interval 2.0]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gesture_words import KNOWN_PHRASES, split_into_phrases
+from tts_backends import FakeBackend
+from tts_cache import FakePlayer, TTSAudioCache
+from tts_engine import TextToSpeechEngine
+
+TRANSCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "mute_student_transcript.txt")
+
+
+def load_phrases(path, limit):
+    with open(path) as f:
+        lines = [line for line in f if not line.startswith("----")]
+    return split_into_phrases(" ".join(lines).split())[:limit]
+
+
+def run(phrases, per_word, cached, interval, startup, seconds_per_char, scale):
+    backend = FakeBackend(startup=startup * scale, seconds_per_char=seconds_per_char * scale)
+    engine = TextToSpeechEngine(
+        backend=backend,
+        coalesce_window=0 if per_word else 0.3 * scale,
+        max_coalesce_delay=1.0 * scale,
+        cache=TTSAudioCache() if cached else None,
+        player=FakePlayer() if cached else None,
+        vocabulary=KNOWN_PHRASES,
+    )
+    # Let the vocabulary pre-render finish, as it would at application start
+    while engine.prerender_queue:
+        time.sleep(0.01)
+    for phrase in phrases:
+        if per_word:
+            # The old TeacherPage.speak_new_words path
+            for word in phrase.split():
+                if len(word) > 1:
+                    engine.speak(word)
+        else:
+            engine.speak(phrase)
+        time.sleep(interval * scale)
+    while engine.pending() or engine.is_speaking:
+        time.sleep(0.01)
+    engine.stop()
+
+    # Live speech becomes audible only after the backend start-up cost
+    offset = 0 if cached else startup
+    latencies = sorted(l / scale + offset for l in engine.start_latencies)
+    return {
+        "utterances": engine.utterance_count,
+        "mean": statistics.mean(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "max": latencies[-1],
+        "speaking": engine.speaking_time / scale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between student uploads")
+    parser.add_argument("--startup", type=float, default=0.25, help="synthesis start-up cost per utterance")
+    parser.add_argument("--seconds-per-char", type=float, default=0.07)
+    parser.add_argument("--scale", type=float, default=0.1, help="run the simulation faster than real time")
+    args = parser.parse_args()
+
+    phrases = load_phrases(TRANSCRIPT, args.phrases)
+    print(f"{len(phrases)} phrases, one every {args.interval:.1f}s, "
+          f"start-up {args.startup:.2f}s, {args.seconds_per_char:.2f}s/char\n")
+    print(f"{'mode':<10}{'utterances':>11}{'mean lat':>10}{'p95 lat':>10}{'max lat':>10}{'speaking':>10}")
+    modes = (("per-word", True, False), ("phrase", False, False), ("cached", False, True))
+    for name, per_word, cached in modes:
+        r = run(phrases, per_word, cached, args.interval, args.startup, args.seconds_per_char, args.scale)
+        print(f"{name:<10}{r['utterances']:>11}{r['mean']:>9.2f}s{r['p95']:>9.2f}s"
+              f"{r['max']:>9.2f}s{r['speaking']:>9.1f}s")
+
+
+if __name__ == "__main__":
+    main()
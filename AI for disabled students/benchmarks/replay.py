@@ -0,0 +1,209 @@
+"""Replay recorded frames through a sign recognizer and score it headlessly.
+
+Feeds every frame of a source (video file, image directory or synthetic
+generator) through one recognizer, synchronously and in order, so two runs
+over the same input give the same words. Timestamps come from the frame
+index and the source fps instead of the wall clock. Reports throughput,
+per-frame latency percentiles and, given ground truth, frame and word
+accuracy.
+
+Recognizers (see recognizers.py):
+    skin       EnhancedSignLanguageRecognition (skin contour + finger count)
+    mediapipe  sign lang/sign_to_text.py SignToText (needs mediapipe)
+    cascade    mediapipe only on frames/regions where the skin stage finds a
+               changed hand; also reports how often it ran
+
+Ground truth is a CSV with a header row and one line per labelled segment:
+
+    start_frame,end_frame,label
+    0,89,HELLO
+    120,209,YES
+
+Frames are numbered from 0 and both ends are inclusive. Labels are the words
+a recognizer emits. A frame is correct when the recognizer's prediction for
+it equals the label of its segment; a segment is recognised when a matching
+word is emitted inside it. For the synthetic source the segments are known
+and used when --labels is not given (skin recognizer only).
+
+    python benchmarks/replay.py clip.mp4 --labels clip.csv
+    python benchmarks/replay.py synthetic:1200 --hold 90 --json result.json
+    python benchmarks/replay.py frames/ --recognizer mediapipe --max-p95-ms 40
+
+Exits with status 1 when a --min-* or --max-* threshold is not met.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from frame_sources import SyntheticSource, open_source
+from gesture_words import GESTURE_TO_WORD
+from recognizers import CascadeRecognizer, LandmarkRecognizer, SkinRecognizer
+
+# Finger counts the skin recognizer maps to one gesture unambiguously
+# (one finger may be POINT or THUMB_UP; a fist still counts as one finger)
+SYNTHETIC_GESTURES = {2: "VICTORY", 3: "THREE_FINGERS", 4: "FOUR_FINGERS", 5: "OPEN_HAND"}
+
+
+RECOGNIZERS = {
+    "skin": lambda fps: SkinRecognizer(fps),
+    "mediapipe": lambda fps: LandmarkRecognizer(),
+    "cascade": lambda fps: CascadeRecognizer(LandmarkRecognizer(), fps=fps),
+}
+
+
+def load_ground_truth(path):
+    """[(start_frame, end_frame, label)] from a ground-truth CSV"""
+    with open(path, newline="") as f:
+        return [(int(row["start_frame"]), int(row["end_frame"]), row["label"].strip())
+                for row in csv.DictReader(f)]
+
+
+def synthetic_ground_truth(source):
+    return [(start, end, GESTURE_TO_WORD[SYNTHETIC_GESTURES[fingers]])
+            for start, end, fingers in source.segments() if fingers in SYNTHETIC_GESTURES]
+
+
+def replay(source, recognizer, mirror=True, max_frames=None):
+    """Run every frame through recognizer; returns per-frame labels, words and latencies"""
+    labels, words, latencies = [], [], []
+    while source.isOpened() and (max_frames is None or len(labels) < max_frames):
+        ok, frame = source.read()
+        if not ok:
+            break
+        # The live loops mirror the camera image before recognising it
+        if mirror:
+            frame = cv2.flip(frame, 1)
+        start = time.perf_counter()
+        prediction, confidence, word = recognizer.process(frame)
+        latencies.append(time.perf_counter() - start)
+        labels.append(prediction if confidence > recognizer.threshold else "")
+        if word:
+            words.append((len(labels) - 1, word))
+    source.release()
+    return labels, words, latencies
+
+
+def score(labels, words, latencies, ground_truth=None):
+    """Throughput, latency percentiles (ms) and accuracy against ground truth"""
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    result = {
+        "frames": len(labels),
+        "fps": len(latencies) / max(sum(latencies), 1e-9),
+        "latency_ms": {
+            "p50": float(np.percentile(ms, 50)),
+            "p90": float(np.percentile(ms, 90)),
+            "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99)),
+            "max": float(ms.max()),
+        },
+        "words": [word for _, word in words],
+    }
+    if not ground_truth:
+        return result
+
+    correct = total = 0
+    for start, end, label in ground_truth:
+        segment = labels[start:end + 1]
+        total += len(segment)
+        correct += sum(predicted == label for predicted in segment)
+
+    matched_words = set()
+    recognised = 0
+    for start, end, label in ground_truth:
+        for k, (frame, word) in enumerate(words):
+            if start <= frame <= end and word == label and k not in matched_words:
+                matched_words.add(k)
+                recognised += 1
+                break
+
+    result["frame_accuracy"] = correct / total if total else 0.0
+    result["word_recall"] = recognised / len(ground_truth)
+    result["word_precision"] = len(matched_words) / len(words) if words else 0.0
+    result["segments"] = len(ground_truth)
+    return result
+
+
+def print_report(name, spec, result):
+    latency = result["latency_ms"]
+    print(f"{name} recognizer on {spec}: {result['frames']} frames")
+    print(f"  throughput   {result['fps']:.1f} fps")
+    print(f"  latency ms   p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  "
+          f"p95 {latency['p95']:.2f}  p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    if "frame_accuracy" in result:
+        print(f"  frame acc    {result['frame_accuracy']:.1%}")
+        print(f"  words        recall {result['word_recall']:.1%} of {result['segments']} segments, "
+              f"precision {result['word_precision']:.1%} of {len(result['words'])} emitted")
+    print(f"  transcript   {' '.join(result['words'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="video file, image directory or synthetic[:frames]")
+    parser.add_argument("--recognizer", choices=sorted(RECOGNIZERS), default="skin")
+    parser.add_argument("--labels", help="ground-truth CSV (start_frame,end_frame,label)")
+    parser.add_argument("--fps", type=float, help="override the source frame rate")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--hold", type=int, default=90, help="synthetic frames per finger count")
+    parser.add_argument("--no-mirror", action="store_true", help="do not flip frames like the live loop")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--min-frame-accuracy", type=float)
+    parser.add_argument("--min-word-recall", type=float)
+    parser.add_argument("--max-p95-ms", type=float)
+    args = parser.parse_args()
+
+    spec = args.source
+    source = open_source(spec, hold=args.hold) if spec.startswith("synthetic") else open_source(spec)
+    if not source.isOpened():
+        print(f"Error: could not open {args.source}")
+        return 2
+
+    if args.labels:
+        ground_truth = load_ground_truth(args.labels)
+    elif isinstance(source, SyntheticSource) and args.recognizer == "skin":
+        ground_truth = synthetic_ground_truth(source)
+    else:
+        ground_truth = None
+
+    try:
+        recognizer = RECOGNIZERS[args.recognizer](args.fps or source.fps)
+    except ImportError as e:
+        print(f"Error: {args.recognizer} recognizer unavailable: {e}")
+        return 2
+    try:
+        labels, words, latencies = replay(source, recognizer, not args.no_mirror, args.max_frames)
+    finally:
+        recognizer.close()
+
+    result = score(labels, words, latencies, ground_truth)
+    result.update(recognizer=args.recognizer, source=args.source)
+    print_report(args.recognizer, args.source, result)
+    if isinstance(recognizer, CascadeRecognizer):
+        print(f"  {recognizer.report()}")
+        result["expensive_runs"] = recognizer.expensive_runs
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    if args.min_frame_accuracy is not None and result.get("frame_accuracy", 0.0) < args.min_frame_accuracy:
+        failures.append(f"frame accuracy below {args.min_frame_accuracy:.1%}")
+    if args.min_word_recall is not None and result.get("word_recall", 0.0) < args.min_word_recall:
+        failures.append(f"word recall below {args.min_word_recall:.1%}")
+    if args.max_p95_ms is not None and result["latency_ms"]["p95"] > args.max_p95_ms:
+        failures.append(f"p95 latency above {args.max_p95_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
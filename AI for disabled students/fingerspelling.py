@@ -0,0 +1,199 @@
+import string
+
+# ==========================================================
+# Fingerspelling Decoder: Lexicon Trie + Beam Search
+# ==========================================================
+# A letter recognizer gives per-frame probabilities for the letters A-Z and
+# BLANK (between letters / no letter shown). A letter is held for several
+# frames and a double letter is signed twice with a transition in between,
+# so frames are decoded like CTC output: repeats collapse and a blank
+# separates two identical letters. Only spellings that are prefixes of a
+# course lexicon are kept, which turns noisy letters into known words.
+
+ALPHABET = string.ascii_uppercase
+BLANK = "_"
+
+
+def spelling(word):
+    """The letters a word is fingerspelled with ('TCP/IP' -> 'TCPIP')"""
+    return "".join(letter for letter in word.upper() if letter in ALPHABET)
+
+
+class TrieNode:
+    """One spelled prefix of the lexicon"""
+
+    __slots__ = ("children", "parent", "letter", "word", "prior", "best_word", "best_prior")
+
+    def __init__(self, parent=None, letter=""):
+        self.children = {}
+        self.parent = parent
+        self.letter = letter
+        self.word = None  # Lexicon word spelled exactly by this prefix
+        self.prior = 0.0
+        self.best_word = None  # Likeliest word starting with this prefix
+        self.best_prior = 0.0
+
+    def prefix(self):
+        letters = []
+        node = self
+        while node.parent is not None:
+            letters.append(node.letter)
+            node = node.parent
+        return "".join(reversed(letters))
+
+
+class LexiconTrie:
+    """Words by their spelling, each prefix knowing its likeliest completion"""
+
+    def __init__(self, words=()):
+        self.root = TrieNode()
+        self.words = 0
+        self.nodes = 1
+        for word in words:
+            self.add(word)
+
+    def add(self, word, prior=1.0):
+        """Add word with a relative frequency (priors are compared, not summed)"""
+        letters = spelling(word)
+        if not letters:
+            return
+        node = self.root
+        for node_on_path in self._path(letters):
+            node = node_on_path
+            if prior > node.best_prior:
+                node.best_word, node.best_prior = word, prior
+        if node.word is None:
+            self.words += 1
+        if prior >= node.prior:
+            node.word, node.prior = word, prior
+
+    def _path(self, letters):
+        node = self.root
+        yield node
+        for letter in letters:
+            child = node.children.get(letter)
+            if child is None:
+                child = node.children[letter] = TrieNode(node, letter)
+                self.nodes += 1
+            node = child
+            yield node
+
+    def find(self, prefix):
+        """Node for a spelled prefix, or None"""
+        node = self.root
+        for letter in spelling(prefix):
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+
+def load_lexicon(path):
+    """LexiconTrie from a text file with one word per line, optionally followed by a count"""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rsplit(None, 1)
+            if not parts:
+                continue
+            if len(parts) == 2 and parts[1].isdigit():
+                entries.append((parts[0], float(parts[1])))
+            else:
+                entries.append((line.strip(), 1.0))
+    top = max((count for _, count in entries), default=1.0)
+    trie = LexiconTrie()
+    for word, count in entries:
+        trie.add(word, count / top)
+    return trie
+
+
+class FingerspellingDecoder:
+    """Per-frame beam search over lexicon prefixes.
+
+    Each hypothesis is a trie node with the probability of ending in a blank
+    and of ending in its last letter. Per frame only the max_letters most
+    likely letters above letter_floor are tried, and only where the trie
+    has that child, and the beam_width best hypotheses are kept - so a frame
+    costs at most beam_width * max_letters steps whatever the lexicon size.
+    Hypotheses are ranked by probability times the prefix's best word prior
+    to the power prior_weight.
+
+    After pause_frames blank or hand-less frames the best hypothesis that
+    spells a whole word is committed and the search starts over.
+    """
+
+    def __init__(self, lexicon, beam_width=8, max_letters=5, letter_floor=0.01,
+                 prior_weight=0.3, pause_frames=8):
+        self.lexicon = lexicon
+        self.beam_width = beam_width
+        self.max_letters = max_letters
+        self.letter_floor = letter_floor
+        self.prior_weight = prior_weight
+        self.pause_frames = pause_frames
+        self.rejected = 0  # Pauses after a spelling that matched no whole word
+        self.reset()
+
+    def reset(self):
+        self.beams = {self.lexicon.root: (1.0, 0.0)}  # node -> (p ending blank, p ending letter)
+        self.quiet_frames = 0
+
+    def _rank(self, node, scores):
+        return (scores[0] + scores[1]) * node.best_prior ** self.prior_weight
+
+    def step(self, probabilities):
+        """Feed one frame: {letter: probability} (BLANK for no letter) or None without a hand.
+
+        Returns (partial, guess, word): the best spelled prefix so far, its
+        likeliest lexicon word, and a newly committed word or ''.
+        """
+        if probabilities is None:
+            blank, letters = 1.0, []
+        else:
+            blank = probabilities.get(BLANK, 0.0)
+            letters = sorted(((p, letter) for letter, p in probabilities.items()
+                              if letter != BLANK and p >= self.letter_floor), reverse=True)
+            letters = letters[:self.max_letters]
+            letter_p = dict((letter, p) for p, letter in letters)
+
+        extended = {}
+        for node, (ending_blank, ending_letter) in self.beams.items():
+            total = ending_blank + ending_letter
+            stay_blank, stay_letter = extended.get(node, (0.0, 0.0))
+            stay_blank += total * blank
+            if letters and node.letter:
+                # Holding the same letter keeps the prefix
+                stay_letter += ending_letter * letter_p.get(node.letter, 0.0)
+            extended[node] = (stay_blank, stay_letter)
+            for p, letter in letters:
+                child = node.children.get(letter)
+                if child is None:
+                    continue
+                # A repeated letter only counts after a transition (blank)
+                source = ending_blank if letter == node.letter else total
+                child_blank, child_letter = extended.get(child, (0.0, 0.0))
+                extended[child] = (child_blank, child_letter + source * p)
+
+        kept = sorted(extended.items(), key=lambda item: self._rank(*item), reverse=True)
+        kept = kept[:self.beam_width]
+        norm = sum(b + l for _, (b, l) in kept) or 1.0
+        self.beams = {node: (b / norm, l / norm) for node, (b, l) in kept}
+
+        best = kept[0][0]
+        partial, guess = best.prefix(), best.best_word or ""
+
+        quiet = probabilities is None or blank >= 0.5
+        self.quiet_frames = self.quiet_frames + 1 if quiet else 0
+        word = ""
+        if self.quiet_frames >= self.pause_frames and best is not self.lexicon.root:
+            word = self.finish()
+        return partial, guess, word
+
+    def finish(self):
+        """Commit the best whole-word hypothesis ('' if none) and start over"""
+        complete = [((scores[0] + scores[1]) * node.prior ** self.prior_weight, node.word)
+                    for node, scores in self.beams.items() if node.word]
+        word = max(complete)[1] if complete else ""
+        if not word and any(node is not self.lexicon.root for node in self.beams):
+            self.rejected += 1
+        self.reset()
+        return word
@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ==========================================================
+# Frame Sources for the Sign Recognizers
+# ==========================================================
+# Every source follows the cv2.VideoCapture interface the recognizers already
+# use (isOpened / read / grab / retrieve / release) and exposes fps, so a
+# webcam can be swapped for a recorded clip, a folder of images or generated
+# frames. live is True for devices that produce frames in real time.
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class CameraSource:
+    """Live webcam"""
+
+    live = True
+
+    def __init__(self, index=0, width=640, height=480, low_latency=True):
+        self.capture = cv2.VideoCapture(index)
+        # Set camera resolution for better detection
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if low_latency:
+            # Both are hints: backends that do not support them ignore the call
+            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        return self.capture.read()
+
+    def grab(self):
+        return self.capture.grab()
+
+    def retrieve(self):
+        return self.capture.retrieve()
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(CameraSource):
+    """Recorded clip, read frame by frame at decode speed"""
+
+    live = False
+
+    def __init__(self, path):
+        self.capture = cv2.VideoCapture(path)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+
+class ImageDirectorySource:
+    """Image files in a directory, in file name order"""
+
+    live = False
+
+    def __init__(self, directory, fps=30.0):
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.fps = fps
+        self.index = 0
+
+    def isOpened(self):
+        return self.index < len(self.paths)
+
+    def read(self):
+        while self.index < len(self.paths):
+            path = self.paths[self.index]
+            self.index += 1
+            frame = cv2.imread(path)
+            if frame is not None:
+                return True, frame
+            print(f"Skipping unreadable image: {path}")
+        return False, None
+
+    def grab(self):
+        if self.index >= len(self.paths):
+            return False
+        self.index += 1
+        return True
+
+    def retrieve(self):
+        frame = cv2.imread(self.paths[self.index - 1])
+        return frame is not None, frame
+
+    def release(self):
+        self.index = len(self.paths)
+
+
+def synthetic_hand_frame(index, width=640, height=480, seed=0, hold=40):
+    """Deterministic frame with a hand showing (index // hold) % 6 fingers"""
+    rng = np.random.default_rng(seed + index)
+    frame = rng.integers(20, 70, size=(height, width, 3), dtype=np.uint8)
+    fingers = (index // hold) % 6
+    cx = int(width * (0.35 + 0.3 * np.sin(index / 50)))
+    cy = int(height * 0.6)
+    skin = (120, 160, 220)
+    cv2.circle(frame, (cx, cy), 55, skin, -1)
+    for k in range(fingers):
+        angle = np.deg2rad(-160 + k * 32)
+        tip = (int(cx + 130 * np.cos(angle)), int(cy + 130 * np.sin(angle)))
+        cv2.line(frame, (cx, cy), tip, skin, 22)
+    return cv2.GaussianBlur(frame, (5, 5), 0)
+
+
+class SyntheticSource:
+    """Generated hand frames with known finger counts (no camera or files needed)"""
+
+    live = False
+
+    def __init__(self, count=600, width=640, height=480, seed=0, hold=40, fps=30.0):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.hold = hold
+        self.fps = fps
+        self.index = 0
+
+    def isOpened(self):
+        return self.index < self.count
+
+    def read(self):
+        if self.index >= self.count:
+            return False, None
+        frame = synthetic_hand_frame(self.index, self.width, self.height, self.seed, self.hold)
+        self.index += 1
+        return True, frame
+
+    def grab(self):
+        if self.index >= self.count:
+            return False
+        self.index += 1
+        return True
+
+    def retrieve(self):
+        return True, synthetic_hand_frame(self.index - 1, self.width, self.height, self.seed, self.hold)
+
+    def release(self):
+        self.index = self.count
+
+    def segments(self):
+        """(start_frame, end_frame, fingers) for each run of constant finger count"""
+        return [(start, min(start + self.hold, self.count) - 1, (start // self.hold) % 6)
+                for start in range(0, self.count, self.hold)]
+
+
+class LatestFrameGrabber:
+    """Drain a source on its own thread and decode only the frame that is wanted.
+
+    The thread calls grab() continuously, so frames never pile up in the
+    driver's buffer. A frame is retrieved (decoded) only when a consumer is
+    waiting in latest(), which therefore always gets the newest frame plus
+    the time it was grabbed. Frames nobody asked for are counted as skipped.
+    Sources that are not live are paced to their fps. With release_source
+    the thread releases the source itself when it exits, so it is never
+    released while a grab() is still running.
+    """
+
+    def __init__(self, source, on_grab=None, release_source=False):
+        self.source = source
+        self.on_grab = on_grab
+        self.release_source = release_source
+        self.fps = source.fps
+        self.condition = threading.Condition()
+        self.wanted = False
+        self.frame = None
+        self.captured_at = None
+        self.grabbed = 0
+        self.skipped = 0
+        self.ended = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self.thread.start()
+
+    def _grab_loop(self):
+        interval = 0.0 if getattr(self.source, "live", False) else 1.0 / self.fps
+        next_grab = time.perf_counter()
+        while self.running:
+            if interval:
+                next_grab += interval
+                time.sleep(max(0.0, next_grab - time.perf_counter()))
+            if not self.source.grab():
+                break
+            captured_at = time.perf_counter()
+            self.grabbed += 1
+            if self.on_grab:
+                self.on_grab()
+            with self.condition:
+                wanted = self.wanted
+            if not wanted:
+                self.skipped += 1
+                continue
+            ok, frame = self.source.retrieve()
+            if not ok:
+                continue
+            with self.condition:
+                self.frame, self.captured_at = frame, captured_at
+                self.wanted = False
+                self.condition.notify_all()
+        if self.release_source:
+            self.source.release()
+        with self.condition:
+            self.ended = True
+            self.condition.notify_all()
+
+    def latest(self, timeout=None):
+        """(frame, grab time) of the next frame grabbed, or (None, None) on timeout/end"""
+        with self.condition:
+            self.frame = None
+            self.wanted = True
+            self.condition.wait_for(lambda: self.frame is not None or self.ended, timeout)
+            frame, captured_at = self.frame, self.captured_at
+            self.frame = None
+            self.wanted = False
+            return (frame, captured_at) if frame is not None else (None, None)
+
+    def stop(self, timeout=1.0):
+        """Ask the thread to exit and wait up to timeout seconds (None: until it has)"""
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+
+
+def open_source(spec, **kwargs):
+    """Source from a command-line style spec: camera index, "synthetic[:N]",
+    an image directory or a video file"""
+    if isinstance(spec, int) or spec.isdigit():
+        return CameraSource(int(spec))
+    if spec.startswith("synthetic"):
+        _, _, count = spec.partition(":")
+        if count:
+            kwargs["count"] = int(count)
+        return SyntheticSource(**kwargs)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, **kwargs)
+    return VideoFileSource(spec)
@@ -0,0 +1,110 @@
+from collections import deque
+
+# ==========================================================
+# Temporal Smoothing and De-duplication of Gestures
+# ==========================================================
+class GestureSmoother:
+    """Sliding-window majority vote over per-frame gestures, with hysteresis.
+
+    Each update adds one label to a window of the last `window` labels and
+    drops the oldest. Counts are kept in frequency buckets, so the add, the
+    drop and finding the majority are all O(1).
+
+    A label becomes the stable gesture once it holds `enter_votes` of the
+    window (more than half, so it is unique) and stays stable until it falls
+    below `exit_votes`. A word is produced only when a new gesture becomes
+    stable, and the same word is not produced again within
+    `repeat_interval` seconds unless the hand left the frame in between.
+    """
+
+    def __init__(self, to_word, window=9, enter_votes=5, exit_votes=3, repeat_interval=5.0,
+                 absent_labels=("NO_HAND",), ignored_labels=("UNKNOWN",)):
+        if enter_votes * 2 <= window:
+            raise ValueError("enter_votes must be more than half the window")
+        self.to_word = to_word
+        self.window = deque()
+        self.size = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.repeat_interval = repeat_interval
+        self.absent_labels = set(absent_labels)
+        self.ignored_labels = set(ignored_labels) | self.absent_labels
+
+        self.counts = {}
+        self.buckets = [set() for _ in range(window + 1)]  # count -> labels with that count
+        self.top = 0
+        self.stable = None
+        self.last_word = ""
+        self.last_word_time = None
+        self.hand_left = True
+        self.suppressed = 0
+
+    def _add(self, label):
+        count = self.counts.get(label, 0)
+        if count:
+            self.buckets[count].discard(label)
+        self.counts[label] = count + 1
+        self.buckets[count + 1].add(label)
+        self.top = max(self.top, count + 1)
+
+    def _remove(self, label):
+        count = self.counts[label]
+        self.buckets[count].discard(label)
+        if count == 1:
+            del self.counts[label]
+        else:
+            self.counts[label] = count - 1
+            self.buckets[count - 1].add(label)
+        if not self.buckets[self.top]:
+            self.top -= 1
+
+    def votes(self, label):
+        """How many frames in the window show label"""
+        return self.counts.get(label, 0)
+
+    def majority(self):
+        """The label holding at least enter_votes of the window, or None"""
+        if self.top < self.enter_votes:
+            return None
+        return next(iter(self.buckets[self.top]))
+
+    def update(self, label, now):
+        """Add one frame's label; returns a new word, or '' if nothing should be said"""
+        if len(self.window) == self.size:
+            self._remove(self.window.popleft())
+        self.window.append(label)
+        self._add(label)
+
+        candidate = self.majority()
+        if candidate is not None and candidate != self.stable:
+            self.stable = candidate
+            return self._accept(candidate, now)
+        if self.stable is not None and self.votes(self.stable) < self.exit_votes:
+            self.stable = None
+        return ""
+
+    def _accept(self, label, now):
+        if label in self.absent_labels:
+            self.hand_left = True
+        if label in self.ignored_labels:
+            return ""
+        word = self.to_word(label)
+        if not word:
+            return ""
+        if (word == self.last_word and not self.hand_left
+                and now - self.last_word_time < self.repeat_interval):
+            self.suppressed += 1
+            return ""
+        self.last_word = word
+        self.last_word_time = now
+        self.hand_left = False
+        return word
+
+    def reset(self):
+        """Forget the window (e.g. when detection is paused)"""
+        self.window.clear()
+        self.counts.clear()
+        for bucket in self.buckets:
+            bucket.clear()
+        self.top = 0
+        self.stable = None
@@ -0,0 +1,32 @@
+# ==========================================================
+# Gesture Vocabulary shared by the mute student and teacher pages
+# ==========================================================
+GESTURE_TO_WORD = {
+    "FIST": "YES",
+    "OPEN_HAND": "HELLO",
+    "VICTORY": "I HAVE A DOUBT ON THIS",
+    "POINT": "THANKYOU",
+    "THUMB_UP": "I HAVE A DOUBT ON THIS",
+    "THREE_FINGERS": "HI",
+    "FOUR_FINGERS": "CAN YOU REPEAT THIS",
+    "NO_HAND": "NO"
+}
+
+# Every phrase a gesture can produce, longest first for greedy matching
+KNOWN_PHRASES = sorted(set(GESTURE_TO_WORD.values()), key=lambda p: -len(p.split()))
+
+def split_into_phrases(words):
+    """Group a word list into known gesture phrases; other words stand alone"""
+    phrases = []
+    i = 0
+    while i < len(words):
+        for phrase in KNOWN_PHRASES:
+            phrase_words = phrase.split()
+            if words[i:i + len(phrase_words)] == phrase_words:
+                phrases.append(phrase)
+                i += len(phrase_words)
+                break
+        else:
+            phrases.append(words[i])
+            i += 1
+    return phrases
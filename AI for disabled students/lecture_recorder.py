@@ -0,0 +1,177 @@
+import json
+import os
+import queue
+import threading
+import time
+
+# soundfile (libsndfile) is optional - without it the archive is simply disabled
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+ARCHIVE_DIR = "lecture_archive"
+
+# ==========================================================
+# Compressed Lecture Audio Archive
+# ==========================================================
+class LectureAudioRecorder:
+    """Stream raw int16 mono audio blocks to a compressed archive on disk.
+
+    The audio path only calls write() and mark_segment(), which enqueue and
+    return immediately. A background thread owns the sound file and the
+    segment index, so capture never waits on disk I/O.
+    """
+
+    def __init__(self, path_prefix, samplerate=16000, audio_format="opus", max_pending_blocks=256):
+        self.samplerate = samplerate
+        self.audio_format = self._resolve_format(audio_format)
+        extension = "ogg" if self.audio_format == "opus" else "flac"
+        self.archive_path = f"{path_prefix}.{extension}"
+        self.index_path = f"{path_prefix}.index.jsonl"
+
+        # Bounded so a stalled disk drops audio instead of growing memory
+        self.block_queue = queue.Queue(maxsize=max_pending_blocks)
+        # Index entries are tiny and must never be dropped, so they travel separately
+        self.segment_queue = queue.Queue()
+        self.frames_pushed = 0
+        self.dropped_frames = 0
+        self.segment_start = 0
+        self.segment_count = 0
+        self.started_at = None
+        self.running = False
+        self.writer_thread = None
+
+    @staticmethod
+    def available():
+        """Return True if an audio archive can be written on this machine"""
+        return sf is not None
+
+    @staticmethod
+    def _resolve_format(audio_format):
+        """Fall back to lossless FLAC when libsndfile was built without Opus"""
+        if audio_format == "opus" and sf is not None and "OPUS" in sf.available_subtypes("OGG"):
+            return "opus"
+        return "flac"
+
+    def start(self):
+        """Open the archive and start the background writer thread"""
+        if sf is None:
+            print("Lecture archive disabled: install the 'soundfile' package")
+            return False
+        directory = os.path.dirname(self.archive_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.started_at = time.time()
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer_thread.start()
+        return True
+
+    def write(self, data):
+        """Queue one block of int16 PCM bytes - NON-BLOCKING"""
+        if not self.running:
+            return
+        frames = len(data) // 2
+        try:
+            self.block_queue.put_nowait(("audio", self.frames_pushed, data))
+        except queue.Full:
+            # The writer pads the gap with silence to keep the index aligned
+            self.dropped_frames += frames
+        self.frames_pushed += frames
+
+    def mark_segment(self, text):
+        """Close the current transcript segment at the last written block"""
+        if not self.running:
+            return
+        start, end = self.segment_start, self.frames_pushed
+        self.segment_start = end
+        if not text:
+            return
+        entry = {
+            "segment": self.segment_count,
+            "start": round(start / self.samplerate, 3),
+            "end": round(end / self.samplerate, 3),
+            "start_frame": start,
+            "end_frame": end,
+            "text": text,
+        }
+        self.segment_count += 1
+        self.segment_queue.put(entry)
+
+    def close(self, timeout=5.0):
+        """Flush queued audio, finalize the archive and stop the writer"""
+        if not self.running:
+            return
+        self.running = False
+        if not self.writer_thread or not self.writer_thread.is_alive():
+            return
+        try:
+            # Wait for room rather than dropping the sentinel on a full queue
+            self.block_queue.put(("stop", self.frames_pushed, None), timeout=timeout)
+        except queue.Full:
+            print("Lecture archive: writer did not drain in time")
+            return
+        self.writer_thread.join(timeout=timeout)
+
+    def _write_loop(self):
+        """Drain the block queue into the sound file and index (writer thread)"""
+        subtype = "OPUS" if self.audio_format == "opus" else "PCM_16"
+        file_format = "OGG" if self.audio_format == "opus" else "FLAC"
+        written = 0
+        try:
+            with sf.SoundFile(self.archive_path, "w", self.samplerate, 1,
+                              format=file_format, subtype=subtype) as sound_file, \
+                    open(self.index_path, "w", encoding="utf-8") as index_file:
+                index_file.write(json.dumps({
+                    "archive": os.path.basename(self.archive_path),
+                    "samplerate": self.samplerate,
+                    "format": self.audio_format,
+                    "started_at": self.started_at,
+                }) + "\n")
+                pending_segments = []
+                while True:
+                    kind, position, payload = self.block_queue.get()
+                    if position > written:
+                        # Blocks were dropped upstream - keep the timeline intact
+                        sound_file.buffer_write(bytes((position - written) * 2), dtype="int16")
+                        written = position
+                    if kind == "audio":
+                        sound_file.buffer_write(payload, dtype="int16")
+                        written += len(payload) // 2
+
+                    # Only index segments whose audio is already in the archive
+                    while not self.segment_queue.empty():
+                        pending_segments.append(self.segment_queue.get_nowait())
+                    while pending_segments and pending_segments[0]["end_frame"] <= written:
+                        index_file.write(json.dumps(pending_segments.pop(0)) + "\n")
+                    index_file.flush()
+
+                    if kind == "stop":
+                        break
+        except Exception as e:
+            print(f"Lecture archive error: {e}")
+            self.running = False
+
+# ==========================================================
+# Archive Readers (for re-transcription)
+# ==========================================================
+def load_index(index_path):
+    """Return (header, segments) from an archive index file"""
+    with open(index_path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines:
+        return {}, []
+    return lines[0], lines[1:]
+
+def read_segment(archive_path, segment):
+    """Read one indexed segment back as int16 PCM bytes by seeking the archive"""
+    with sf.SoundFile(archive_path) as sound_file:
+        sound_file.seek(segment["start_frame"])
+        frames = segment["end_frame"] - segment["start_frame"]
+        return bytes(sound_file.buffer_read(frames, dtype="int16"))
+
+def archive_prefix(session_code=None):
+    """Build a timestamped archive path prefix for a lecture"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(ARCHIVE_DIR, f"{session_code or 'lecture'}-{stamp}")
@@ -2,15 +2,21 @@ import sys
 import requests
 import cv2
 import numpy as np
-from collections import deque
 import os
 import time
+import threading
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QMessageBox, QFrame, QTextEdit
 )
 from PyQt6.QtGui import QFont, QImage, QPixmap
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread
+from frame_sources import CameraSource, LatestFrameGrabber
+from gesture_smoothing import GestureSmoother
+from gesture_words import GESTURE_TO_WORD
+from preview_overlay import CachedOverlay
+from transcript_writer import TranscriptWriter
+from vision_pipeline import InferenceGovernor, LatestSlot, MotionGate, PreviewBuffers, StageStats
 
 # ----------------------------
 # Firebase Base URL
@@ -21,24 +27,32 @@ FIREBASE_URL = "https://hacks-f28bb-default-rtdb.firebaseio.com"
 # Enhanced Sign Language Recognition Thread with Finger Detection
 # ==========================================================
 class EnhancedSignLanguageRecognition(QThread):
-    frame_ready = pyqtSignal(QImage)
+    frame_ready = pyqtSignal()  # A preview frame is waiting in preview_buffers
     prediction_ready = pyqtSignal(str)
     sentence_updated = pyqtSignal(str)
+    stats_updated = pyqtSignal(str)
     
-    def __init__(self, session_code):
+    # (text, position, scale, BGR colour, thickness) of the fixed preview legend
+    PREVIEW_LEGEND = (
+        ("Skeletal Finger Detection Active", (20, 450), 0.6, (0, 255, 0), 2),
+        # Draw finger analysis info
+        ("Green: Hand Contour", (400, 30), 0.5, (0, 255, 0), 1),
+        ("Blue: Convex Hull", (400, 50), 0.5, (255, 0, 0), 1),
+        ("Red: Finger Joints", (400, 70), 0.5, (0, 0, 255), 1),
+    )
+    
+    def __init__(self, session_code, frame_source=None):
         super().__init__()
         self.running = False
         self.detection_enabled = True
         self.cap = None
+        self.frame_source = frame_source  # Defaults to the webcam (see frame_sources)
         self.session_code = session_code
         
         # Sign Language Settings
         self.OUTPUT_FILE = "mute_student_transcript.txt"
         self.frame_count = 0
-        
-        # Create / clear transcript file
-        with open(self.OUTPUT_FILE, "w") as f:
-            f.write("---- MUTE STUDENT SIGN LANGUAGE TRANSCRIPT ----\n")
+        self.transcript = None  # TranscriptWriter, opened per session in run()
         
         self.current_sentence = ""
         self.last_upload_time = 0
@@ -53,17 +67,65 @@ class EnhancedSignLanguageRecognition(QThread):
             (4, 20, "THUMB")    # Thumb (special case)
         ]
         
-        # Gesture history for stability
-        self.gesture_history = deque(maxlen=5)
+        # Capture -> inference -> render stages. The grabber drains the camera
+        # and decodes only the frame inference asks for; render is a latest-wins slot
+        self.grabber = None
+        self.render_slot = LatestSlot()
+        self.capture_stats = StageStats("Capture")
+        self.inference_stats = StageStats("Inference")
+        self.render_stats = StageStats("Render")
+        self.prediction_latency = 0.0  # Smoothed seconds from frame grab to detector result
+        self.required_stability = 5  # Votes of the last 9 detections needed to accept a gesture
+        
+        # Majority vote with hysteresis; a held or flickering sign yields one
+        # word, repeated only after 5 s or once the hand has left the frame
+        self.smoother = GestureSmoother(self.map_gesture_to_word, window=9,
+                                        enter_votes=self.required_stability, exit_votes=3,
+                                        repeat_interval=5.0)
+        
+        # Hand ROI tracking: search only around the last hand box, with a
+        # full-frame search every full_search_interval frames or when lost
+        self.roi_tracking = True
+        self.roi_margin = 0.5  # Expand the last box by this fraction per side
+        self.full_search_interval = 15
+        self.last_hand_box = None
+        self.frames_since_full_search = 0
+        self.processed_area_ratio = 1.0  # Smoothed share of the frame segmented
+        
+        # Segment at detection_scale x resolution; contours are mapped back to
+        # full resolution, so hull, defects and overlays work in frame pixels
+        self.detection_scale = 0.5
+        self.last_finger_count = 0
+        
+        # Overlays and QImage conversion are skipped while nobody can see them
+        self.preview_visible = True
+        
+        # Preview text is drawn into cached layers: the legend once, the
+        # status lines whenever what they say changes
+        self.legend_overlay = CachedOverlay()
+        self.status_overlay = CachedOverlay()
+        
+        # Previews are scaled here to the widget size (set by the page) into
+        # pooled RGB buffers; at most one waits for the GUI at a time
+        self.preview_size = (500, 400)
+        self.preview_buffers = PreviewBuffers()
+        self.preview_scratch = None
+        
+        # Runs the detector on every n-th frame when the machine can't keep up;
+        # skipped frames still reach the preview with the last result drawn
+        self.governor = InferenceGovernor(cpu_budget=0.5)
+        
+        # Static scenes (nobody signing) reuse the last result instead of re-detecting
+        self.motion_gate = MotionGate()
         
     def toggle_detection(self):
         """Toggle sign language detection on/off"""
         self.detection_enabled = not self.detection_enabled
         
-    def detect_fingers_skeletal(self, frame):
-        """Detect fingers using convex hull and defect points (skeletal analysis)"""
+    def skin_mask(self, image):
+        """Binary skin mask of a BGR image"""
         # Convert to HSV for skin detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
         
         # Skin color range
         lower_skin = np.array([0, 20, 70], dtype=np.uint8)
@@ -74,79 +136,151 @@ class EnhancedSignLanguageRecognition(QThread):
         kernel = np.ones((3, 3), np.uint8)
         skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, kernel)
         skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, kernel)
-        skin_mask = cv2.medianBlur(skin_mask, 5)
-        
-        # Find contours
-        contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
+        return cv2.medianBlur(skin_mask, 5)
+    
+    def largest_skin_contour(self, image, offset=(0, 0)):
+        """Largest skin blob in image (hand), in frame coordinates, or None"""
+        scale = self.detection_scale
+        if scale != 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        contours, _ = cv2.findContours(self.skin_mask(image), cv2.RETR_EXTERNAL,
+                                       cv2.CHAIN_APPROX_SIMPLE)
         if not contours:
-            return "NO_HAND", frame, 0.0, []
+            return None
         
         # Get largest contour (hand)
         hand_contour = max(contours, key=cv2.contourArea)
         
-        # Filter small contours (noise)
-        if cv2.contourArea(hand_contour) < 5000:
-            return "NO_HAND", frame, 0.0, []
+        # Filter small contours (noise) - area shrinks with the square of the scale
+        if cv2.contourArea(hand_contour) < 5000 * scale * scale:
+            return None
+        
+        # Back to full-resolution frame coordinates
+        if scale != 1.0:
+            hand_contour = np.rint(hand_contour / scale).astype(np.int32)
+        return hand_contour + np.array(offset, dtype=np.int32)
+    
+    def find_hand_contour(self, frame, roi=None):
+        """Find the hand, searching only the tracked ROI when possible.
+
+        roi = (x0, y0, x1, y1) limits every search to that region of the
+        frame; the contour and the tracked box stay in frame coordinates.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        bx0, by0, bx1, by1 = roi if roi is not None else (0, 0, frame_w, frame_h)
+        
+        if (self.roi_tracking and self.last_hand_box is not None and
+                self.frames_since_full_search < self.full_search_interval):
+            x, y, w, h = self.last_hand_box
+            dx, dy = int(w * self.roi_margin) + 8, int(h * self.roi_margin) + 8
+            x0, y0 = max(bx0, x - dx), max(by0, y - dy)
+            x1, y1 = min(bx1, x + w + dx), min(by1, y + h + dy)
+            if x1 > x0 and y1 > y0:
+                hand_contour = self.largest_skin_contour(frame[y0:y1, x0:x1], (x0, y0))
+                if hand_contour is not None:
+                    self.frames_since_full_search += 1
+                    self.last_hand_box = cv2.boundingRect(hand_contour)
+                    self._track_area_ratio((x1 - x0) * (y1 - y0) / (frame_w * frame_h))
+                    return hand_contour
+            # Hand left the ROI - fall through to a full search
         
-        # Draw hand contour
-        cv2.drawContours(frame, [hand_contour], -1, (0, 255, 0), 2)
+        region = frame if roi is None else frame[by0:by1, bx0:bx1]
+        hand_contour = self.largest_skin_contour(region, (bx0, by0))
+        self.frames_since_full_search = 0
+        self.last_hand_box = cv2.boundingRect(hand_contour) if hand_contour is not None else None
+        self._track_area_ratio((bx1 - bx0) * (by1 - by0) / (frame_w * frame_h))
+        return hand_contour
+    
+    def _track_area_ratio(self, ratio):
+        self.processed_area_ratio = 0.9 * self.processed_area_ratio + 0.1 * ratio
+    
+    def detect_fingers_skeletal(self, frame, roi=None):
+        """Detect fingers using convex hull and defect points (skeletal analysis).
+
+        Returns (gesture, confidence, hand); hand holds the geometry that
+        draw_hand_overlay() renders, or None when no hand was found. roi
+        limits the search as in find_hand_contour().
+        """
+        hand_contour = self.find_hand_contour(frame, roi)
+        if hand_contour is None:
+            self.last_finger_count = 0
+            return "NO_HAND", 0.0, None
         
         # Convex hull and defects for finger detection
         hull = cv2.convexHull(hand_contour, returnPoints=False)
-        hull_points = cv2.convexHull(hand_contour)
-        
-        # Draw convex hull
-        cv2.drawContours(frame, [hull_points], -1, (255, 0, 0), 2)
         
         # Get convexity defects
-        defects = []
-        finger_count = 0
-        finger_tips = []
-        
+        defects = None
         if len(hull) > 3:
             try:
                 defects = cv2.convexityDefects(hand_contour, hull)
-            except:
+            except cv2.error:
                 defects = None
         
         # Analyze defects to find fingers
-        if defects is not None:
-            for i in range(defects.shape[0]):
-                s, e, f, d = defects[i, 0]
-                start = tuple(hand_contour[s][0])
-                end = tuple(hand_contour[e][0])
-                far = tuple(hand_contour[f][0])
-                
-                # Calculate angles and distances
-                a = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
-                b = np.sqrt((far[0] - start[0])**2 + (far[1] - start[1])**2)
-                c = np.sqrt((end[0] - far[0])**2 + (end[1] - far[1])**2)
-                
-                # Angle between fingers
-                angle = np.arccos((b**2 + c**2 - a**2) / (2 * b * c)) if b * c != 0 else 0
-                angle = np.degrees(angle)
-                
-                # Filter valid finger defects
-                if angle < 90 and d > 10000:  # Valid finger defect
-                    finger_count += 1
-                    cv2.circle(frame, far, 8, (0, 0, 255), -1)
-                    cv2.line(frame, start, end, (255, 255, 0), 2)
-                    
-                    # Store finger tip positions
-                    finger_tips.append((start, end, far))
+        finger_tips = self.analyze_defects(hand_contour, defects)
         
         # Count fingers (add 1 for the base of fingers)
-        total_fingers = min(finger_count + 1, 5)
-        
-        # Draw finger count
-        cv2.putText(frame, f"Fingers: {total_fingers}", (50, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        total_fingers = min(len(finger_tips) + 1, 5)
+        self.last_finger_count = total_fingers
         
         # Classify gesture based on finger count and hand shape
         gesture, confidence = self.classify_gesture_by_fingers(total_fingers, hand_contour)
         
-        return gesture, frame, confidence, finger_tips
+        hand = {
+            "contour": hand_contour,
+            "hull": hand_contour[hull[:, 0]],
+            "finger_tips": finger_tips,
+            "finger_count": total_fingers,
+        }
+        return gesture, confidence, hand
+    
+    def analyze_defects(self, hand_contour, defects):
+        """Valid finger defects as an (N, 3, 2) array of start/end/far points.
+
+        All defects are evaluated in one NumPy pass: gather the points, get the
+        three side lengths, the angle at the far point by the law of cosines,
+        and keep defects sharper than 90 degrees and deeper than the threshold.
+        """
+        if defects is None or len(defects) == 0:
+            return np.empty((0, 3, 2), dtype=np.int32)
+        
+        s, e, f, d = defects.reshape(-1, 4).T
+        points = hand_contour.reshape(-1, 2)
+        tips = np.stack((points[s], points[e], points[f]), axis=1)
+        start, end, far = tips.astype(np.float64).transpose(1, 0, 2)
+        
+        # Calculate angles and distances
+        a = np.linalg.norm(end - start, axis=1)
+        b = np.linalg.norm(far - start, axis=1)
+        c = np.linalg.norm(end - far, axis=1)
+        
+        # Angle between fingers (0 for degenerate defects, as before)
+        denominator = 2 * b * c
+        cosine = np.divide(b ** 2 + c ** 2 - a ** 2, denominator,
+                           out=np.ones_like(a), where=denominator != 0)
+        angle = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+        
+        # Filter valid finger defects
+        valid = (angle < 90) & (d > 10000)
+        return tips[valid]
+    
+    def draw_hand_overlay(self, frame, hand):
+        """Draw contour, hull, finger joints and count from detect_fingers_skeletal"""
+        if hand is None:
+            return
+        
+        # Draw hand contour and convex hull
+        cv2.drawContours(frame, [hand["contour"]], -1, (0, 255, 0), 2)
+        cv2.drawContours(frame, [hand["hull"]], -1, (255, 0, 0), 2)
+        
+        for start, end, far in hand["finger_tips"]:
+            cv2.circle(frame, tuple(far), 8, (0, 0, 255), -1)
+            cv2.line(frame, tuple(start), tuple(end), (255, 255, 0), 2)
+        
+        # Draw finger count
+        cv2.putText(frame, f"Fingers: {hand['finger_count']}", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
     
     def classify_gesture_by_fingers(self, finger_count, contour):
         """Classify gesture based on finger count and hand shape analysis"""
@@ -177,17 +311,23 @@ class EnhancedSignLanguageRecognition(QThread):
     
     def map_gesture_to_word(self, gesture):
         """Map detected gestures to words"""
-        gesture_mapping = {
-            "FIST": "YES",
-            "OPEN_HAND": "HELLO", 
-            "VICTORY": "I HAVE A DOUBT ON THIS",
-            "POINT": "THANKYOU",
-            "THUMB_UP": "I HAVE A DOUBT ON THIS",
-            "THREE_FINGERS": "HI",
-            "FOUR_FINGERS": "CAN YOU REPEAT THIS",
-            "NO_HAND": "NO"
-        }
-        return gesture_mapping.get(gesture, "")
+        return GESTURE_TO_WORD.get(gesture, "")
+    
+    def update_word(self, gesture, confidence, now):
+        """Feed one current detection to the smoother; returns the new word or ''"""
+        if not self.detection_enabled:
+            # Paused: drop the old votes here, on the thread that feeds the
+            # smoother, so a stale majority cannot fire a word on resume
+            if self.smoother.window:
+                self.smoother.reset()
+            return ""
+        # Low-confidence detections vote against every gesture
+        if gesture != "NO_HAND" and confidence <= 0.6:
+            gesture = "UNKNOWN"
+        word = self.smoother.update(gesture, now)
+        if word:
+            self.current_sentence += word + " "
+        return word
     
     def upload_to_firebase(self, sentence, is_chat=False):
         """Upload sentence to Firebase in real-time"""
@@ -232,11 +372,7 @@ class EnhancedSignLanguageRecognition(QThread):
     
     def run(self):
         self.running = True
-        self.cap = cv2.VideoCapture(0)
-        
-        # Set camera resolution for better detection
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        self.cap = self.frame_source or CameraSource(0)
         
         if not self.cap.isOpened():
             print("Error: Could not open webcam")
@@ -244,110 +380,159 @@ class EnhancedSignLanguageRecognition(QThread):
         
         print("[INFO] Starting skeletal finger detection...")
         
-        last_gesture = ""
-        gesture_stability = 0
-        required_stability = 5  # Reduced for more responsive detection
-        last_word_time = 0
-        word_cooldown = 2  # seconds between word additions
+        # New transcript per session; the previous one goes to transcript_archive/
+        self.transcript = TranscriptWriter(self.OUTPUT_FILE,
+                                           header="---- MUTE STUDENT SIGN LANGUAGE TRANSCRIPT ----\n")
+        
+        # Camera and preview get their own threads; inference runs on this QThread
+        # The grabber thread releases the camera once its last grab() has returned
+        self.grabber = LatestFrameGrabber(self.cap, on_grab=self.capture_stats.tick, release_source=True)
+        render_thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.grabber.start()
+        render_thread.start()
+        
+        self._inference_loop()
+        
+        # Cleanup
+        self.running = False
+        self.smoother.reset()
+        self.grabber.stop()
+        self.render_slot.close()
+        render_thread.join(timeout=1.0)
+        self.transcript.close()
+        cv2.destroyAllWindows()
+    
+    def _inference_loop(self):
+        """Stage 2: detect gestures on the newest captured frame"""
+        last_stats_time = 0
+        gesture, confidence, hand = "NO_HAND", 0.0, None
         
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
+            frame, captured_at = self.grabber.latest(timeout=0.5)
+            if frame is None:
+                if self.grabber.ended:
+                    self.running = False
+                continue
             
             # Flip frame horizontally for mirror effect
             frame = cv2.flip(frame, 1)
-            
-            # Always process frame for display
-            gesture, processed_frame, confidence, finger_tips = self.detect_fingers_skeletal(frame)
-            
             current_time = time.time()
             detected_word = ""
             
-            # Only process high-confidence detections if detection is enabled
-            if self.detection_enabled and confidence > 0.6:
-                if gesture == last_gesture:
-                    gesture_stability += 1
-                else:
-                    gesture_stability = 1
-                    last_gesture = gesture
-                
-                # Add word if gesture is stable and cooldown has passed
-                if (gesture_stability >= required_stability and 
-                    gesture != "NO_HAND" and 
-                    gesture != "UNKNOWN" and
-                    current_time - last_word_time >= word_cooldown):
-                    
-                    detected_word = self.map_gesture_to_word(gesture)
-                    if detected_word:
-                        self.current_sentence += detected_word + " "
-                        last_word_time = current_time
-                        
-                        # Write to local file
-                        with open(self.OUTPUT_FILE, "a") as f:
-                            f.write(detected_word + " ")
-                        
-                        # Emit signals
-                        self.prediction_ready.emit(detected_word)
-                        self.sentence_updated.emit(self.current_sentence)
-                        
-                        # Real-time Firebase upload
-                        if self.upload_to_firebase(self.current_sentence):
-                            print(f"Uploaded to Firebase: {self.current_sentence}")
-            
-            # Add comprehensive text overlays
-            status_text = "🟢 Detection: ACTIVE" if self.detection_enabled else "🔴 Detection: PAUSED"
-            cv2.putText(processed_frame, status_text, (20, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0) if self.detection_enabled else (0, 0, 255), 2)
-            
-            cv2.putText(processed_frame, f"Gesture: {gesture}", (20, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-            
-            cv2.putText(processed_frame, f"Confidence: {confidence:.2f}", (20, 110),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-            
-            cv2.putText(processed_frame, f"Stability: {gesture_stability}/{required_stability}", (20, 140),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            # A result is current if the detector ran, or the scene is unchanged
+            # since it last ran; governor-skipped frames only refresh the preview
+            current = self.governor.should_infer()
+            if current and self.motion_gate.changed(frame):
+                cpu_start = time.thread_time()
+                gesture, confidence, hand = self.detect_fingers_skeletal(frame)
+                self.governor.record(time.thread_time() - cpu_start, self.capture_stats.fps,
+                                     self.last_hand_box)
+                self.inference_stats.tick()
+                latency = time.perf_counter() - captured_at
+                self.prediction_latency += 0.1 * (latency - self.prediction_latency)
             
+            if current:
+                detected_word = self.update_word(gesture, confidence, current_time)
             if detected_word:
-                cv2.putText(processed_frame, f"Word: {detected_word}", (20, 170),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
-            
-            cv2.putText(processed_frame, f"Sentence: {self.current_sentence}", (20, 200),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            cv2.putText(processed_frame, "Skeletal Finger Detection Active", (20, 450),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            
-            # Draw finger analysis info
-            cv2.putText(processed_frame, "Green: Hand Contour", (400, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-            
-            cv2.putText(processed_frame, "Blue: Convex Hull", (400, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+                # Written to the local file by the transcript thread
+                self.transcript.write(detected_word + " ")
+                
+                # Emit signals
+                self.prediction_ready.emit(detected_word)
+                self.sentence_updated.emit(self.current_sentence)
+                
+                # Real-time Firebase upload
+                if self.upload_to_firebase(self.current_sentence):
+                    print(f"Uploaded to Firebase: {self.current_sentence}")
             
-            cv2.putText(processed_frame, "Red: Finger Joints", (400, 70),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            if self.preview_visible:
+                self.render_slot.put((frame, hand, gesture, confidence, self.smoother.votes(gesture), detected_word))
+            self.frame_count += 1
             
-            # Convert frame to QImage for display in PyQt
-            rgb_image = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+            if current_time - last_stats_time >= 1.0:
+                last_stats_time = current_time
+                self.stats_updated.emit(self.pipeline_stats())
+    
+    def _render_loop(self):
+        """Stage 3: draw overlays and hand the newest frame to the GUI"""
+        while self.running:
+            item = self.render_slot.get(timeout=0.5)
+            if item is None:
+                continue
+            if not self.preview_visible:
+                continue
+            processed_frame, hand, gesture, confidence, gesture_stability, detected_word = item
+            self.draw_hand_overlay(processed_frame, hand)
             
-            self.frame_ready.emit(qt_image)
+            # Add comprehensive text overlays
+            self.legend_overlay.update(self.PREVIEW_LEGEND, processed_frame.shape)
+            self.status_overlay.update(self.status_lines(gesture, confidence, gesture_stability, detected_word),
+                                       processed_frame.shape)
+            self.legend_overlay.blend(processed_frame)
+            self.status_overlay.blend(processed_frame)
             
-            self.frame_count += 1
+            if self.publish_preview(processed_frame):
+                self.frame_ready.emit()
+            self.render_stats.tick()
+    
+    def publish_preview(self, frame):
+        """Scale frame to fit the preview, as RGB, into a pooled buffer.
+
+        Returns True if the GUI has to be told (no other frame was pending).
+        """
+        frame_h, frame_w = frame.shape[:2]
+        box_w, box_h = self.preview_size
+        scale = min(box_w / frame_w, box_h / frame_h)
+        size = (max(1, int(frame_w * scale)), max(1, int(frame_h * scale)))
+        buffer = self.preview_buffers.acquire((size[1], size[0], 3))
+        if buffer is None:
+            return False
         
-        # Cleanup
-        if self.cap:
-            self.cap.release()
-        cv2.destroyAllWindows()
+        if self.preview_scratch is None or self.preview_scratch.shape != buffer.shape:
+            self.preview_scratch = np.empty_like(buffer)
+        # Bilinear: INTER_AREA is several times slower at non-integer ratios
+        cv2.resize(frame, size, dst=self.preview_scratch, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self.preview_scratch, cv2.COLOR_BGR2RGB, dst=buffer)
+        return self.preview_buffers.publish(buffer)
+    
+    def status_lines(self, gesture, confidence, gesture_stability, detected_word):
+        """Preview text that depends on the current detection, as overlay items"""
+        status_text = "🟢 Detection: ACTIVE" if self.detection_enabled else "🔴 Detection: PAUSED"
+        lines = [
+            (status_text, (20, 30), 0.7, (0, 255, 0) if self.detection_enabled else (0, 0, 255), 2),
+            (f"Gesture: {gesture}", (20, 80), 0.8, (0, 255, 0), 2),
+            (f"Confidence: {confidence:.2f}", (20, 110), 0.7, (0, 255, 255), 2),
+            (f"Stability: {gesture_stability}/{self.required_stability}", (20, 140), 0.6, (255, 255, 0), 2),
+        ]
+        if detected_word:
+            lines.append((f"Word: {detected_word}", (20, 170), 0.8, (255, 0, 0), 2))
+        lines.append((f"Sentence: {self.current_sentence}", (20, 200), 0.6, (255, 255, 255), 2))
+        return lines
+    
+    def pipeline_stats(self):
+        """Per-stage FPS and frames dropped between stages"""
+        return (f"Capture {self.capture_stats.fps:.0f} fps · "
+                f"Inference {self.inference_stats.fps:.0f} fps (skipped {self.grabber.skipped if self.grabber else 0}, "
+                f"stride {self.governor.stride}, static {self.motion_gate.skip_ratio:.0%}, "
+                f"latency {self.prediction_latency * 1000:.0f} ms) · "
+                f"Render {self.render_stats.fps:.0f} fps (dropped {self.render_slot.dropped}, "
+                f"coalesced {self.preview_buffers.coalesced}) · "
+                f"Segmented {self.processed_area_ratio:.0%} of frame")
+    
+    def set_preview_visible(self, visible):
+        """Called by the page when the camera preview is shown or hidden"""
+        self.preview_visible = visible
+    
+    def set_preview_size(self, width, height):
+        """Called by the page with the size available for the camera preview"""
+        if width > 0 and height > 0:
+            self.preview_size = (width, height)
     
     def stop_recognition(self):
         self.running = False
-        if self.cap:
-            self.cap.release()
+        if self.grabber:
+            self.grabber.stop()
+        self.render_slot.close()
 
 # ==========================================================
 # Enhanced Firebase Listener Thread
@@ -629,6 +814,13 @@ class MuteStudentPage(QWidget):
         self.detection_button.clicked.connect(self.toggle_detection)
         left_panel.addWidget(self.detection_button)
         
+        # Pipeline health
+        self.pipeline_stats_label = QLabel("")
+        self.pipeline_stats_label.setFont(QFont("Segoe UI", 10))
+        self.pipeline_stats_label.setStyleSheet("color: #9aa0a6; padding: 4px;")
+        self.pipeline_stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        left_panel.addWidget(self.pipeline_stats_label)
+        
         left_panel.addStretch()
         content.addLayout(left_panel)
 
@@ -814,13 +1006,49 @@ class MuteStudentPage(QWidget):
         self.sign_language_thread.frame_ready.connect(self.update_camera_frame)
         self.sign_language_thread.prediction_ready.connect(self.update_prediction)
         self.sign_language_thread.sentence_updated.connect(self.update_sentence)
+        self.sign_language_thread.stats_updated.connect(self.pipeline_stats_label.setText)
         self.sign_language_thread.start()
+        self.update_preview_size()
+
+    def showEvent(self, event):
+        """Resume preview rendering when the page becomes visible"""
+        super().showEvent(event)
+        if self.sign_language_thread:
+            self.sign_language_thread.set_preview_visible(True)
+
+    def hideEvent(self, event):
+        """Stop drawing overlays nobody can see (page switched or minimized)"""
+        super().hideEvent(event)
+        if self.sign_language_thread:
+            self.sign_language_thread.set_preview_visible(False)
 
-    def update_camera_frame(self, image):
-        """Update the camera display with new frame"""
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_preview_size()
+
+    def update_preview_size(self):
+        """Tell the recognition thread how large to render previews"""
+        if self.sign_language_thread:
+            size = self.camera_frame.contentsRect().size()
+            self.sign_language_thread.set_preview_size(size.width(), size.height())
+
+    def update_camera_frame(self):
+        """Show the newest preview frame (already scaled by the recognition thread)"""
+        # A queued frame_ready can arrive after leave_session() dropped the
+        # thread; take the buffers from the thread that emitted it
+        thread = self.sender() or self.sign_language_thread
+        if thread is None:
+            return
+        buffers = thread.preview_buffers
+        frame = buffers.take()
+        if frame is None:
+            return
+        h, w, ch = frame.shape
+        image = QImage(frame.data, w, h, ch * w, QImage.Format.Format_RGB888)
+        # fromImage copies the pixels, so the buffer can go back to the pool
         pixmap = QPixmap.fromImage(image)
-        scaled_pixmap = pixmap.scaled(500, 400, Qt.AspectRatioMode.KeepAspectRatio)
-        self.camera_frame.setPixmap(scaled_pixmap)
+        buffers.release(frame)
+        self.camera_frame.setPixmap(pixmap)
 
     def update_prediction(self, word):
         """Update the prediction display"""
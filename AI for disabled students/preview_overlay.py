@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+
+# ==========================================================
+# Cached Text Overlay for the Camera Preview
+# ==========================================================
+class CachedOverlay:
+    """Preview text drawn once into small alpha tiles and blended onto each frame.
+
+    items are (text, (x, y), scale, (b, g, r), thickness) tuples, as for
+    cv2.putText. Each item is rendered anti-aliased into a tile that just
+    fits its text; a tile is redrawn only when its item changes (or the
+    frame size does), so a new gesture name re-renders one line, not the
+    legend. From each tile the inverse alpha and the alpha-premultiplied
+    colour are kept, and blending is one multiply-add over the tile.
+    """
+
+    def __init__(self, font=cv2.FONT_HERSHEY_SIMPLEX):
+        self.font = font
+        self.shape = None
+        self.tiles = {}  # item -> (x0, y0, x1, y1, inverse, premultiplied) or None
+        self.active = []
+        self.redraws = 0
+
+    def _render(self, item, width, height):
+        text, (x, y), scale, bgr, thickness = item
+        (text_w, text_h), baseline = cv2.getTextSize(text, self.font, scale, thickness)
+        pad = thickness + 2
+        x0, y0 = max(0, x - pad), max(0, y - text_h - pad)
+        x1, y1 = min(width, x + text_w + pad), min(height, y + baseline + pad)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        alpha = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.putText(alpha, text, (x - x0, y - y0), self.font, scale, 255, thickness, cv2.LINE_AA)
+        alpha = cv2.merge((alpha, alpha, alpha))
+        color = np.empty_like(alpha)
+        color[:] = bgr
+        self.redraws += 1
+        return x0, y0, x1, y1, 255 - alpha, cv2.multiply(color, alpha, scale=1 / 255)
+
+    def update(self, items, shape):
+        """Use these items from now on, rendering tiles for any not seen before"""
+        if shape[:2] != self.shape:
+            self.shape = shape[:2]
+            self.tiles.clear()
+        height, width = self.shape
+        # Keep the tiles still in use; lines that change every few seconds
+        # (gesture, sentence) would otherwise accumulate
+        tiles = {}
+        for item in items:
+            tiles[item] = self.tiles[item] if item in self.tiles else self._render(item, width, height)
+        self.tiles = tiles
+        self.active = [tile for tile in tiles.values() if tile is not None]
+
+    def blend(self, frame):
+        """Alpha-blend the current tiles onto a BGR frame in place"""
+        for x0, y0, x1, y1, inverse, premultiplied in self.active:
+            region = frame[y0:y1, x0:x1]
+            cv2.multiply(region, inverse, dst=region, scale=1 / 255)
+            cv2.add(region, premultiplied, dst=region)
+
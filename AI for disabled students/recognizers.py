@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+
+from vision_pipeline import MotionGate
+
+# ==========================================================
+# Common Recognizer Interface
+# ==========================================================
+# Every recognizer takes one BGR frame at a time:
+#
+#     process(frame, roi=None) -> (prediction, confidence, word)
+#
+# prediction is the word the frame looks like ('' if none) and counts when
+# confidence > threshold; word is '' unless a new word was accepted. roi =
+# (x0, y0, x1, y1) limits the work to that region. hold() repeats the last
+# observation for a frame that has not changed, hand_lost() records a frame
+# without a hand, and close() releases the recognizer.
+
+SIGN_LANG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sign lang")
+
+
+class SkinRecognizer:
+    """Skin contour + convex-hull finger count (EnhancedSignLanguageRecognition)"""
+
+    threshold = 0.6
+
+    def __init__(self, fps=30.0, detection_scale=None, roi_tracking=True):
+        from mute_studentpage import EnhancedSignLanguageRecognition
+        self.recognizer = EnhancedSignLanguageRecognition(session_code=None)
+        if detection_scale is not None:
+            self.recognizer.detection_scale = detection_scale
+        self.recognizer.roi_tracking = roi_tracking
+        self.fps = fps
+        self.frames = 0
+        self.last = ("NO_HAND", 0.0)
+
+    def _advance(self, gesture, confidence):
+        # Frame time comes from the frame count, so replays are repeatable
+        word = self.recognizer.update_word(gesture, confidence, self.frames / self.fps)
+        self.frames += 1
+        self.last = (gesture, confidence)
+        prediction = self.recognizer.map_gesture_to_word(gesture) if confidence > self.threshold else ""
+        return prediction, confidence, word
+
+    def locate(self, frame, roi=None):
+        """Bounding box (x, y, w, h) of the hand in frame coordinates, or None - no gesture analysis"""
+        contour = self.recognizer.find_hand_contour(frame, roi)
+        return self.recognizer.last_hand_box if contour is not None else None
+
+    def process(self, frame, roi=None):
+        # The ROI tracker keeps its boxes in frame coordinates, so search the
+        # region in place instead of cropping
+        gesture, confidence, _ = self.recognizer.detect_fingers_skeletal(frame, roi)
+        return self._advance(gesture, confidence)
+
+    def hold(self):
+        return self._advance(*self.last)
+
+    def hand_lost(self):
+        return self._advance("NO_HAND", 0.0)
+
+    def close(self):
+        pass
+
+
+class LandmarkRecognizer:
+    """MediaPipe landmarks + sequence classifier (sign lang/sign_to_text.py)"""
+
+    def __init__(self, model_path=None):
+        if SIGN_LANG_DIR not in sys.path:
+            sys.path.insert(0, SIGN_LANG_DIR)
+        from sign_to_text import CONFIDENCE_THRESHOLD, SignToText, load_predictor
+        self.recognizer = SignToText(predict=load_predictor(model_path) if model_path else None)
+        self.threshold = CONFIDENCE_THRESHOLD
+
+    def process(self, frame, roi=None):
+        return self.recognizer.process(frame, roi)[:3]
+
+    def hold(self):
+        return self.recognizer.hold()
+
+    def hand_lost(self):
+        return self.recognizer.update(False)
+
+    def close(self):
+        self.recognizer.close()
+
+# ==========================================================
+# Cheap-to-Expensive Cascade
+# ==========================================================
+class CascadeRecognizer:
+    """Run an expensive recognizer only on frames and regions a cheap stage flags.
+
+    Every frame goes through the locator (by default the skin detector at
+    quarter resolution), which only answers whether a hand is present and
+    where. Without a hand the expensive stage is told so and skipped. With
+    a hand, a motion gate decides whether anything changed since the
+    expensive stage last ran: if not, it repeats its last observation;
+    otherwise it runs on the hand box grown by margin on each side.
+    """
+
+    def __init__(self, expensive, locator=None, margin=0.3, motion_gate=True, fps=30.0):
+        self.expensive = expensive
+        self.locator = locator or SkinRecognizer(fps, detection_scale=0.25)
+        self.threshold = expensive.threshold
+        self.margin = margin
+        self.gate = MotionGate() if motion_gate else None
+        self.frames = 0
+        self.no_hand = 0
+        self.held = 0
+        self.expensive_runs = 0
+        self.cheap_time = 0.0
+        self.expensive_time = 0.0
+
+    def roi(self, box, shape, bounds=None):
+        """Hand box grown by margin per side, clipped to bounds (x0, y0, x1, y1; default the frame)"""
+        x, y, w, h = box
+        dx, dy = int(w * self.margin), int(h * self.margin)
+        x0, y0, x1, y1 = bounds if bounds is not None else (0, 0, shape[1], shape[0])
+        return (max(x0, x - dx), max(y0, y - dy), min(x1, x + w + dx), min(y1, y + h + dy))
+
+    def process(self, frame, roi=None):
+        self.frames += 1
+        start = time.perf_counter()
+        # The hand is only looked for inside roi, and the expensive stage never sees past it
+        box = self.locator.locate(frame, roi)
+        changed = box is not None and (self.gate is None or self.gate.changed(frame))
+        checked = time.perf_counter()
+        self.cheap_time += checked - start
+
+        if box is None:
+            self.no_hand += 1
+            result = self.expensive.hand_lost()
+        elif not changed:
+            self.held += 1
+            result = self.expensive.hold()
+        else:
+            self.expensive_runs += 1
+            result = self.expensive.process(frame, self.roi(box, frame.shape, roi))
+        self.expensive_time += time.perf_counter() - checked
+        return result
+
+    @property
+    def savings(self):
+        """Share of frames on which the expensive stage did not run"""
+        return 1 - self.expensive_runs / self.frames if self.frames else 0.0
+
+    def report(self):
+        frames = max(self.frames, 1)
+        return (f"cascade: expensive stage ran on {self.expensive_runs}/{self.frames} frames "
+                f"({self.savings:.0%} saved; {self.no_hand} without a hand, {self.held} unchanged), "
+                f"cheap {self.cheap_time / frames * 1000:.2f} ms/frame, "
+                f"expensive {self.expensive_time / frames * 1000:.2f} ms/frame")
+
+    def close(self):
+        self.expensive.close()
+        self.locator.close()
@@ -0,0 +1,312 @@
+"""Dynamic-sign matcher: nearest recorded template under dynamic time warping.
+
+Signs such as COME or THANK YOU are movements, so the live landmark window is
+compared with recorded example windows (templates) by DTW, which lets the
+same movement be signed faster or slower. Windows are normalized like the
+classifier's (wrist-relative, hand-size-invariant) and templates of any
+length are resampled to the window length.
+
+Exact DTW against hundreds of templates is too slow per frame, so
+candidates are pruned with lower bounds that cannot exceed the DTW distance:
+
+    LB_Kim     first and last frames must be aligned with each other; cheap,
+               used to pick a first candidate whose exact distance seeds
+               the best-so-far
+    LB_Keogh   distance from the query to each template's envelope (min/max
+               within the warping band), for all remaining templates in one
+               NumPy pass
+    abandon    DTW rows stop as soon as the row minimum plus the LB_Keogh
+               of the rows still to come reaches the best-so-far
+
+Candidates are tried in increasing lower-bound order, and the search stops
+at the first bound above the best-so-far or when the time budget runs out
+(the best match so far is returned).
+
+Template libraries are .npz archives holding:
+    labels      (N,) sign of each template
+    templates   (N, 20, 63) float32 normalized windows
+    radius      warping band half-width in frames
+    max_distance  mean per-frame distance at which confidence reaches 0 (NaN:
+                  calibrated from the templates when first used)
+
+    python dtw_matcher.py build --data dataset_dir --per-label 40 --out sign_templates.npz
+    python dtw_matcher.py build --synthetic 400 --out sign_templates.npz
+    python dtw_matcher.py evaluate sign_templates.npz --synthetic 200 --seed 1
+"""
+import argparse
+import time
+
+import numpy as np
+
+from landmark_classifier import FEATURES, SEQUENCE_LENGTH, load_data, normalize_windows
+
+INF = float("inf")
+
+
+def resample(sequence, length):
+    """(length, features) linear resampling of a (frames, features) sequence"""
+    sequence = np.asarray(sequence, dtype=np.float32)
+    if len(sequence) == length:
+        return sequence
+    positions = np.linspace(0, len(sequence) - 1, length)
+    below = np.floor(positions).astype(int)
+    above = np.minimum(below + 1, len(sequence) - 1)
+    weight = (positions - below)[:, None].astype(np.float32)
+    return sequence[below] * (1 - weight) + sequence[above] * weight
+
+
+def envelopes(windows, radius):
+    """(upper, lower) running max/min of (N, T, F) windows over +-radius frames"""
+    upper = windows.copy()
+    lower = windows.copy()
+    for shift in range(1, radius + 1):
+        np.maximum(upper[:, :-shift], windows[:, shift:], out=upper[:, :-shift])
+        np.maximum(upper[:, shift:], windows[:, :-shift], out=upper[:, shift:])
+        np.minimum(lower[:, :-shift], windows[:, shift:], out=lower[:, :-shift])
+        np.minimum(lower[:, shift:], windows[:, :-shift], out=lower[:, shift:])
+    return upper, lower
+
+
+def banded_dtw(cost, radius, best=INF, tails=None):
+    """DTW distance over a cost matrix given as a list of rows, within +-radius.
+
+    Returns INF as soon as the distance must reach best; tails[i] is a lower
+    bound on the cost of rows i.. (e.g. cumulative LB_Keogh), or None.
+    """
+    n = len(cost)
+    previous = [INF] * n
+    for i in range(n):
+        row = [INF] * n
+        costs = cost[i]
+        lo, hi = max(0, i - radius), min(n - 1, i + radius)
+        left = INF
+        row_min = INF
+        for j in range(lo, hi + 1):
+            if i == 0:
+                step = 0.0 if j == 0 else left
+            else:
+                step = previous[j]
+                if j and previous[j - 1] < step:
+                    step = previous[j - 1]
+                if left < step:
+                    step = left
+            left = costs[j] + step
+            row[j] = left
+            if left < row_min:
+                row_min = left
+        remaining = tails[i + 1] if tails is not None and i + 1 < n else 0.0
+        if row_min + remaining >= best:
+            return INF
+        previous = row
+    return previous[n - 1]
+
+# ==========================================================
+# Template Matcher
+# ==========================================================
+class DTWMatcher:
+    """1-nearest-neighbour over a template library with banded DTW and pruning"""
+
+    def __init__(self, length=SEQUENCE_LENGTH, band=0.2, max_distance=None, budget=0.005,
+                 features=FEATURES):
+        self.length = length
+        self.features = features
+        self.radius = max(1, int(round(band * length)))
+        self.max_distance = max_distance  # None: calibrate() on first predict()
+        self.budget = budget  # seconds per match; None for an exhaustive search
+        self.labels = np.empty(0, dtype=object)
+        self.templates = np.empty((0, length, features), dtype=np.float32)
+        self._index()
+        self.scratch = np.zeros((length, features), dtype=np.float32)
+        # What the last match() did, for benchmarks and tuning
+        self.last = {"computed": 0, "abandoned": 0, "pruned": 0, "complete": True}
+
+    def _index(self):
+        self.upper, self.lower = envelopes(self.templates, self.radius)
+        self.norms = (self.templates ** 2).sum(axis=2)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add(self, labels, sequences):
+        """Add recorded sequences (each (frames, 63) landmarks, any length) as templates"""
+        windows = np.stack([resample(sequence, self.length) for sequence in sequences])
+        self.labels = np.concatenate([self.labels, np.asarray(labels, dtype=object)])
+        self.templates = np.concatenate([self.templates, normalize_windows(windows)])
+        self._index()
+
+    @classmethod
+    def load(cls, path, budget=0.005):
+        with np.load(path, allow_pickle=False) as data:
+            templates = data["templates"]
+            max_distance = float(data["max_distance"])
+            matcher = cls(templates.shape[1], max_distance=None if np.isnan(max_distance) else max_distance,
+                          budget=budget, features=templates.shape[2])
+            matcher.radius = int(data["radius"])
+            matcher.labels = data["labels"].astype(object)
+            matcher.templates = templates.astype(np.float32)
+        matcher._index()
+        return matcher
+
+    def save(self, path):
+        np.savez(path, labels=self.labels.astype(str), templates=self.templates,
+                 radius=self.radius,
+                 max_distance=np.nan if self.max_distance is None else self.max_distance)
+
+    def _cost(self, query, query_norms, index):
+        """Squared frame-to-frame distances between query and one template, as rows"""
+        template = self.templates[index]
+        cost = query_norms[:, None] + self.norms[index][None, :] - 2 * (query @ template.T)
+        return np.maximum(cost, 0).tolist()
+
+    def match(self, window, budget=None):
+        """(label, mean per-frame DTW distance) of the nearest template; ('', inf) if empty"""
+        if not len(self.labels):
+            return "", INF
+        budget = self.budget if budget is None else budget
+        best_index, best = self._nearest(normalize_windows(window, out=self.scratch), budget)
+        return str(self.labels[best_index]), best / self.length
+
+    def _nearest(self, query, budget, exclude=None):
+        """(index, DTW distance) of the template nearest a normalized query, skipping exclude"""
+        start = time.perf_counter()
+        query_norms = (query ** 2).sum(axis=1)
+
+        # LB_Kim: the first and last frames are always aligned with each other
+        kim = (((self.templates[:, 0] - query[0]) ** 2).sum(axis=1) +
+               ((self.templates[:, -1] - query[-1]) ** 2).sum(axis=1))
+        if exclude is not None:
+            kim[exclude] = INF
+        best_index = int(np.argmin(kim))
+        best = banded_dtw(self._cost(query, query_norms, best_index), self.radius)
+        computed, abandoned = 1, 0
+
+        # LB_Keogh for everything LB_Kim cannot rule out, one vectorized pass
+        candidates = np.flatnonzero(kim < best)
+        candidates = candidates[candidates != best_index]
+        above = np.maximum(query - self.upper[candidates], 0)
+        below = np.maximum(self.lower[candidates] - query, 0)
+        rows = (above * above + below * below).sum(axis=2)
+        bounds = np.maximum(rows.sum(axis=1), kim[candidates])
+        # tails[k, i] = LB_Keogh of rows i.. for early abandoning
+        tails = np.cumsum(rows[:, ::-1], axis=1)[:, ::-1]
+
+        complete = True
+        for k in np.argsort(bounds):
+            if bounds[k] >= best:
+                break
+            if budget is not None and time.perf_counter() - start > budget:
+                complete = False
+                break
+            distance = banded_dtw(self._cost(query, query_norms, candidates[k]), self.radius,
+                                  best, tails[k].tolist())
+            computed += 1
+            if distance < best:
+                best, best_index = distance, int(candidates[k])
+            elif distance == INF:
+                abandoned += 1
+
+        self.last = {"computed": computed, "abandoned": abandoned,
+                     "pruned": len(self.labels) - computed, "complete": complete}
+        return best_index, best
+
+    def calibrate(self, percentile=95, confidence=0.8):
+        """Set max_distance from leave-one-out nearest-template distances.
+
+        The percentile-th distance between a template and its nearest other
+        template gets the given confidence (sign_to_text's CONFIDENCE_THRESHOLD),
+        so windows much further from every template than templates are from
+        each other get no confidence at all.
+        """
+        if len(self.labels) < 2:
+            raise ValueError("calibration needs at least two templates")
+        distances = [self._nearest(self.templates[i], None, exclude=i)[1] / self.length
+                     for i in range(len(self))]
+        self.max_distance = float(np.percentile(distances, percentile)) / (1.0 - confidence)
+        return self.max_distance
+
+    def predict(self, sequence):
+        """(label, confidence) like LandmarkClassifier.predict, for sign_to_text"""
+        if self.max_distance is None:
+            self.calibrate()
+        label, distance = self.match(sequence)
+        confidence = max(0.0, 1.0 - distance / self.max_distance)
+        return (label, confidence) if confidence > 0 else ("", 0.0)
+
+    def exhaustive(self, window):
+        """(label, distance) by exact DTW against every template - the reference for match()"""
+        query = normalize_windows(window, out=self.scratch)
+        query_norms = (query ** 2).sum(axis=1)
+        distances = [banded_dtw(self._cost(query, query_norms, i), self.radius) for i in range(len(self))]
+        best = int(np.argmin(distances))
+        return str(self.labels[best]), distances[best] / self.length
+
+# ==========================================================
+# Command Line
+# ==========================================================
+def pick_templates(labels, per_label, seed=0):
+    """Indices of up to per_label random examples of each label"""
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels).astype(str)
+    chosen = []
+    for label in np.unique(labels):
+        indices = np.flatnonzero(labels == label)
+        chosen.extend(rng.permutation(indices)[:per_label])
+    return np.sort(np.array(chosen, dtype=int))
+
+
+def evaluate(matcher, windows, labels):
+    times, correct, computed, complete = [], 0, 0, 0
+    for window, label in zip(windows, labels):
+        start = time.perf_counter()
+        predicted, _ = matcher.match(window)
+        times.append(time.perf_counter() - start)
+        correct += predicted == str(label)
+        computed += matcher.last["computed"]
+        complete += matcher.last["complete"]
+    ms = np.array(times) * 1000
+    print(f"accuracy {correct / len(windows):.1%} on {len(windows)} windows, {len(matcher)} templates")
+    print(f"latency  mean {ms.mean():.2f} ms, p95 {np.percentile(ms, 95):.2f} ms, "
+          f"max {ms.max():.2f} ms; {computed / len(windows):.1f} DTWs per query, "
+          f"{complete / len(windows):.0%} finished within the budget")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("build", "evaluate"):
+        command = commands.add_parser(name)
+        if name == "evaluate":
+            command.add_argument("templates")
+        source = command.add_mutually_exclusive_group(required=True)
+        source.add_argument("--data", help="landmark_dataset directory or .npz with windows and labels")
+        source.add_argument("--synthetic", type=int, help="generate this many synthetic windows")
+        command.add_argument("--seed", type=int, default=0)
+        command.add_argument("--budget-ms", type=float, default=5.0)
+    build_command = commands.choices["build"]
+    build_command.add_argument("--out", default="sign_templates.npz")
+    build_command.add_argument("--per-label", type=int, default=40)
+    build_command.add_argument("--band", type=float, default=0.2, help="warping band as a share of the window")
+    build_command.add_argument("--max-distance", type=float,
+                               help="distance at which confidence reaches 0 (default: calibrated)")
+    args = parser.parse_args()
+
+    windows, labels = load_data(args)
+    if args.command == "evaluate":
+        evaluate(DTWMatcher.load(args.templates, budget=args.budget_ms / 1000), windows, labels)
+        return
+
+    chosen = pick_templates(labels, args.per_label, args.seed)
+    matcher = DTWMatcher(windows.shape[1], args.band, args.max_distance, args.budget_ms / 1000,
+                         windows.shape[2])
+    matcher.add(np.asarray(labels)[chosen].astype(str), np.asarray(windows[chosen]))
+    if matcher.max_distance is None:
+        print(f"calibrated max distance {matcher.calibrate():.3f}")
+    matcher.save(args.out)
+    print(f"saved {args.out} ({len(matcher)} templates of {len(set(matcher.labels))} signs)")
+    rest = np.setdiff1d(np.arange(len(windows)), chosen)
+    if len(rest):
+        evaluate(matcher, np.asarray(windows[rest[:500]]), np.asarray(labels)[rest[:500]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import numpy as np
+
+from landmark_classifier import FEATURES, SEQUENCE_LENGTH, normalize_windows
+
+# ==========================================================
+# Preallocated Landmark Window
+# ==========================================================
+class LandmarkWindow:
+    """Ring of the last `length` landmark frames with a contiguous window view.
+
+    Frames live in a (2 * length, 63) float32 array and each frame is written
+    twice, at slot i and i + length, so the newest `length` frames are always
+    one contiguous slice (oldest first) - no re-stacking per prediction and
+    no per-frame Python lists.
+    """
+
+    def __init__(self, length=SEQUENCE_LENGTH, features=FEATURES):
+        self.length = length
+        self.data = np.zeros((2 * length, features), dtype=np.float32)
+        self.scratch = np.zeros((length, features), dtype=np.float32)
+        self.head = length - 1
+        self.count = 0
+
+    def push_landmarks(self, landmarks):
+        """Write MediaPipe landmark objects (x, y, z) in place as the newest frame"""
+        self.head = (self.head + 1) % self.length
+        row = self.data[self.head]
+        points = min(len(landmarks), len(row) // 3)
+        for i in range(points):
+            landmark = landmarks[i]
+            row[3 * i] = landmark.x
+            row[3 * i + 1] = landmark.y
+            row[3 * i + 2] = landmark.z
+        row[3 * points:] = 0
+        self.data[self.head + self.length] = row
+        self.count += 1
+
+    def push(self, values):
+        """Write a frame given as 63 numbers"""
+        self.head = (self.head + 1) % self.length
+        self.data[self.head] = values
+        self.data[self.head + self.length] = self.data[self.head]
+        self.count += 1
+
+    def window(self):
+        """(length, 63) view of the newest frames, oldest first - valid until the next push"""
+        start = self.head + 1
+        return self.data[start:start + self.length]
+
+    def normalized(self):
+        """Wrist-relative, scale-invariant window, computed into a reused buffer"""
+        return normalize_windows(self.window(), out=self.scratch)
+
+    def clear(self):
+        self.count = 0
+
+    @property
+    def full(self):
+        return self.count >= self.length
+
+    def __len__(self):
+        return min(self.count, self.length)
@@ -0,0 +1,275 @@
+"""Trainable sign classifier over 20-frame MediaPipe landmark windows.
+
+A small NumPy MLP: the normalized (20, 63) window is flattened and passed
+through ReLU hidden layers to a softmax over the sign labels. Inference is a
+few float32 matrix products, so a single window takes tens of microseconds
+and batches of windows are classified in one call.
+
+Model files are .npz archives holding:
+    labels            (C,) sign names, in output order
+    sequence_length   frames per window (20)
+    features          values per frame (63)
+    weight_<i>        (in, out) float32 for layer i
+    bias_<i>          (out,) float32 for layer i
+
+    python landmark_classifier.py train --synthetic 6000 --out landmark_model.npz
+    python landmark_classifier.py train --data dataset_dir --out landmark_model.npz
+    python landmark_classifier.py evaluate landmark_model.npz --data test_dir
+
+--data is a landmark_dataset directory, streamed from disk batch by batch,
+or an .npz archive with windows (N, 20, 63) and labels (N,).
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+SEQUENCE_LENGTH = 20
+FEATURES = 63
+WRIST = 0
+MIDDLE_KNUCKLE = 9
+
+# ==========================================================
+# Landmark Normalization
+# ==========================================================
+def normalize_windows(windows, out=None):
+    """Wrist-relative, hand-size-invariant float32 copy of (..., T, 63) windows.
+
+    Every frame is moved so its wrist is at the origin and divided by that
+    frame's wrist to middle-knuckle distance. The wrist slot, which would
+    otherwise always be zero, keeps the wrist's offset from its position in
+    the last frame (in last-frame hand sizes), so movement is not lost.
+    Pass a float32 array of the same shape as out to reuse it.
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    if out is None:
+        out = np.empty(windows.shape, dtype=np.float32)
+    points = windows.reshape(*windows.shape[:-1], 21, 3)
+    normalized = out.reshape(points.shape)
+    wrist = points[..., WRIST, :]
+
+    np.subtract(points, wrist[..., None, :], out=normalized)
+    scale = np.hypot(normalized[..., MIDDLE_KNUCKLE, 0], normalized[..., MIDDLE_KNUCKLE, 1])
+    np.maximum(scale, 1e-6, out=scale)
+    normalized /= scale[..., None, None]
+
+    np.subtract(wrist, wrist[..., -1:, :], out=normalized[..., WRIST, :])
+    normalized[..., WRIST, :] /= scale[..., -1:, None]
+    return out
+
+
+def flush_subnormals(array):
+    """float32 copy with subnormal values set to zero.
+
+    Weight decay drives weights of always-zero inputs towards zero; once they
+    are subnormal, CPU matrix products on them run about 100x slower.
+    """
+    array = np.array(array, dtype=np.float32)
+    array[np.abs(array) < np.finfo(np.float32).tiny] = 0
+    return array
+
+# ==========================================================
+# Classifier
+# ==========================================================
+class LandmarkClassifier:
+    """MLP over normalized landmark windows; predict() matches fake_model_predict"""
+
+    def __init__(self, layers, labels, sequence_length=SEQUENCE_LENGTH, features=FEATURES):
+        self.layers = [(flush_subnormals(w), flush_subnormals(b)) for w, b in layers]
+        self.labels = [str(label) for label in labels]
+        self.sequence_length = sequence_length
+        self.features = features
+        # Reused by predict() so classifying the live window allocates little
+        self.scratch = np.zeros((1, sequence_length, features), dtype=np.float32)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            count = sum(1 for name in data.files if name.startswith("weight_"))
+            layers = [(data[f"weight_{i}"], data[f"bias_{i}"]) for i in range(count)]
+            return cls(layers, data["labels"], int(data["sequence_length"]), int(data["features"]))
+
+    def save(self, path):
+        arrays = {"labels": np.array(self.labels),
+                  "sequence_length": self.sequence_length,
+                  "features": self.features}
+        for i, (weight, bias) in enumerate(self.layers):
+            arrays[f"weight_{i}"] = weight
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def predict_proba(self, windows, out=None):
+        """(N, C) class probabilities for (N, T, 63) raw landmark windows"""
+        x = normalize_windows(windows, out=out).reshape(len(windows), -1)
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight + bias
+            if i < len(self.layers) - 1:
+                np.maximum(x, 0, out=x)
+        x -= x.max(axis=1, keepdims=True)
+        np.exp(x, out=x)
+        x /= x.sum(axis=1, keepdims=True)
+        return x
+
+    def predict_batch(self, windows, out=None):
+        """[(label, confidence)] for a batch of windows"""
+        probabilities = self.predict_proba(windows, out=out)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[k], float(probabilities[i, k])) for i, k in enumerate(best)]
+
+    def predict(self, sequence):
+        """(label, confidence) for one window, e.g. the sign_to_text LandmarkWindow view"""
+        window = np.asarray(sequence, dtype=np.float32)[None]
+        return self.predict_batch(window, out=self.scratch)[0]
+
+# ==========================================================
+# Training
+# ==========================================================
+def train(windows, labels, indices=None, hidden=(128, 64), epochs=40, batch_size=64,
+          learning_rate=1e-3, weight_decay=1e-4, seed=0, log=print):
+    """Fit an MLP with Adam and softmax cross-entropy; returns a LandmarkClassifier.
+
+    windows may be a memory-mapped array: only the records of the current
+    batch are read and normalized. indices selects the training records.
+    """
+    rng = np.random.default_rng(seed)
+    indices = np.arange(len(windows)) if indices is None else np.asarray(indices)
+    classes, y = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+    classes = list(classes)
+
+    sizes = [windows.shape[1] * windows.shape[2], *hidden, len(classes)]
+    params = []
+    for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+        params.append(rng.normal(0, np.sqrt(2.0 / n_in), size=(n_in, n_out)).astype(np.float32))
+        params.append(np.zeros(n_out, dtype=np.float32))
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    step = 0
+
+    for epoch in range(epochs):
+        order = rng.permutation(indices)
+        total_loss = 0.0
+        for start in range(0, len(order), batch_size):
+            # Sorted so a memory-mapped dataset is read mostly sequentially
+            batch = np.sort(order[start:start + batch_size])
+            activations = [normalize_windows(windows[batch]).reshape(len(batch), -1)]
+            for i in range(0, len(params), 2):
+                z = activations[-1] @ params[i] + params[i + 1]
+                activations.append(np.maximum(z, 0) if i < len(params) - 2 else z)
+
+            logits = activations[-1] - activations[-1].max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            targets = y[batch]
+            total_loss += -np.log(probabilities[np.arange(len(batch)), targets] + 1e-9).sum()
+
+            # Backpropagate the cross-entropy gradient through each layer
+            delta = probabilities
+            delta[np.arange(len(batch)), targets] -= 1
+            delta /= len(batch)
+            grads = [None] * len(params)
+            for i in range(len(params) - 2, -1, -2):
+                grads[i] = activations[i // 2].T @ delta + weight_decay * params[i]
+                grads[i + 1] = delta.sum(axis=0)
+                if i:
+                    delta = (delta @ params[i].T) * (activations[i // 2] > 0)
+
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= 0.9
+                m += 0.1 * g
+                v *= 0.999
+                v += 0.001 * g * g
+                p -= learning_rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+        for array in params + moments + velocities:
+            array[np.abs(array) < np.finfo(np.float32).tiny] = 0
+        if log and (epoch + 1) % 10 == 0:
+            log(f"epoch {epoch + 1}: loss {total_loss / len(indices):.4f}")
+
+    layers = list(zip(params[0::2], params[1::2]))
+    return LandmarkClassifier(layers, classes, windows.shape[1], windows.shape[2])
+
+# ==========================================================
+# Evaluation
+# ==========================================================
+def accuracy(classifier, windows, labels, indices=None, chunk=4096):
+    indices = np.arange(len(windows)) if indices is None else np.sort(indices)
+    correct = 0
+    for start in range(0, len(indices), chunk):
+        batch = indices[start:start + chunk]
+        predictions = classifier.predict_batch(windows[batch])
+        correct += sum(p == str(t) for (p, _), t in zip(predictions, labels[batch]))
+    return correct / len(indices)
+
+
+def latency_per_window(classifier, windows, batch_size, repeats=5):
+    """Best-of-repeats microseconds per window when classifying in batches"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if batch_size == 1:
+            for window in windows:
+                classifier.predict(window)
+        else:
+            for i in range(0, len(windows), batch_size):
+                classifier.predict_proba(windows[i:i + batch_size])
+        best = min(best, time.perf_counter() - start)
+    return best / len(windows) * 1e6
+
+
+def report(classifier, windows, labels, indices=None):
+    indices = np.arange(len(windows)) if indices is None else np.sort(indices)
+    print(f"accuracy {accuracy(classifier, windows, labels, indices):.1%} on {len(indices)} windows")
+    sample = np.asarray(windows[indices[:1024]])
+    for batch_size in (1, 16, 256):
+        us = latency_per_window(classifier, sample, batch_size)
+        print(f"latency  batch {batch_size:>3}: {us:7.1f} us/window ({1e6 / us:,.0f} windows/s)")
+
+
+def load_data(args):
+    if args.data and os.path.isdir(args.data):
+        from landmark_dataset import LandmarkDataset
+        dataset = LandmarkDataset(args.data)
+        return dataset.windows, dataset.label_strings()
+    if args.data:
+        with np.load(args.data) as data:
+            return data["windows"], data["labels"]
+    from synthetic_landmarks import synthetic_dataset
+    return synthetic_dataset(args.synthetic, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("train", "evaluate"):
+        command = commands.add_parser(name)
+        if name == "evaluate":
+            command.add_argument("model")
+        source = command.add_mutually_exclusive_group(required=True)
+        source.add_argument("--data", help="landmark_dataset directory or .npz with windows and labels")
+        source.add_argument("--synthetic", type=int, help="generate this many synthetic windows")
+        command.add_argument("--seed", type=int, default=0)
+    train_command = commands.choices["train"]
+    train_command.add_argument("--out", default="landmark_model.npz")
+    train_command.add_argument("--hidden", type=int, nargs="+", default=[128, 64])
+    train_command.add_argument("--epochs", type=int, default=40)
+    train_command.add_argument("--test-split", type=float, default=0.2)
+    args = parser.parse_args()
+
+    windows, labels = load_data(args)
+    if args.command == "evaluate":
+        report(LandmarkClassifier.load(args.model), windows, labels)
+        return
+
+    order = np.random.default_rng(args.seed).permutation(len(windows))
+    test_count = int(len(windows) * args.test_split)
+    test, fit = order[:test_count], order[test_count:]
+    classifier = train(windows, labels, fit, hidden=args.hidden, epochs=args.epochs, seed=args.seed)
+    classifier.save(args.out)
+    print(f"saved {args.out} ({len(classifier.labels)} signs, {len(fit)} training windows)")
+    if test_count:
+        report(classifier, windows, labels, test)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Append-only, memory-mapped store of labelled landmark windows.
+
+A dataset is a directory:
+    index.json    shapes, label names and the committed record count
+    windows.f32   float32 records of (sequence_length, features) landmarks
+    labels.u16    uint16 label number per record (into index.json labels)
+    frames.u8     optional uint8 thumbnail of each record's last frame
+
+Records are only ever appended, and index.json is rewritten atomically on
+flush, so a crash loses at most the unflushed tail. Readers memory-map the
+files, so training can stream through datasets much larger than RAM.
+
+    python landmark_dataset.py info DATASET
+    python landmark_dataset.py merge OUT IN [IN ...]
+    python landmark_dataset.py split IN --out train val --fractions 0.8 0.2
+    python landmark_dataset.py shuffle IN OUT
+    python landmark_dataset.py synthetic OUT --count 10000
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from landmark_classifier import FEATURES, SEQUENCE_LENGTH
+
+INDEX_FILE = "index.json"
+WINDOWS_FILE = "windows.f32"
+LABELS_FILE = "labels.u16"
+FRAMES_FILE = "frames.u8"
+FORMAT_VERSION = 1
+
+# ==========================================================
+# Writer
+# ==========================================================
+class DatasetWriter:
+    """Append records to a new or existing dataset directory"""
+
+    def __init__(self, path, sequence_length=SEQUENCE_LENGTH, features=FEATURES, frame_shape=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+            if (self.index["sequence_length"], self.index["features"]) != (sequence_length, features):
+                raise ValueError(f"{path} holds {self.index['sequence_length']}x{self.index['features']} "
+                                 f"windows, not {sequence_length}x{features}")
+        else:
+            self.index = {
+                "version": FORMAT_VERSION,
+                "sequence_length": sequence_length,
+                "features": features,
+                "frame_shape": list(frame_shape) if frame_shape else None,
+                "labels": [],
+                "count": 0,
+            }
+        self.frame_shape = tuple(self.index["frame_shape"]) if self.index["frame_shape"] else None
+        self.window_shape = (sequence_length, features)
+
+        # Drop any records written after the last flush (e.g. before a crash)
+        count = self.index["count"]
+        self.files = {
+            WINDOWS_FILE: self._open(WINDOWS_FILE, count * sequence_length * features * 4),
+            LABELS_FILE: self._open(LABELS_FILE, count * 2),
+        }
+        if self.frame_shape:
+            self.files[FRAMES_FILE] = self._open(FRAMES_FILE, count * int(np.prod(self.frame_shape)))
+        self.label_numbers = {name: i for i, name in enumerate(self.index["labels"])}
+
+    def _open(self, name, size):
+        file = open(os.path.join(self.path, name), "ab")
+        file.truncate(size)
+        return file
+
+    def label_number(self, label):
+        number = self.label_numbers.get(label)
+        if number is None:
+            number = self.label_numbers[label] = len(self.index["labels"])
+            self.index["labels"].append(label)
+        return number
+
+    def append(self, window, label, frame=None):
+        """Add one (sequence_length, features) window; frame is needed if the dataset stores frames"""
+        # Check everything before writing, so a rejected record leaves no bytes behind
+        window = np.asarray(window, dtype=np.float32)
+        if window.shape != self.window_shape:
+            raise ValueError(f"window shape {window.shape} != {self.window_shape}")
+        if self.frame_shape:
+            if frame is None:
+                raise ValueError(f"{self.path} stores frames; frame is required")
+            frame = np.asarray(frame, dtype=np.uint8)
+            if frame.shape != self.frame_shape:
+                raise ValueError(f"frame shape {frame.shape} != {self.frame_shape}")
+        self.files[WINDOWS_FILE].write(window.tobytes())
+        self.files[LABELS_FILE].write(np.uint16(self.label_number(label)).tobytes())
+        if self.frame_shape:
+            self.files[FRAMES_FILE].write(frame.tobytes())
+        self.index["count"] += 1
+
+    def append_batch(self, windows, labels, frames=None):
+        """Add many records at once; labels are names"""
+        windows = np.asarray(windows, dtype=np.float32)
+        if windows.shape[1:] != self.window_shape:
+            raise ValueError(f"window shape {windows.shape[1:]} != {self.window_shape}")
+        if len(labels) != len(windows):
+            raise ValueError(f"{len(labels)} labels for {len(windows)} windows")
+        if self.frame_shape:
+            if frames is None:
+                raise ValueError(f"{self.path} stores frames; frames are required")
+            frames = np.asarray(frames, dtype=np.uint8)
+            if frames.shape != (len(windows),) + self.frame_shape:
+                raise ValueError(f"frames shape {frames.shape[1:]} != {self.frame_shape}")
+        numbers = np.array([self.label_number(str(label)) for label in labels], dtype=np.uint16)
+        self.files[WINDOWS_FILE].write(windows.tobytes())
+        self.files[LABELS_FILE].write(numbers.tobytes())
+        if self.frame_shape:
+            self.files[FRAMES_FILE].write(frames.tobytes())
+        self.index["count"] += len(windows)
+
+    def flush(self):
+        """Make appended records durable and visible to readers"""
+        for file in self.files.values():
+            file.flush()
+            os.fsync(file.fileno())
+        temporary = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(temporary, os.path.join(self.path, INDEX_FILE))
+
+    def close(self):
+        self.flush()
+        for file in self.files.values():
+            file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==========================================================
+# Reader
+# ==========================================================
+class LandmarkDataset:
+    """Read-only, memory-mapped view of a dataset directory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self.label_names = list(self.index["labels"])
+        self.sequence_length = self.index["sequence_length"]
+        self.features = self.index["features"]
+        self.frame_shape = tuple(self.index["frame_shape"]) if self.index["frame_shape"] else None
+        count = self.index["count"]
+
+        self.windows = self._map(WINDOWS_FILE, np.float32, (count, self.sequence_length, self.features))
+        self.labels = self._map(LABELS_FILE, np.uint16, (count,))
+        self.frames = self._map(FRAMES_FILE, np.uint8, (count, *self.frame_shape)) if self.frame_shape else None
+
+    def _map(self, name, dtype, shape):
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def label_strings(self, numbers=None):
+        """Label names for the given label numbers (all records by default)"""
+        names = np.array(self.label_names)
+        return names[self.labels if numbers is None else numbers]
+
+    def batches(self, batch_size=256, shuffle=False, seed=0, indices=None):
+        """Yield (windows, label numbers) in RAM, batch_size records at a time.
+
+        Shuffled batches are read in sorted order within the batch, which
+        keeps disk access mostly sequential on large datasets.
+        """
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        if shuffle:
+            indices = np.random.default_rng(seed).permutation(indices)
+        for start in range(0, len(indices), batch_size):
+            batch = np.sort(indices[start:start + batch_size])
+            yield np.asarray(self.windows[batch]), np.asarray(self.labels[batch])
+
+    def counts(self):
+        """{label: number of records}"""
+        numbers = np.bincount(self.labels, minlength=len(self.label_names)) if len(self) else []
+        return {name: int(n) for name, n in zip(self.label_names, numbers)}
+
+# ==========================================================
+# Dataset Tools
+# ==========================================================
+def copy_records(source, writer, indices, chunk=4096):
+    """Stream the given records of source into writer"""
+    names = np.array(source.label_names)
+    for start in range(0, len(indices), chunk):
+        batch = indices[start:start + chunk]
+        # Keep the requested order (e.g. shuffled); memmap reads it page by page
+        frames = source.frames[batch] if writer.frame_shape else None
+        writer.append_batch(source.windows[batch], names[source.labels[batch]], frames)
+
+
+def writer_like(source, path):
+    return DatasetWriter(path, source.sequence_length, source.features, source.frame_shape)
+
+
+def merge(sources, destination):
+    """Append every record of each source dataset to destination"""
+    datasets = [LandmarkDataset(path) for path in sources]
+    first = datasets[0]
+    # Check every source before writing anything, so a mismatch leaves destination untouched
+    for dataset in datasets[1:]:
+        if (dataset.sequence_length, dataset.features) != (first.sequence_length, first.features):
+            raise ValueError(f"{dataset.path} holds {dataset.sequence_length}x{dataset.features} "
+                             f"windows, not {first.sequence_length}x{first.features}")
+        if dataset.frame_shape != first.frame_shape:
+            raise ValueError(f"{dataset.path} frame shape differs from {first.path}")
+    with writer_like(first, destination) as writer:
+        if writer.frame_shape != first.frame_shape:
+            raise ValueError(f"{destination} frame shape differs from {first.path}")
+        for dataset in datasets:
+            copy_records(dataset, writer, np.arange(len(dataset)))
+
+
+def split(source, destinations, fractions, seed=0):
+    """Randomly partition source into one dataset per fraction"""
+    dataset = LandmarkDataset(source)
+    order = np.random.default_rng(seed).permutation(len(dataset))
+    bounds = np.round(np.cumsum([0] + list(fractions)) / sum(fractions) * len(dataset)).astype(int)
+    for destination, start, end in zip(destinations, bounds[:-1], bounds[1:]):
+        with writer_like(dataset, destination) as writer:
+            copy_records(dataset, writer, np.sort(order[start:end]))
+
+
+def shuffle(source, destination, seed=0):
+    """Copy source to destination in random record order"""
+    dataset = LandmarkDataset(source)
+    with writer_like(dataset, destination) as writer:
+        copy_records(dataset, writer, np.random.default_rng(seed).permutation(len(dataset)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    info_command = commands.add_parser("info")
+    info_command.add_argument("dataset")
+    merge_command = commands.add_parser("merge")
+    merge_command.add_argument("out")
+    merge_command.add_argument("sources", nargs="+")
+    split_command = commands.add_parser("split")
+    split_command.add_argument("source")
+    split_command.add_argument("--out", nargs="+", required=True)
+    split_command.add_argument("--fractions", type=float, nargs="+", required=True)
+    split_command.add_argument("--seed", type=int, default=0)
+    shuffle_command = commands.add_parser("shuffle")
+    shuffle_command.add_argument("source")
+    shuffle_command.add_argument("out")
+    shuffle_command.add_argument("--seed", type=int, default=0)
+    synthetic_command = commands.add_parser("synthetic")
+    synthetic_command.add_argument("out")
+    synthetic_command.add_argument("--count", type=int, default=10000)
+    synthetic_command.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "info":
+        dataset = LandmarkDataset(args.dataset)
+        size = sum(os.path.getsize(os.path.join(args.dataset, name))
+                   for name in (WINDOWS_FILE, LABELS_FILE, FRAMES_FILE)
+                   if os.path.exists(os.path.join(args.dataset, name)))
+        print(f"{len(dataset)} windows of {dataset.sequence_length}x{dataset.features}, "
+              f"frames {dataset.frame_shape or 'none'}, {size / 1e6:.1f} MB")
+        for label, count in dataset.counts().items():
+            print(f"  {label:<12}{count:>8}")
+    elif args.command == "merge":
+        merge(args.sources, args.out)
+    elif args.command == "split":
+        if len(args.out) != len(args.fractions):
+            parser.error("give one --fractions value per --out dataset")
+        split(args.source, args.out, args.fractions, args.seed)
+    elif args.command == "shuffle":
+        shuffle(args.source, args.out, args.seed)
+    elif args.command == "synthetic":
+        from synthetic_landmarks import synthetic_dataset
+        with DatasetWriter(args.out) as writer:
+            for start in range(0, args.count, 4096):
+                windows, labels = synthetic_dataset(min(4096, args.count - start), seed=args.seed + start)
+                writer.append_batch(windows, labels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Recognize signs from several cameras at once, one worker process each.
+
+Each source gets a capture thread in this process and a recognizer in its
+own worker process, so the MediaPipe work of different stations runs on
+different cores instead of sharing one interpreter lock. Frames go to the
+worker through a shared-memory slot (no pickling of pixels). Only the small
+task and result tuples travel over queues. Results come back tagged with
+their source.
+
+Live cameras are drained by a LatestFrameGrabber, like the single-camera
+loop: every frame is grabbed, but only the newest one is decoded, once the
+worker is free (newest frame wins; the rest count as dropped). File and
+synthetic sources are read frame by frame and either drop frames while the
+worker is busy or, with --wait, wait for it so every frame is processed.
+
+    python multi_source.py 0 1 2
+    python multi_source.py station1.mp4 station2.mp4 --wait
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# frame_sources lives with the app modules one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import LatestFrameGrabber, open_source
+from transcript_writer import TranscriptWriter
+
+MAX_FRAME_SHAPE = (720, 1280, 3)
+
+
+def sign_to_text_recognizer(model_path=None):
+    """Worker-side factory: a SignToText with its own MediaPipe Hands"""
+    from sign_to_text import SignToText, load_predictor
+    return SignToText(predict=load_predictor(model_path) if model_path else None)
+
+# ==========================================================
+# Worker Process
+# ==========================================================
+def worker_main(source_id, memory_name, tasks, free, results, factory, factory_args):
+    """Process frames from one shared-memory slot until a None task arrives"""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    pixels = np.ndarray((memory.size,), dtype=np.uint8, buffer=memory.buf)
+    recognizer = None
+    try:
+        recognizer = factory(*factory_args)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            frame_id, shape, captured = task
+            # Copy out so the capture thread can fill the slot while we work
+            frame = pixels[:int(np.prod(shape))].reshape(shape).copy()
+            free.set()
+            start = time.perf_counter()
+            prediction, confidence, word = recognizer.process(frame)[:3]
+            results.put((source_id, frame_id, captured, prediction, confidence, word,
+                         time.perf_counter() - start))
+    except Exception as e:
+        print(f"Worker {source_id} error: {e}")
+    finally:
+        if recognizer is not None:
+            recognizer.close()
+        del pixels
+        memory.close()
+        results.put((source_id, None, None, None, None, None, None))
+
+# ==========================================================
+# Coordinator
+# ==========================================================
+class MultiSourceRecognizer:
+    """Run one recognizer process per frame source and merge their results"""
+
+    def __init__(self, sources, factory=sign_to_text_recognizer, factory_args=(),
+                 wait_for_worker=False, mirror=True, max_frame_shape=MAX_FRAME_SHAPE):
+        self.sources = list(sources)
+        self.factory = factory
+        self.factory_args = factory_args
+        self.wait_for_worker = wait_for_worker
+        self.mirror = mirror
+        self.max_frame_shape = max_frame_shape
+        # spawn: MediaPipe and Qt do not survive fork() with their threads
+        self.context = multiprocessing.get_context("spawn")
+        self.results = self.context.Queue()
+        self.slots = []
+        self.workers = []
+        self.capture_threads = []
+        self.running = False
+        self.stats = [{"captured": 0, "dropped": 0, "processed": 0} for _ in self.sources]
+
+    def start(self):
+        self.running = True
+        for source_id in range(len(self.sources)):
+            memory = shared_memory.SharedMemory(create=True, size=int(np.prod(self.max_frame_shape)))
+            slot = {"memory": memory, "tasks": self.context.Queue(), "free": self.context.Event()}
+            slot["free"].set()
+            self.slots.append(slot)
+            worker = self.context.Process(
+                target=worker_main,
+                args=(source_id, memory.name, slot["tasks"], slot["free"], self.results,
+                      self.factory, self.factory_args),
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+        for source_id in range(len(self.sources)):
+            thread = threading.Thread(target=self._capture_loop, args=(source_id,), daemon=True)
+            thread.start()
+            self.capture_threads.append(thread)
+
+    def _capture_loop(self, source_id):
+        """Read one source and hand frames to its worker through the slot"""
+        source = self.sources[source_id]
+        slot = self.slots[source_id]
+        pixels = np.ndarray((slot["memory"].size,), dtype=np.uint8, buffer=slot["memory"].buf)
+        stats = self.stats[source_id]
+        grabber = None
+        if getattr(source, "live", False):
+            # Decode only the frame the worker will get; it releases the camera on exit
+            grabber = LatestFrameGrabber(source, release_source=True)
+            grabber.start()
+        frame_id = 0
+        while self.running:
+            if grabber:
+                if not slot["free"].wait(0.5):
+                    continue
+                frame, captured = grabber.latest(timeout=0.5)
+                stats["captured"], stats["dropped"] = grabber.grabbed, grabber.skipped
+                if frame is None:
+                    if grabber.ended:
+                        break
+                    continue
+            else:
+                if not source.isOpened():
+                    break
+                ret, frame = source.read()
+                if not ret:
+                    break
+                captured = time.perf_counter()
+                stats["captured"] += 1
+                if self.wait_for_worker:
+                    while self.running and not slot["free"].wait(0.5):
+                        pass
+                    if not self.running:
+                        break
+                elif not slot["free"].is_set():
+                    stats["dropped"] += 1
+                    continue
+            if self.mirror:
+                frame = cv2.flip(frame, 1)
+            if frame.size > len(pixels):
+                print(f"Source {source_id}: frame {frame.shape} larger than {self.max_frame_shape}")
+                break
+            slot["free"].clear()
+            pixels[:frame.size] = frame.reshape(-1)
+            slot["tasks"].put((frame_id, frame.shape, captured))
+            frame_id += 1
+        if grabber:
+            grabber.stop(timeout=None)
+        else:
+            source.release()
+        slot["tasks"].put(None)
+        del pixels
+
+    def __iter__(self):
+        """Yield result dicts until every source is exhausted (or stop())"""
+        finished = 0
+        while finished < len(self.workers):
+            try:
+                item = self.results.get(timeout=1.0)
+            except queue.Empty:
+                # A worker killed outright never sends its end marker
+                if not any(worker.is_alive() for worker in self.workers):
+                    break
+                continue
+            source_id, frame_id, captured, prediction, confidence, word, latency = item
+            if frame_id is None:
+                finished += 1
+                continue
+            self.stats[source_id]["processed"] += 1
+            yield {
+                "source": source_id,
+                "frame": frame_id,
+                "prediction": prediction,
+                "confidence": confidence,
+                "word": word,
+                "latency": latency,
+                "age": time.perf_counter() - captured,
+            }
+
+    def stop(self):
+        """Stop capturing; workers exit once their queued frame is done"""
+        self.running = False
+        for thread in self.capture_threads:
+            thread.join(timeout=2.0)
+
+    def close(self):
+        self.stop()
+        # Drain unread results: a worker cannot exit while its puts are unflushed
+        deadline = time.perf_counter() + 5.0
+        while any(worker.is_alive() for worker in self.workers) and time.perf_counter() < deadline:
+            try:
+                self.results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for worker in self.workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+        for slot in self.slots:
+            slot["memory"].close()
+            slot["memory"].unlink()
+        self.slots = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="+", help="camera index, video file or image directory per station")
+    parser.add_argument("--model", help="landmark_model.npz to use in every worker")
+    parser.add_argument("--wait", action="store_true", help="process every frame instead of dropping")
+    args = parser.parse_args()
+
+    sources = [open_source(spec) for spec in args.sources]
+    recognizer = MultiSourceRecognizer(sources, factory_args=(args.model,), wait_for_worker=args.wait)
+    transcripts = [TranscriptWriter(f"transcript_station{i}.txt",
+                                    header=f"---- STATION {i} SIGN LANGUAGE TRANSCRIPT ----\n")
+                   for i in range(len(sources))]
+    recognizer.start()
+    print(f"[INFO] Recognizing {len(sources)} sources. Ctrl+C to stop.")
+    try:
+        for result in recognizer:
+            if result["word"]:
+                print(f"[station {result['source']}] {result['word']}")
+                transcripts[result["source"]].write(result["word"] + " ")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recognizer.close()
+        for transcript in transcripts:
+            transcript.close()
+    for source_id, stats in enumerate(recognizer.stats):
+        print(f"[INFO] station {source_id}: {stats['captured']} frames, "
+              f"{stats['processed']} processed, {stats['dropped']} dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,38 @@
+import argparse
 import cv2
+import itertools
 import mediapipe as mp
 import numpy as np
-from collections import deque
 import os
+import sys
+from contextlib import contextmanager
+
+# frame_sources lives with the app modules one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import CameraSource, LatestFrameGrabber
+from transcript_writer import TranscriptWriter
+from landmark_buffer import LandmarkWindow
+from landmark_classifier import LandmarkClassifier
+from dtw_matcher import DTWMatcher
+from landmark_dataset import DatasetWriter
 
 # === SETTINGS ===
 OUTPUT_FILE = "transcript.txt"
+# Trained with: python landmark_classifier.py train --data ... --out landmark_model.npz
+# or a template library: python dtw_matcher.py build --data ... --out landmark_model.npz
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "landmark_model.npz")
 SEQUENCE_LENGTH = 20
 CONFIDENCE_THRESHOLD = 0.8
 REPEAT_THRESHOLD = 3
+CAPTURE_FRAME_SIZE = (64, 48)  # Thumbnail stored with each captured window
 
 # Define basic words for demo
 BASIC_WORDS = ["HELLO", "YES", "NO", "THANK YOU", "STOP", "GOOD", "OK", "COME"]
 
-# Initialize MediaPipe Hands
+# MediaPipe drawing helpers
 mp_hands = mp.solutions.hands
 mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
 
 # --- Fake demo model ---
 def fake_model_predict(sequence):
@@ -49,72 +60,377 @@ def fake_model_predict(sequence):
     else:
         return "COME", 0.85
 
-# Create / clear transcript file
-with open(OUTPUT_FILE, "w") as f:
-    f.write("---- SIGN LANGUAGE TRANSCRIPT ----\n")
+def load_predictor(path=MODEL_FILE):
+    """predict of the classifier or DTW template library in path, else the demo heuristics"""
+    if os.path.exists(path):
+        with np.load(path) as archive:
+            is_templates = "templates" in archive
+        if is_templates:
+            print(f"[INFO] Loading sign templates from {path}")
+            return DTWMatcher.load(path).predict
+        print(f"[INFO] Loading sign classifier from {path}")
+        return LandmarkClassifier.load(path).predict
+    print(f"[INFO] No model at {path}; using demo heuristics")
+    return fake_model_predict
 
-# === REALTIME CAPTURE ===
-cap = cv2.VideoCapture(0)
-sequence = deque(maxlen=SEQUENCE_LENGTH)
-sentence = ""
-last_prediction = ""
-repeat_count = 0
-
-print("[INFO] Starting webcam. Press 'q' to quit.")
-
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    image = cv2.flip(frame, 1)
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    results = hands.process(image_rgb)
-
-    hand_landmarks = []
-    if results.multi_hand_landmarks:
-        for handLms in results.multi_hand_landmarks:
-            for lm in handLms.landmark:
-                hand_landmarks.extend([lm.x, lm.y, lm.z])
-            mp_drawing.draw_landmarks(image, handLms, mp_hands.HAND_CONNECTIONS)
-
-        if len(hand_landmarks) < 63:
-            hand_landmarks += [0] * (63 - len(hand_landmarks))
+def new_hands():
+    """MediaPipe Hands tracking one hand across video frames"""
+    return mp_hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+class RepeatFilter:
+    """Accept a prediction as a word once it repeats on `repeats` more frames above the threshold"""
+
+    def __init__(self, threshold=CONFIDENCE_THRESHOLD, repeats=REPEAT_THRESHOLD):
+        self.threshold = threshold
+        self.repeats = repeats
+        self.last_prediction = ""
+        self.repeat_count = 0
+
+    def reset(self):
+        self.last_prediction = ""
+        self.repeat_count = 0
+
+    def update(self, prediction, confidence):
+        """The newly accepted word, or ''"""
+        if confidence <= self.threshold:
+            self.reset()
+            return ""
+        if prediction == self.last_prediction:
+            self.repeat_count += 1
         else:
-            hand_landmarks = hand_landmarks[:63]
+            self.repeat_count = 0
+        self.last_prediction = prediction
+        return prediction if self.repeat_count == self.repeats else ""
 
-        sequence.append(hand_landmarks)
+# === RECOGNIZER ===
+class SignToText:
+    """MediaPipe landmarks -> 20-frame sequence -> word, one frame at a time"""
 
-        if len(sequence) == SEQUENCE_LENGTH:
-            pred_class, conf = fake_model_predict(sequence)
+    def __init__(self, predict=None):
+        self.predict = predict or load_predictor()
+        # Each recognizer tracks its own hand between frames
+        self.hands = new_hands()
+        # Last SEQUENCE_LENGTH frames of landmarks, preallocated float32
+        self.sequence = LandmarkWindow(SEQUENCE_LENGTH)
+        self.sentence = ""
+        self.repeats = RepeatFilter()
 
-            if conf > CONFIDENCE_THRESHOLD:
-                if pred_class == last_prediction:
-                    repeat_count += 1
-                else:
-                    repeat_count = 0
-                last_prediction = pred_class
+    def extract_landmarks(self, image, roi=None):
+        """Run MediaPipe on a BGR image and write the first hand into the window.
+
+        roi = (x0, y0, x1, y1) runs MediaPipe on that region only; the
+        landmarks are mapped back to whole-image coordinates before they are
+        stored. Returns (found, MediaPipe results).
+        """
+        full_h, full_w = image.shape[:2]
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            image = image[y0:y1, x0:x1]
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        results = self.hands.process(image_rgb)
+        if not results.multi_hand_landmarks:
+            return False, results
+        landmarks = results.multi_hand_landmarks[0].landmark
+        if roi is None:
+            self.sequence.push_landmarks(landmarks)
+            return True, results
+
+        # Normalized to the crop -> normalized to the whole image (z scales like x)
+        points = np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float32)
+        points *= ((x1 - x0) / full_w, (y1 - y0) / full_h, (x1 - x0) / full_w)
+        points[:, 0] += x0 / full_w
+        points[:, 1] += y0 / full_h
+        self.sequence.push(points.ravel())
+        return True, results
+
+    def process(self, image, roi=None):
+        """Returns (prediction, confidence, word, results); word is '' unless a new word was added"""
+        found, results = self.extract_landmarks(image, roi)
+        return self.update(found) + (results,)
+
+    def hold(self):
+        """Repeat the last landmarks as this frame's (the hand has not moved)"""
+        if not self.sequence.count:
+            return self.update(False)
+        self.sequence.push(self.sequence.window()[-1].copy())
+        return self.update(True)
+
+    def update(self, found):
+        """Predict from the window after a frame was added; (prediction, confidence, word)"""
+        if not found:
+            self.repeats.reset()
+            return "", 0.0, ""
+
+        if not self.sequence.full:
+            return "", 0.0, ""
 
-                if repeat_count == REPEAT_THRESHOLD:
-                    sentence += pred_class + " "
-                    with open(OUTPUT_FILE, "a") as f:
-                        f.write(pred_class + " ")
+        pred_class, conf = self.predict(self.sequence.window())
+        word = self.repeats.update(pred_class, conf)
+        if word:
+            self.sentence += word + " "
+        return pred_class, conf, word
 
-                cv2.putText(image, f"{pred_class}", (30, 100),
-                            cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3)
+    def close(self):
+        self.hands.close()
+
+
+# === STREAMING PIPELINE ===
+# frames -> landmarks -> windows -> predictions -> words as lazy generators,
+# each pulling from the one before: nothing is read or computed until the
+# consumer asks, so a slow consumer slows the chain instead of queueing
+# frames (live cameras skip to their newest frame instead). Every stage
+# yields one item per frame starting with the frame index, so stages can be
+# zipped and split with itertools.tee. A window is a view into the ring
+# buffer that is valid until the next item is pulled - copy it to keep it.
+# The camera and MediaPipe belong to the with-blocks below, not to the
+# generators, and are released when the block exits. Fingerspelling swaps
+# the last two stages for windows -> letter_probabilities -> spelled_words.
+#
+#     with sign_stream() as stream:
+#         for index, label, confidence, word in stream:
+#             ...
+
+@contextmanager
+def opened_source(source=None):
+    """A frame source (the webcam by default), released when the block exits"""
+    cap = source or CameraSource(0)
+    try:
+        yield cap
+    finally:
+        cap.release()
+
+@contextmanager
+def hand_tracker():
+    """MediaPipe Hands for one stream, closed when the block exits"""
+    hands = new_hands()
+    try:
+        yield hands
+    finally:
+        hands.close()
+
+def frames(cap, mirror=True):
+    """(index, BGR image); live sources hand out their newest frame each time"""
+    grabber = None
+    if getattr(cap, "live", False):
+        grabber = LatestFrameGrabber(cap)
+        grabber.start()
+    try:
+        for index in itertools.count():
+            if grabber:
+                frame, _ = grabber.latest(timeout=1.0)
+                if frame is None:
+                    if grabber.ended:
+                        return
+                    continue
             else:
-                last_prediction = ""
-                repeat_count = 0
+                ret, frame = cap.read()
+                if not ret:
+                    return
+            yield index, cv2.flip(frame, 1) if mirror else frame
+    finally:
+        if grabber:
+            # opened_source() releases cap next: wait until no grab() is running
+            grabber.stop(timeout=None)
+
+def landmarks(frame_items, hands):
+    """(index, image, MediaPipe hand landmarks or None) using an open hand_tracker()"""
+    for index, image in frame_items:
+        results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+        yield index, image, hand
+
+def windows(landmark_items, length=SEQUENCE_LENGTH):
+    """(index, window) - a (length, 63) view of the latest landmarks, or None
+    when there is no hand or the window is still filling"""
+    sequence = LandmarkWindow(length)
+    for index, _, hand in landmark_items:
+        if hand is None:
+            yield index, None
+            continue
+        sequence.push_landmarks(hand.landmark)
+        yield index, sequence.window() if sequence.full else None
+
+def predictions(window_items, predict=None):
+    """(index, label, confidence); ('', 0.0) for frames without a window"""
+    predict = predict or load_predictor()
+    for index, window in window_items:
+        if window is None:
+            yield index, "", 0.0
+        else:
+            label, confidence = predict(window)
+            yield index, label, confidence
+
+def batched_predictions(window_items, classifier, batch_size=64):
+    """predictions() through LandmarkClassifier.predict_batch, batch_size windows at a time.
+
+    Windows are copied once, into a preallocated batch. Results come out in
+    frame order when a batch fills, so this is for recorded input.
+    """
+    batch = np.empty((batch_size, classifier.sequence_length, classifier.features), dtype=np.float32)
+    pending = []  # (index, row in batch or None)
+    filled = 0
+    for index, window in window_items:
+        if window is None:
+            pending.append((index, None))
+        else:
+            batch[filled] = window
+            pending.append((index, filled))
+            filled += 1
+        if filled == batch_size:
+            yield from _batch_results(pending, classifier.predict_batch(batch))
+            pending, filled = [], 0
+    if pending:
+        yield from _batch_results(pending, classifier.predict_batch(batch[:filled]) if filled else [])
+
+def _batch_results(pending, results):
+    for index, row in pending:
+        yield (index, "", 0.0) if row is None else (index,) + tuple(results[row])
+
+def words(prediction_items, threshold=CONFIDENCE_THRESHOLD, repeats=REPEAT_THRESHOLD):
+    """(index, label, confidence, word); word is '' unless a new word was accepted"""
+    accept = RepeatFilter(threshold, repeats)
+    for index, label, confidence in prediction_items:
+        yield index, label, confidence, accept.update(label, confidence)
+
+def letter_probabilities(window_items, classifier):
+    """(index, {letter: probability}) from a LandmarkClassifier trained on fingerspelled
+    letters (labels 'A'-'Z', and '_' for transitions); None for frames without a window"""
+    for index, window in window_items:
+        if window is None:
+            yield index, None
+        else:
+            probabilities = classifier.predict_proba(np.asarray(window)[None], out=classifier.scratch)
+            yield index, dict(zip(classifier.labels, probabilities[0].tolist()))
+
+def spelled_words(letter_items, decoder):
+    """(index, partial, guess, word) through a fingerspelling.FingerspellingDecoder: the
+    letters so far, their likeliest lexicon word, and a committed word or ''"""
+    for index, probabilities in letter_items:
+        yield (index,) + decoder.step(probabilities)
+
+@contextmanager
+def sign_stream(source=None, predict=None, mirror=True):
+    """The whole pipeline over one source, yielding (index, label, confidence, word) per frame"""
+    with opened_source(source) as cap, hand_tracker() as hands:
+        frame_items = frames(cap, mirror)
+        try:
+            yield words(predictions(windows(landmarks(frame_items, hands)), predict))
+        finally:
+            frame_items.close()
+
+
+# === REALTIME CAPTURE ===
+def main(source=None):
+    # New transcript per session; the previous one goes to transcript_archive/
+    transcript = TranscriptWriter(OUTPUT_FILE, header="---- SIGN LANGUAGE TRANSCRIPT ----\n")
+
+    print("[INFO] Starting webcam. Press 'q' to quit.")
+
+    with opened_source(source) as cap, hand_tracker() as hands:
+        frame_items = frames(cap)
+        # One copy of the landmark stream is drawn, the other recognised;
+        # zip keeps them in step, so tee never holds more than one frame
+        shown, analysed = itertools.tee(landmarks(frame_items, hands))
+        recognised = words(predictions(windows(analysed)))
+
+        try:
+            for (_, image, hand), (_, pred_class, conf, word) in zip(shown, recognised):
+                if word:
+                    transcript.write(word + " ")
+
+                if hand is not None:
+                    mp_drawing.draw_landmarks(image, hand, mp_hands.HAND_CONNECTIONS)
+                    if conf > CONFIDENCE_THRESHOLD:
+                        cv2.putText(image, f"{pred_class}", (30, 100),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3)
+                else:
+                    cv2.putText(image, "No hand detected", (30, 100),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+                cv2.imshow("Sign to Text - Live", image)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            # Stop the grabber before opened_source() releases the camera
+            frame_items.close()
+
+    transcript.close()
+    cv2.destroyAllWindows()
+    print(f"[INFO] Session ended. Transcript saved to {os.path.abspath(OUTPUT_FILE)}")
+
+
+# === DATASET CAPTURE ===
+def capture(dataset_path, label, source=None, stride=5, save_frames=False):
+    """Record labelled landmark windows into a landmark_dataset directory.
+
+    SPACE starts/stops recording, 'q' quits. While recording, the current
+    window is stored every `stride` frames with a hand in view.
+    """
+    width, height = CAPTURE_FRAME_SIZE
+    writer = DatasetWriter(dataset_path, SEQUENCE_LENGTH,
+                           frame_shape=(height, width, 3) if save_frames else None)
+    cap = source or CameraSource(0)
+    recognizer = SignToText(predict=fake_model_predict)
+    recording = False
+    since_last = 0
+    saved = 0
+
+    print(f"[INFO] Capturing '{label}' into {dataset_path}. SPACE: record on/off, 'q': quit.")
+
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        image = cv2.flip(frame, 1)
+        found, results = recognizer.extract_landmarks(image)
+        since_last += 1
+        if recording and found and recognizer.sequence.full and since_last >= stride:
+            # An existing dataset decides whether thumbnails are stored
+            thumbnail = None
+            if writer.frame_shape:
+                thumbnail = cv2.resize(image, CAPTURE_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+            writer.append(recognizer.sequence.window(), label, thumbnail)
+            saved += 1
+            since_last = 0
+            if saved % 100 == 0:
+                writer.flush()
+
+        if found:
+            mp_drawing.draw_landmarks(image, results.multi_hand_landmarks[0], mp_hands.HAND_CONNECTIONS)
+        status = f"REC {label}: {saved}" if recording else f"PAUSED {label}: {saved}"
+        cv2.putText(image, status, (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1,
+                    (0, 0, 255) if recording else (200, 200, 200), 2)
+
+        cv2.imshow("Sign to Text - Capture", image)
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord(' '):
+            recording = not recording
+        elif key == ord('q'):
+            break
+
+    cap.release()
+    recognizer.close()
+    writer.close()
+    cv2.destroyAllWindows()
+    print(f"[INFO] Saved {saved} '{label}' windows; {dataset_path} now holds {writer.index['count']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live sign-to-text, or capture training data")
+    parser.add_argument("--capture", metavar="DATASET", help="record labelled windows into this dataset")
+    parser.add_argument("--label", help="sign being recorded (with --capture)")
+    parser.add_argument("--stride", type=int, default=5, help="frames between captured windows")
+    parser.add_argument("--frames", action="store_true", help="also store a thumbnail per window")
+    args = parser.parse_args()
+    if args.capture:
+        if not args.label:
+            parser.error("--capture needs --label")
+        capture(args.capture, args.label, stride=args.stride, save_frames=args.frames)
     else:
-        cv2.putText(image, "No hand detected", (30, 100),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-        last_prediction = ""
-        repeat_count = 0
-
-    cv2.imshow("Sign to Text - Live", image)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
-
-cap.release()
-cv2.destroyAllWindows()
-print(f"[INFO] Session ended. Transcript saved to {os.path.abspath(OUTPUT_FILE)}")
+        main()
@@ -0,0 +1,97 @@
+import numpy as np
+
+# ==========================================================
+# Synthetic MediaPipe Hand Landmark Sequences
+# ==========================================================
+# Procedural hands for training smoke tests and benchmarks when no recorded
+# dataset is at hand. Landmarks follow MediaPipe's 21-point layout
+# (0 wrist, 1-4 thumb, 5-8 index, 9-12 middle, 13-16 ring, 17-20 pinky) in
+# normalized image coordinates, flattened to 63 values per frame.
+
+# Extended fingers (thumb, index, middle, ring, pinky) and movement per sign
+SIGNS = {
+    "HELLO": ((1, 1, 1, 1, 1), "wave"),
+    "YES": ((0, 0, 0, 0, 0), "nod"),
+    "NO": ((0, 1, 1, 0, 0), "shake"),
+    "THANK YOU": ((1, 1, 1, 1, 1), "forward"),
+    "STOP": ((1, 1, 1, 1, 1), None),
+    "GOOD": ((1, 0, 0, 0, 0), None),
+    "OK": ((0, 0, 1, 1, 1), None),
+    "COME": ((0, 1, 0, 0, 0), "beckon"),
+}
+
+# Knuckle direction (degrees from straight up), knuckle distance from the
+# wrist and bone lengths, in units of the wrist to middle knuckle distance
+FINGER_ANGLES = (-55, -18, 0, 16, 32)
+KNUCKLE_DISTANCE = (0.45, 1.0, 1.0, 0.95, 0.85)
+BONE_LENGTHS = ((0.35, 0.3, 0.25), (0.4, 0.25, 0.2), (0.45, 0.28, 0.22),
+                (0.42, 0.26, 0.2), (0.32, 0.2, 0.18))
+
+
+def hand_pose(extended, curl=None):
+    """(21, 3) landmarks of an upright hand with unit palm length at the origin.
+
+    curl optionally maps finger index -> curl amount (0 straight, 1 fist).
+    """
+    points = np.zeros((21, 3))
+    towards_camera = np.array([0.0, 0.0, -1.0])
+    for finger, angle in enumerate(FINGER_ANGLES):
+        amount = 0.0 if extended[finger] else 1.0
+        if curl is not None and finger in curl:
+            amount = curl[finger]
+        direction = np.array([np.sin(np.deg2rad(angle)), -np.cos(np.deg2rad(angle)), 0.0])
+        joint = KNUCKLE_DISTANCE[finger] * direction
+        points[1 + 4 * finger] = joint
+        for bone, length in enumerate(BONE_LENGTHS[finger]):
+            # Each bone of a curled finger folds a further 75 degrees over the palm
+            fold = amount * np.deg2rad(75) * (bone + 1)
+            joint = joint + length * (np.cos(fold) * direction + np.sin(fold) * towards_camera)
+            points[2 + 4 * finger + bone] = joint
+    return points
+
+
+def sign_sequence(word, length=20, rng=None):
+    """(length, 63) float32 landmark window of one randomly varied sign"""
+    rng = rng if rng is not None else np.random.default_rng()
+    extended, movement = SIGNS[word]
+    size = rng.uniform(0.08, 0.16)
+    rotation = np.deg2rad(rng.uniform(-20, 20))
+    center = rng.uniform(0.3, 0.7, size=2)
+    phase = rng.uniform(0, 2 * np.pi)
+    speed = rng.uniform(0.7, 1.3)
+    cos, sin = np.cos(rotation), np.sin(rotation)
+    rotate = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+
+    frames = np.empty((length, 21, 3))
+    for t in range(length):
+        wave = np.sin(phase + speed * 2 * np.pi * t / length * 2)
+        curl = {1: 0.5 + 0.5 * wave} if movement == "beckon" else None
+        points = hand_pose(extended, curl)
+        offset = np.zeros(3)
+        turn = rotate
+        if movement == "wave":
+            angle = np.deg2rad(20) * wave
+            turn = rotate @ np.array([[np.cos(angle), -np.sin(angle), 0],
+                                      [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+        elif movement == "nod":
+            offset[1] = 0.4 * wave
+        elif movement == "shake":
+            offset[0] = 0.4 * wave
+        elif movement == "forward":
+            offset[1] = 0.6 * t / length
+            offset[2] = -0.5 * t / length
+        points = points @ turn.T + offset
+        frames[t] = points * size
+        frames[t, :, :2] += center
+    frames += rng.normal(0, 0.003, size=frames.shape)
+    return frames.reshape(length, 63).astype(np.float32)
+
+
+def synthetic_dataset(count, length=20, seed=0, words=None):
+    """(windows (count, length, 63), labels (count,)) with balanced classes"""
+    rng = np.random.default_rng(seed)
+    words = list(words or SIGNS)
+    labels = np.array([words[i % len(words)] for i in range(count)])
+    rng.shuffle(labels)
+    windows = np.stack([sign_sequence(word, length, rng) for word in labels])
+    return windows, labels
@@ -5,11 +5,14 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 import json, random, requests, time
-import win32com.client
 import urllib3
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import threading
+from lecture_recorder import LectureAudioRecorder, archive_prefix
+from tts_engine import TextToSpeechEngine
+from tts_scheduler import PRIORITY_CHAT
+from tts_cache import TTSAudioCache, AudioPlayer
+from gesture_words import KNOWN_PHRASES, split_into_phrases
 
 FIREBASE_URL = "https://hacks-f28bb-default-rtdb.firebaseio.com"
 
@@ -21,54 +24,6 @@ model = Model(model_path)
 recognizer = KaldiRecognizer(model, 16000)
 audio_queue = queue.Queue()
 
-# ==========================================================
-# High-Performance Text-to-Speech Engine using win32com
-# ==========================================================
-class TextToSpeechEngine:
-    def __init__(self):
-        self.speaker = win32com.client.Dispatch("SAPI.SpVoice")
-        self.word_queue = queue.Queue()
-        self.is_speaking = False
-        self.running = True
-        self.processing_thread = None
-        self.start_processing()
-        
-    def start_processing(self):
-        """Start the background processing thread"""
-        self.processing_thread = threading.Thread(target=self._process_queue, daemon=True)
-        self.processing_thread.start()
-        
-    def _process_queue(self):
-        """Process the word queue in background thread"""
-        while self.running:
-            try:
-                if not self.word_queue.empty() and not self.is_speaking:
-                    word = self.word_queue.get_nowait()
-                    self.is_speaking = True
-                    try:
-                        # Speak the word using win32com - this is non-blocking!
-                        self.speaker.Speak(word, 1)  # 1 = async speak
-                        # Wait a bit for the speech to complete
-                        time.sleep(0.5 + len(word) * 0.1)  # Dynamic delay based on word length
-                    except Exception as e:
-                        print(f"TTS Error: {e}")
-                    finally:
-                        self.is_speaking = False
-                time.sleep(0.05)  # Small delay to prevent CPU overload
-            except:
-                time.sleep(0.1)
-        
-    def speak(self, word):
-        """Add word to queue for speaking - NON-BLOCKING"""
-        if word.strip() and len(word.strip()) > 1:
-            self.word_queue.put(word.strip())
-            
-    def stop(self):
-        """Stop the TTS engine"""
-        self.running = False
-        if self.processing_thread:
-            self.processing_thread.join(timeout=1.0)
-
 # ==========================================================
 # Optimized Firebase Student Transcript Listener
 # ==========================================================
@@ -121,6 +76,10 @@ class StudentTranscriptListener(QThread):
         self.running = False
 
 class TeacherPage(QWidget):
+    # Emitted from the TTS worker thread, delivered on the GUI thread
+    tts_started = pyqtSignal(str)
+    tts_finished = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.listening = False
@@ -129,10 +88,20 @@ class TeacherPage(QWidget):
         self.current_transcript = ""
         self.session_id = None
         self.student_listener = None
-        self.tts_engine = TextToSpeechEngine()
+        self.tts_started.connect(self._show_current_word)
+        self.tts_finished.connect(self._word_finished)
+        self.tts_engine = TextToSpeechEngine(
+            on_start=self.tts_started.emit,
+            on_finish=self.tts_finished.emit,
+            cache=TTSAudioCache(),
+            player=AudioPlayer() if AudioPlayer.available() else None,
+            vocabulary=KNOWN_PHRASES
+        )
         self.tts_enabled = True
         self.last_full_transcript = ""
         self.currently_speaking_word = ""
+        self.archive_enabled = False
+        self.recorder = None
         
         # Create session with retry capability
         self.session = requests.Session()
@@ -192,6 +161,14 @@ class TeacherPage(QWidget):
         self.tts_button.clicked.connect(self.toggle_tts)
         tts_control_layout.addWidget(self.tts_button)
         
+        self.archive_button = QPushButton("⏺ Archive: OFF")
+        self.archive_button.setFont(QFont("Segoe UI", 12))
+        self.archive_button.setStyleSheet(
+            "background-color: #95a5a6; color: white; padding: 6px 12px; border-radius: 6px;"
+        )
+        self.archive_button.clicked.connect(self.toggle_archive)
+        tts_control_layout.addWidget(self.archive_button)
+        
         tts_control_layout.addStretch()
         
         self.session_button = QPushButton("Start Listening")
@@ -246,6 +223,13 @@ class TeacherPage(QWidget):
         self.current_word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.current_word_label)
 
+        # TTS queue health - how far speech is behind the student
+        self.tts_queue_label = QLabel("Queue: empty")
+        self.tts_queue_label.setFont(QFont("Segoe UI", 10))
+        self.tts_queue_label.setStyleSheet("color: #7f8c8d; padding: 2px;")
+        self.tts_queue_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.tts_queue_label)
+
         # Teacher speech section
         teacher_section_label = QLabel("🎤 Your Speech (Optional)")
         teacher_section_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
@@ -266,6 +250,9 @@ class TeacherPage(QWidget):
         self.timer = QTimer()
         self.timer.timeout.connect(self.process_audio)
         self.timer.start(30)
+        self.queue_timer = QTimer()
+        self.queue_timer.timeout.connect(self.update_queue_metrics)
+        self.queue_timer.start(500)
 
     def toggle_tts(self):
         """Toggle text-to-speech on/off"""
@@ -281,6 +268,36 @@ class TeacherPage(QWidget):
             self.tts_status_label.setText("🔇 TTS: Disabled")
             self.tts_status_label.setStyleSheet("color: #e74c3c; padding: 6px; background-color: #fadbd8; border-radius: 5px;")
 
+    def toggle_archive(self):
+        """Toggle compressed lecture audio archiving on/off"""
+        if not self.archive_enabled and not LectureAudioRecorder.available():
+            QMessageBox.warning(self, "Archive", "Audio archiving needs the 'soundfile' package.")
+            return
+        self.archive_enabled = not self.archive_enabled
+        if self.archive_enabled:
+            self.archive_button.setText("⏺ Archive: ON")
+            self.archive_button.setStyleSheet("background-color: #c0392b; color: white; padding: 6px 12px; border-radius: 6px;")
+            if self.listening:
+                self.start_recorder()
+        else:
+            self.archive_button.setText("⏺ Archive: OFF")
+            self.archive_button.setStyleSheet("background-color: #95a5a6; color: white; padding: 6px 12px; border-radius: 6px;")
+            self.stop_recorder()
+
+    def start_recorder(self):
+        """Start archiving lecture audio alongside recognition"""
+        self.recorder = LectureAudioRecorder(archive_prefix(self.session_code))
+        if not self.recorder.start():
+            self.recorder = None
+
+    def stop_recorder(self):
+        """Finalize the lecture audio archive"""
+        if self.recorder:
+            self.recorder.close()
+            if self.recorder.dropped_frames:
+                print(f"Lecture archive: {self.recorder.dropped_frames} frames dropped")
+            self.recorder = None
+
     def get_new_words(self, current_transcript):
         """Get only the new words that haven't been spoken yet"""
         if not self.last_full_transcript:
@@ -310,23 +327,47 @@ class TeacherPage(QWidget):
         ]):
             return
         
+        # Chat messages replace the sentence upload - speak them first, whole
+        if transcript.startswith("[CHAT]:"):
+            self.tts_engine.speak(transcript[len("[CHAT]:"):], PRIORITY_CHAT)
+            return
+        
         # Get new words
         new_words = self.get_new_words(transcript)
         self.last_full_transcript = transcript
         
-        # Speak each new word immediately using the non-blocking TTS engine
-        for word in new_words:
-            if len(word) > 1:  # Only speak meaningful words
-                self.currently_speaking_word = word
-                self.current_word_label.setText(f"🔊 Speaking: {word}")
-                self.tts_status_label.setText(f"Speaking: {word}")
-                self.tts_status_label.setStyleSheet("color: #f39c12; padding: 6px; background-color: #fdebd0; border-radius: 5px;")
-                
-                # Add word to TTS queue (NON-BLOCKING)
-                self.tts_engine.speak(word)
-                
-                # Update status after the word is spoken
-                QTimer.singleShot(1000, self._clear_current_word)
+        # Queue whole gesture phrases; the engine coalesces them into utterances
+        for phrase in split_into_phrases(new_words):
+            if len(phrase) > 1:  # Only speak meaningful words
+                self.tts_engine.speak(phrase)
+
+    def _show_current_word(self, word):
+        """Show the word the TTS engine has just started speaking"""
+        self.currently_speaking_word = word
+        self.current_word_label.setText(f"🔊 Speaking: {word}")
+        self.tts_status_label.setText(f"Speaking: {word}")
+        self.tts_status_label.setStyleSheet("color: #f39c12; padding: 6px; background-color: #fdebd0; border-radius: 5px;")
+
+    def _word_finished(self, word):
+        """Clear the display once the queue has been spoken out"""
+        if self.tts_engine.pending() == 0 and not self.tts_engine.is_speaking:
+            self._clear_current_word()
+
+    def update_queue_metrics(self):
+        """Show how much speech is waiting and how old it is"""
+        m = self.tts_engine.queue_metrics()
+        if m["items"]:
+            text = (f"Queue: {m['items']} waiting · {m['queued_seconds']:.1f}s audio · "
+                    f"oldest {m['oldest_age']:.1f}s")
+        else:
+            text = "Queue: empty"
+        text += f" · last delay {m['last_latency']:.1f}s"
+        dropped = m["dropped_stale"] + m["dropped_overflow"]
+        if dropped or m["collapsed"]:
+            text += f" · dropped {dropped}, merged {m['collapsed']}"
+        self.tts_queue_label.setText(text)
+        color = "#e74c3c" if m["oldest_age"] > 3 else "#7f8c8d"
+        self.tts_queue_label.setStyleSheet(f"color: {color}; padding: 2px;")
 
     def _clear_current_word(self):
         """Clear the current word display"""
@@ -420,6 +461,7 @@ class TeacherPage(QWidget):
             self.student_listener.wait(500)
         if self.tts_engine:
             self.tts_engine.stop()
+        self.stop_recorder()
 
     def create_session(self):
         self.session_code = str(random.randint(100000, 999999))
@@ -447,6 +489,8 @@ class TeacherPage(QWidget):
             )
             self.stream.start()
             self.listening = True
+            if self.archive_enabled:
+                self.start_recorder()
             self.session_button.setText("Stop Listening")
             self.status_label.setText("🎧 Listening...")
         except Exception as e:
@@ -457,6 +501,7 @@ class TeacherPage(QWidget):
             self.stream.stop()
             self.stream.close()
         self.listening = False
+        self.stop_recorder()
         self.session_button.setText("Start Listening")
         self.status_label.setText("Session stopped")
 
@@ -466,9 +511,13 @@ class TeacherPage(QWidget):
     def process_audio(self):
         while not audio_queue.empty() and self.listening:
             data = audio_queue.get()
+            if self.recorder:
+                self.recorder.write(data)
             if recognizer.AcceptWaveform(data):
                 result = json.loads(recognizer.Result())
                 text = result.get("text", "")
+                if self.recorder:
+                    self.recorder.mark_segment(text)
                 if text:
                     self.current_transcript = text
                     self.teacher_transcript_label.setText(text)
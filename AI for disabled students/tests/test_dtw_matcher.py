@@ -0,0 +1,52 @@
+"""Pruned search and confidence checks for sign lang/dtw_matcher.py
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, "sign lang"))
+
+from dtw_matcher import DTWMatcher
+from synthetic_landmarks import synthetic_dataset
+
+
+def library(size=200):
+    windows, labels = synthetic_dataset(size, seed=size)
+    matcher = DTWMatcher(budget=None)
+    matcher.add(labels, windows)
+    return matcher
+
+
+def test_pruned_matches_exhaustive():
+    matcher = library()
+    queries, _ = synthetic_dataset(120, seed=12345)
+    for query in queries:
+        label, distance = matcher.match(query)
+        expected_label, expected_distance = matcher.exhaustive(query)
+        assert label == expected_label
+        assert np.isclose(distance, expected_distance, rtol=1e-5)
+
+
+def test_calibrated_confidence_rejects_noise():
+    matcher = library()
+    queries, labels = synthetic_dataset(50, seed=7)
+    accepted = sum(matcher.predict(query)[0] == label for query, label in zip(queries, labels))
+    assert matcher.max_distance is not None
+    assert accepted >= 45
+
+    noise = np.random.default_rng(0).random(queries[0].shape, dtype=np.float32)
+    assert matcher.predict(noise) == ("", 0.0)
+
+
+def test_library_without_threshold_is_calibrated_on_load(tmp_path):
+    path = str(tmp_path / "templates.npz")
+    library(50).save(path)
+    matcher = DTWMatcher.load(path)
+    assert matcher.max_distance is None
+    noise = np.random.default_rng(1).random((20, 63), dtype=np.float32)
+    assert matcher.predict(noise) == ("", 0.0)
+    assert matcher.max_distance is not None
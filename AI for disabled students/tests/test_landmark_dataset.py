@@ -0,0 +1,90 @@
+"""Round trip and merge checks for sign lang/landmark_dataset.py
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, "sign lang"))
+
+from landmark_dataset import DatasetWriter, LandmarkDataset, merge
+
+
+def windows(count, length=20, features=63, seed=0):
+    return np.random.default_rng(seed).random((count, length, features), dtype=np.float32)
+
+
+def write(path, data, labels, **kwargs):
+    with DatasetWriter(str(path), data.shape[1], data.shape[2], **kwargs) as writer:
+        writer.append_batch(data[:-1], labels[:-1])
+        writer.append(data[-1], labels[-1])
+
+
+def test_round_trip(tmp_path):
+    data = windows(10)
+    labels = ["HELLO", "YES"] * 5
+    write(tmp_path / "a", data, labels)
+
+    dataset = LandmarkDataset(str(tmp_path / "a"))
+    assert len(dataset) == 10
+    np.testing.assert_array_equal(dataset.windows, data)
+    assert list(dataset.label_strings()) == labels
+    assert dataset.counts() == {"HELLO": 5, "YES": 5}
+
+
+def test_reopen_appends(tmp_path):
+    write(tmp_path / "a", windows(4), ["A"] * 4)
+    write(tmp_path / "a", windows(3, seed=1), ["B"] * 3)
+    dataset = LandmarkDataset(str(tmp_path / "a"))
+    assert len(dataset) == 7
+    np.testing.assert_array_equal(dataset.windows[4:], windows(3, seed=1))
+
+
+def test_append_batch_rejects_wrong_shape(tmp_path):
+    with DatasetWriter(str(tmp_path / "a")) as writer:
+        with pytest.raises(ValueError):
+            writer.append_batch(windows(2, length=30), ["A", "B"])
+        with pytest.raises(ValueError):
+            writer.append_batch(windows(2), ["A"])
+        assert writer.index["count"] == 0
+    assert len(LandmarkDataset(str(tmp_path / "a"))) == 0
+
+
+def test_merge(tmp_path):
+    write(tmp_path / "a", windows(4), ["A"] * 4)
+    write(tmp_path / "b", windows(6, seed=1), ["B"] * 6)
+    merge([str(tmp_path / "a"), str(tmp_path / "b")], str(tmp_path / "out"))
+
+    merged = LandmarkDataset(str(tmp_path / "out"))
+    assert len(merged) == 10
+    np.testing.assert_array_equal(merged.windows, np.concatenate([windows(4), windows(6, seed=1)]))
+    assert merged.counts() == {"A": 4, "B": 6}
+
+
+def test_merge_rejects_other_window_shape(tmp_path):
+    write(tmp_path / "a", windows(10), ["A"] * 10)
+    write(tmp_path / "b", windows(10, length=30), ["B"] * 10)
+    with pytest.raises(ValueError):
+        merge([str(tmp_path / "a"), str(tmp_path / "b")], str(tmp_path / "out"))
+    assert not os.path.exists(tmp_path / "out")
+
+
+def test_append_after_rejected_frame(tmp_path):
+    data = windows(3)
+    with DatasetWriter(str(tmp_path / "a"), frame_shape=(4, 4, 3)) as writer:
+        writer.append(data[0], "A", np.zeros((4, 4, 3), np.uint8))
+        with pytest.raises(ValueError):
+            writer.append(data[1], "B", np.zeros((2, 2, 3), np.uint8))
+        with pytest.raises(ValueError):
+            writer.append(data[1], "B", None)
+        writer.append(data[2], "C", np.full((4, 4, 3), 7, np.uint8))
+
+    dataset = LandmarkDataset(str(tmp_path / "a"))
+    np.testing.assert_array_equal(dataset.windows, data[[0, 2]])
+    assert list(dataset.label_strings()) == ["A", "C"]
+    assert dataset.frames[1].max() == 7
+    assert "B" not in dataset.label_names
@@ -0,0 +1,118 @@
+import os
+import queue
+import threading
+import time
+
+# Previous transcripts are moved here, next to the live file (git-ignored)
+ARCHIVE_DIR = "transcript_archive"
+
+# ==========================================================
+# Buffered Background Transcript Writer
+# ==========================================================
+class TranscriptWriter:
+    """Append transcript text from a background thread.
+
+    write() only puts text in a bounded in-memory queue, so recognition
+    loops never touch the disk. The writer thread flushes once flush_bytes
+    are buffered or flush_interval seconds have passed, and fsyncs on
+    close(). An existing transcript with entries is kept as
+    transcript_archive/<name>.<YYYYmmdd-HHMMSS><ext> rather than overwritten;
+    one holding only the header is simply started over.
+    """
+
+    def __init__(self, path, header="", max_pending=1024, flush_bytes=4096, flush_interval=1.0,
+                 rotate=True):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self.rotated_to = rotate_transcript(path, header) if rotate else None
+
+        # After rotation whatever is left at path has no entries
+        self.file = open(path, "w" if rotate else "a", encoding="utf-8")
+        if header:
+            self.file.write(header)
+            self.file.flush()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def write(self, text):
+        """Queue text for the file - NON-BLOCKING; drops it if the queue is full"""
+        try:
+            self.pending.put_nowait(text)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Write everything queued, fsync and close the file"""
+        if not self.thread.is_alive():
+            return
+        try:
+            self.pending.put(None, timeout=timeout)
+        except queue.Full:
+            print(f"Transcript writer for {self.path} is stuck; closing without final flush")
+            return
+        self.thread.join(timeout)
+
+    def _writer_loop(self):
+        buffer = []
+        buffered = 0
+        last_flush = time.monotonic()
+        closing = False
+        while not closing:
+            timeout = max(0.0, last_flush + self.flush_interval - time.monotonic())
+            try:
+                text = self.pending.get(timeout=timeout)
+                if text is None:
+                    closing = True
+                else:
+                    buffer.append(text)
+                    buffered += len(text)
+            except queue.Empty:
+                pass
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if buffer and (closing or due or buffered >= self.flush_bytes):
+                try:
+                    self.file.write("".join(buffer))
+                    self.file.flush()
+                except OSError as e:
+                    print(f"Transcript write error: {e}")
+                buffer.clear()
+                buffered = 0
+            if due or closing:
+                last_flush = time.monotonic()
+
+        try:
+            os.fsync(self.file.fileno())
+        except OSError as e:
+            print(f"Transcript fsync error: {e}")
+        self.file.close()
+
+
+def rotate_transcript(path, header=""):
+    """Move a transcript with entries into ARCHIVE_DIR with its last-modified time.
+
+    Returns the new path, or None when there was nothing to keep (no file,
+    or nothing in it but header and whitespace).
+    """
+    if not os.path.exists(path):
+        return None
+    size = os.path.getsize(path)
+    if size <= len(header.encode("utf-8")) + 64:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            if not f.read().replace(header, "", 1).strip():
+                return None
+    folder, name = os.path.split(path)
+    archive = os.path.join(folder, ARCHIVE_DIR)
+    os.makedirs(archive, exist_ok=True)
+    root, ext = os.path.splitext(os.path.join(archive, name))
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(os.path.getmtime(path)))
+    target = f"{root}.{stamp}{ext}"
+    counter = 1
+    while os.path.exists(target):
+        target = f"{root}.{stamp}-{counter}{ext}"
+        counter += 1
+    os.replace(path, target)
+    return target
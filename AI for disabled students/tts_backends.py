@@ -0,0 +1,294 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+# ==========================================================
+# Text-to-Speech Backends
+# ==========================================================
+# Every backend implements speak(text, on_done) and must call on_done()
+# exactly once, when the utterance has actually finished playing.
+# open()/close() run on the TTS worker thread, so backends that need
+# per-thread setup (COM apartments, driver loops) do it there.
+# Backends that can render to memory also implement synthesize(), which
+# lets the engine cache clips and play them without re-synthesizing.
+
+class AudioClip:
+    """Mono int16 PCM audio rendered by a backend"""
+
+    def __init__(self, pcm, samplerate):
+        self.pcm = pcm
+        self.samplerate = samplerate
+
+    @property
+    def duration(self):
+        return len(self.pcm) / 2 / self.samplerate
+
+    @classmethod
+    def from_wav(cls, data):
+        """Decode a mono 16-bit WAV file held in memory"""
+        with wave.open(io.BytesIO(data)) as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                return None
+            return cls(wav.readframes(wav.getnframes()), wav.getframerate())
+
+
+class TTSBackend:
+    name = "base"
+
+    def open(self):
+        """Prepare the backend on the thread that will speak"""
+
+    def begin(self):
+        """Called when the next utterance is dequeued, before speak() or synthesis"""
+
+    def speak(self, text, on_done):
+        """Speak text and call on_done() when playback has finished (default: say nothing)"""
+        on_done()
+
+    def synthesize(self, text):
+        """Render text to an AudioClip, or None if the backend cannot"""
+        return None
+
+    def stop(self):
+        """Interrupt the current utterance if possible"""
+
+    def close(self):
+        """Release backend resources"""
+
+
+class SapiBackend(TTSBackend):
+    """Windows SAPI voice via win32com"""
+    name = "sapi"
+    SVSF_ASYNC = 1
+    SVSF_PURGE_BEFORE_SPEAK = 2
+    SAFT_22KHZ_16BIT_MONO = 22
+
+    def __init__(self):
+        self.speaker = None
+        self.interrupted = threading.Event()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        if sys.platform != "win32":
+            return False
+        try:
+            import win32com.client  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def open(self):
+        import pythoncom
+        import win32com.client
+        # COM objects belong to the apartment of the thread that created them
+        pythoncom.CoInitialize()
+        self.speaker = win32com.client.Dispatch("SAPI.SpVoice")
+
+    def begin(self):
+        # Forget stops meant for earlier utterances; one from here on applies
+        with self.lock:
+            self.interrupted.clear()
+
+    def speak(self, text, on_done):
+        if self.interrupted.is_set():
+            on_done()
+            return
+        self.speaker.Speak(text, self.SVSF_ASYNC)
+        # Wait in short slices so a stop() request is acted on here, in the
+        # voice's own apartment
+        while not self.speaker.WaitUntilDone(50):
+            if self.interrupted.is_set():
+                self.speaker.Speak("", self.SVSF_ASYNC | self.SVSF_PURGE_BEFORE_SPEAK)
+                break
+        on_done()
+
+    def synthesize(self, text):
+        import win32com.client
+        audio_format = win32com.client.Dispatch("SAPI.SpAudioFormat")
+        audio_format.Type = self.SAFT_22KHZ_16BIT_MONO
+        stream = win32com.client.Dispatch("SAPI.SpMemoryStream")
+        stream.Format = audio_format
+        output = self.speaker.AudioOutputStream
+        self.speaker.AudioOutputStream = stream
+        try:
+            self.speaker.Speak(text, 0)
+        finally:
+            self.speaker.AudioOutputStream = output
+        return AudioClip(bytes(stream.GetData()), 22050)
+
+    def stop(self):
+        # Called from the GUI thread: only flag it, speak() purges the voice
+        with self.lock:
+            self.interrupted.set()
+
+    def close(self):
+        import pythoncom
+        self.speaker = None
+        pythoncom.CoUninitialize()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """pyttsx3 driver (espeak-ng on Linux, NSSpeech on macOS, SAPI on Windows)"""
+    name = "pyttsx3"
+
+    def __init__(self):
+        self.engine = None
+        self.on_done = None
+
+    @staticmethod
+    def available():
+        try:
+            import pyttsx3  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def open(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.connect("finished-utterance", self._on_finished)
+
+    def _on_finished(self, name, completed):
+        if self.on_done:
+            on_done, self.on_done = self.on_done, None
+            on_done()
+
+    def speak(self, text, on_done):
+        self.on_done = on_done
+        self.engine.say(text)
+        self.engine.runAndWait()
+        # Some drivers skip the callback for interrupted utterances
+        self._on_finished(None, False)
+
+    def synthesize(self, text):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            with open(path, "rb") as f:
+                return AudioClip.from_wav(f.read())
+        finally:
+            os.remove(path)
+
+    def stop(self):
+        if self.engine:
+            self.engine.stop()
+
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng command line synthesizer"""
+    name = "espeak-ng"
+
+    def __init__(self, voice="en-us", words_per_minute=170):
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.voice = voice
+        self.words_per_minute = words_per_minute
+        self.process = None
+
+    @staticmethod
+    def available():
+        return bool(shutil.which("espeak-ng") or shutil.which("espeak"))
+
+    def speak(self, text, on_done):
+        self.process = subprocess.Popen(
+            [self.executable, "-v", self.voice, "-s", str(self.words_per_minute), text],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.process.wait()
+        self.process = None
+        on_done()
+
+    def synthesize(self, text):
+        result = subprocess.run(
+            [self.executable, "--stdout", "-v", self.voice, "-s", str(self.words_per_minute), text],
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            return None
+        return AudioClip.from_wav(result.stdout)
+
+    def stop(self):
+        process = self.process
+        if process and process.poll() is None:
+            process.terminate()
+
+
+class FakeBackend(TTSBackend):
+    """In-memory backend for tests and benchmarks - records instead of playing.
+
+    Utterance length is simulated as startup + seconds_per_char * len(text)
+    and on_done() fires from a timer thread, like a real audio device would.
+    """
+    name = "fake"
+    samplerate = 16000
+
+    def __init__(self, startup=0.0, seconds_per_char=0.0):
+        self.startup = startup
+        self.seconds_per_char = seconds_per_char
+        self.spoken = []
+        self.synthesized = []
+        self.timer = None
+        self.pending = None  # on_done of the utterance still "playing"
+        self.lock = threading.Lock()
+
+    def duration(self, text):
+        return self.startup + self.seconds_per_char * len(text)
+
+    def speak(self, text, on_done):
+        self.spoken.append((time.perf_counter(), text))
+        duration = self.duration(text)
+        if duration <= 0:
+            on_done()
+            return
+        with self.lock:
+            self.pending = on_done
+        self.timer = threading.Timer(duration, self._finish)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _finish(self):
+        """Call the pending on_done once, from the timer or from stop()"""
+        with self.lock:
+            on_done, self.pending = self.pending, None
+        if on_done:
+            on_done()
+
+    def synthesize(self, text):
+        # Rendering pays the start-up cost; the clip holds only the speech itself
+        self.synthesized.append(text)
+        if self.startup > 0:
+            time.sleep(self.startup)
+        frames = int(self.seconds_per_char * len(text) * self.samplerate)
+        return AudioClip(bytes(frames * 2), self.samplerate)
+
+    def stop(self):
+        if self.timer:
+            self.timer.cancel()
+        self._finish()
+
+
+BACKENDS = {
+    SapiBackend.name: SapiBackend,
+    Pyttsx3Backend.name: Pyttsx3Backend,
+    EspeakBackend.name: EspeakBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+def create_backend(name=None):
+    """Create the named backend, or the best one available on this platform"""
+    if name:
+        return BACKENDS[name]()
+    for backend_class in (SapiBackend, Pyttsx3Backend, EspeakBackend):
+        if backend_class.available():
+            return backend_class()
+    print("TTS: no speech backend found - words will be recorded silently")
+    return FakeBackend()
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+
+# sounddevice is already needed for the teacher microphone, but keep the
+# cache importable (benchmarks, tests) on machines without PortAudio
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    sd = None
+
+# ==========================================================
+# Pre-Synthesized TTS Clip Cache
+# ==========================================================
+class TTSAudioCache:
+    """LRU of rendered AudioClips keyed by phrase, capped by total PCM bytes"""
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.clips = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return " ".join(text.upper().split())
+
+    def get(self, text):
+        """Return the cached clip for text and mark it recently used"""
+        key = self.key(text)
+        clip = self.clips.get(key)
+        if clip is None:
+            self.misses += 1
+            return None
+        self.clips.move_to_end(key)
+        self.hits += 1
+        return clip
+
+    def peek(self, text):
+        """Return the cached clip without touching LRU order or statistics"""
+        return self.clips.get(self.key(text))
+
+    def put(self, text, clip):
+        """Store a clip, evicting least recently used clips over the size cap"""
+        key = self.key(text)
+        old = self.clips.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old.pcm)
+        if len(clip.pcm) > self.max_bytes:
+            return
+        self.clips[key] = clip
+        self.total_bytes += len(clip.pcm)
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self.clips.popitem(last=False)
+            self.total_bytes -= len(evicted.pcm)
+
+    def __contains__(self, text):
+        return self.key(text) in self.clips
+
+    def __len__(self):
+        return len(self.clips)
+
+# ==========================================================
+# Clip Players
+# ==========================================================
+class AudioPlayer:
+    """Play cached clips straight to the default output device.
+
+    The stream belongs to the TTS worker thread: begin(), play() and
+    close() run there, and stop() (from any thread) only sets a flag that
+    play() checks between chunks.
+    """
+
+    CHUNK_SECONDS = 0.05
+
+    def __init__(self):
+        self.stream = None
+        self.interrupted = threading.Event()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        return sd is not None
+
+    def begin(self):
+        """Called when the next utterance is dequeued: forget stops meant for earlier ones"""
+        with self.lock:
+            self.interrupted.clear()
+
+    def play(self, clip, on_done):
+        """Write the clip in chunks and return once it has played; on_done() when finished or stopped.
+
+        A stop() since the last begin() cuts the clip short, even one that
+        came before play() started.
+        """
+        try:
+            if self.stream is None or self.stream.samplerate != clip.samplerate:
+                self.close()
+                # Kept open between clips so playback starts without device set-up
+                self.stream = sd.RawOutputStream(samplerate=clip.samplerate, channels=1, dtype="int16")
+            if not self.stream.active:
+                self.stream.start()
+            pcm = memoryview(clip.pcm)
+            chunk = int(clip.samplerate * self.CHUNK_SECONDS) * 2
+            for start in range(0, len(pcm), chunk):
+                if self.interrupted.is_set():
+                    self.stream.abort()  # Drop what is still buffered
+                    return
+                self.stream.write(pcm[start:start + chunk])
+            self.stream.stop()  # Returns once the buffered audio has played
+        finally:
+            on_done()
+
+    def stop(self):
+        """Cut the current clip short - safe from any thread"""
+        with self.lock:
+            self.interrupted.set()
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+class FakePlayer:
+    """Record played clips and complete after their real duration (tests/benchmarks)"""
+
+    def __init__(self):
+        self.played = []
+        self.timer = None
+        self.pending = None  # on_done of the clip still "playing"
+        self.interrupted = False
+        self.lock = threading.Lock()
+
+    def begin(self):
+        with self.lock:
+            self.interrupted = False
+
+    def play(self, clip, on_done):
+        with self.lock:
+            if self.interrupted:
+                on_done()
+                return
+            self.pending = on_done
+        self.played.append(clip)
+        self.timer = threading.Timer(clip.duration, self._finish)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _finish(self):
+        """Call the pending on_done once, from the timer or from stop()"""
+        with self.lock:
+            on_done, self.pending = self.pending, None
+        if on_done:
+            on_done()
+
+    def stop(self):
+        with self.lock:
+            self.interrupted = True
+        if self.timer:
+            self.timer.cancel()
+        self._finish()
+
+    def close(self):
+        pass
@@ -0,0 +1,195 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from tts_backends import AudioClip, create_backend
+from tts_scheduler import PRIORITY_GESTURE, SpeechScheduler
+
+# Characters that end an utterance straight away
+FLUSH_PUNCTUATION = ".!?;:,"
+
+# Rough live-speech cost used to budget the queue when no clip is cached
+ESTIMATED_STARTUP_SECONDS = 0.25
+ESTIMATED_SECONDS_PER_CHAR = 0.07
+
+# ==========================================================
+# Event-Driven Text-to-Speech Engine with Phrase Coalescing
+# ==========================================================
+class TextToSpeechEngine:
+    def __init__(self, backend=None, on_start=None, on_finish=None,
+                 coalesce_window=0.3, max_coalesce_delay=1.0, max_phrase_words=12,
+                 cache=None, player=None, vocabulary=(), max_age=None, max_queued_seconds=12.0):
+        self.backend = backend or create_backend()
+        # With a cache and a player, phrases are rendered once and replayed as PCM
+        self.cache = cache if player is not None else None
+        self.player = player
+        self.prerender_queue = list(vocabulary) if self.cache is not None else []
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.scheduler = SpeechScheduler(self._estimate_seconds, max_age, max_queued_seconds)
+        self.is_speaking = False
+        self.running = True
+        self.max_utterance_seconds = 30  # Safety net if a backend never reports completion
+
+        # Coalescing: items arriving within coalesce_window of each other are
+        # spoken as one utterance, but the first item never waits longer than
+        # max_coalesce_delay. A window of 0 speaks every item on its own.
+        self.coalesce_window = coalesce_window
+        self.max_coalesce_delay = max_coalesce_delay
+        self.max_phrase_words = max_phrase_words
+
+        # Arrival -> audible start latency per item, and total time spent speaking
+        self.start_latencies = deque(maxlen=500)
+        self.speaking_time = 0.0
+        self.utterance_count = 0
+
+        self.processing_thread = None
+        self.start_processing()
+
+    def start_processing(self):
+        """Start the background processing thread"""
+        self.processing_thread = threading.Thread(target=self._process_queue, daemon=True)
+        self.processing_thread.start()
+
+    def _next_utterance(self):
+        """Block for the next item, then coalesce followers of the same priority into one phrase"""
+        first = self.scheduler.get()
+        if first is None:
+            return None
+        text, first_arrival, priority = first
+        items = [(text, first_arrival)]
+        word_count = len(text.split())
+        while self.coalesce_window > 0:
+            last_text, last_arrival = items[-1]
+            if last_text[-1] in FLUSH_PUNCTUATION or word_count >= self.max_phrase_words:
+                break
+            deadline = min(last_arrival + self.coalesce_window,
+                           first_arrival + self.max_coalesce_delay)
+            timeout = deadline - time.perf_counter()
+            try:
+                # Another priority ends the phrase: a chat message is never
+                # joined with gesture words, and keeps its place at the front
+                if timeout > 0:
+                    item = self.scheduler.get(timeout=timeout, priority=priority)
+                else:
+                    # Window closed - still take anything that queued up while speaking
+                    item = self.scheduler.get_nowait(priority=priority)
+            except queue.Empty:
+                break
+            if item is None:
+                break  # Stopped - the main loop sees None on its next get()
+            items.append(item[:2])
+            word_count += len(item[0].split())
+        return items
+
+    def _process_queue(self):
+        """Speak queued phrases back to back - sleeps on the queue while idle"""
+        try:
+            self.backend.open()
+        except Exception as e:
+            print(f"TTS backend error: {e}")
+            return
+        while self.running:
+            if self.prerender_queue and self.scheduler.qsize() == 0:
+                # Render the known vocabulary while idle, one phrase at a time
+                self._cached_clip(self.prerender_queue.pop(0))
+                continue
+            items = self._next_utterance()
+            if items is None:
+                break
+            # A stop() from here on applies to this utterance
+            self.backend.begin()
+            if self.player:
+                self.player.begin()
+            text = " ".join(item_text for item_text, _ in items)
+            self.is_speaking = True
+            done = threading.Event()
+            started = time.perf_counter()
+            try:
+                clip = self._utterance_clip(items)
+                started = time.perf_counter()
+                if self.on_start:
+                    self.on_start(text)
+                for _, arrival in items:
+                    self.start_latencies.append(started - arrival)
+                if clip is not None:
+                    self.player.play(clip, done.set)
+                else:
+                    self.backend.speak(text, done.set)
+                if not done.wait(self.max_utterance_seconds):
+                    print(f"TTS Error: no completion for '{text}'")
+            except Exception as e:
+                print(f"TTS Error: {e}")
+            finally:
+                self.speaking_time += time.perf_counter() - started
+                self.utterance_count += 1
+                self.is_speaking = False
+                if self.on_finish:
+                    self.on_finish(text)
+        try:
+            if self.player:
+                self.player.close()
+            self.backend.close()
+        except Exception as e:
+            print(f"TTS backend error: {e}")
+
+    def _cached_clip(self, text):
+        """Return the clip for a phrase, rendering it the first time it is seen"""
+        clip = self.cache.get(text)
+        if clip is None:
+            try:
+                clip = self.backend.synthesize(text)
+            except Exception as e:
+                print(f"TTS render error: {e}")
+                clip = None
+            if clip is not None:
+                self.cache.put(text, clip)
+        return clip
+
+    def _utterance_clip(self, items):
+        """Join cached clips for every item, or None to fall back to live speech"""
+        if self.cache is None:
+            return None
+        clips = [self._cached_clip(item_text) for item_text, _ in items]
+        if any(clip is None for clip in clips):
+            return None
+        if len(clips) == 1:
+            return clips[0]
+        samplerate = clips[0].samplerate
+        if any(clip.samplerate != samplerate for clip in clips):
+            return None
+        return AudioClip(b"".join(clip.pcm for clip in clips), samplerate)
+
+    def _estimate_seconds(self, text):
+        """Expected audio length of a phrase, exact when its clip is cached"""
+        clip = self.cache.peek(text) if self.cache is not None else None
+        if clip is not None:
+            return clip.duration
+        return ESTIMATED_STARTUP_SECONDS + ESTIMATED_SECONDS_PER_CHAR * len(text)
+
+    def speak(self, text, priority=PRIORITY_GESTURE):
+        """Add a word or phrase to the queue for speaking - NON-BLOCKING"""
+        text = " ".join(text.split())
+        if len(text) > 1:
+            self.scheduler.put(text, priority)
+
+    def pending(self):
+        """Number of words or phrases waiting to be spoken"""
+        return self.scheduler.qsize()
+
+    def queue_metrics(self):
+        """Queue depth/age snapshot plus the most recent wait before speech"""
+        metrics = self.scheduler.metrics()
+        metrics["last_latency"] = self.start_latencies[-1] if self.start_latencies else 0.0
+        return metrics
+
+    def stop(self):
+        """Stop the TTS engine"""
+        self.running = False
+        self.scheduler.close()  # Wake the worker so it can exit
+        self.backend.stop()
+        if self.player:
+            self.player.stop()
+        if self.processing_thread:
+            self.processing_thread.join(timeout=1.0)
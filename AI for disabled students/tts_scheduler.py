@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+
+# Lower number = spoken first
+PRIORITY_CHAT = 0
+PRIORITY_GESTURE = 1
+
+# ==========================================================
+# Bounded-Latency Speech Scheduler
+# ==========================================================
+class SpeechScheduler:
+    """Priority queue for TTS items that keeps speech close to real time.
+
+    - chat messages are spoken before gesture words
+    - gesture items older than max_age are dropped instead of spoken late
+    - a phrase that is already waiting is not queued twice; it keeps its
+      first arrival time, so its age and latency are what the student waited
+    - the estimated audio waiting in the queue never exceeds max_queued_seconds;
+      the oldest, lowest-priority items make room for new ones
+    """
+
+    def __init__(self, estimate_seconds, max_age=None, max_queued_seconds=12.0):
+        self.estimate_seconds = estimate_seconds
+        self.max_age = max_age if max_age is not None else {PRIORITY_CHAT: None, PRIORITY_GESTURE: 6.0}
+        self.max_queued_seconds = max_queued_seconds
+        self.queues = {PRIORITY_CHAT: [], PRIORITY_GESTURE: []}
+        self.condition = threading.Condition()
+        self.queued_seconds = 0.0
+        self.closed = False
+
+        self.dropped_stale = 0
+        self.dropped_overflow = 0
+        self.collapsed = 0
+
+    def put(self, text, priority=PRIORITY_GESTURE):
+        """Queue an item - NON-BLOCKING; may collapse or evict other items"""
+        now = time.perf_counter()
+        with self.condition:
+            self._drop_stale(now)
+            items = self.queues[priority]
+            for item in items:
+                if item[0] == text:
+                    # Same phrase already waiting: keep its place and its age
+                    self.collapsed += 1
+                    return
+            seconds = self.estimate_seconds(text)
+            self._make_room(seconds, priority)
+            if self.queued_seconds + seconds > self.max_queued_seconds and any(self.queues.values()):
+                self.dropped_overflow += 1
+                return
+            items.append([text, now, seconds])
+            self.queued_seconds += seconds
+            self.condition.notify()
+
+    def get(self, timeout=None, priority=None):
+        """Return (text, arrival, priority) of the next item, or None once closed.
+
+        Blocks until an item is available; raises queue.Empty on timeout.
+        With a priority, also raises queue.Empty as soon as the next item
+        has a different priority (it stays queued).
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self.condition:
+            while True:
+                self._drop_stale(time.perf_counter())
+                for item_priority in sorted(self.queues):
+                    items = self.queues[item_priority]
+                    if items:
+                        if priority is not None and item_priority != priority:
+                            raise queue.Empty
+                        text, arrival, seconds = items.pop(0)
+                        self.queued_seconds -= seconds
+                        return text, arrival, item_priority
+                if self.closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self.condition.wait(remaining)
+
+    def get_nowait(self, priority=None):
+        return self.get(timeout=0, priority=priority)
+
+    def close(self):
+        """Wake any waiting consumer; get() returns None from now on"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def qsize(self):
+        with self.condition:
+            return sum(len(items) for items in self.queues.values())
+
+    def metrics(self):
+        """Snapshot of queue depth and age for display"""
+        now = time.perf_counter()
+        with self.condition:
+            arrivals = [item[1] for items in self.queues.values() for item in items]
+            return {
+                "items": len(arrivals),
+                "queued_seconds": max(0.0, self.queued_seconds),
+                "oldest_age": now - min(arrivals) if arrivals else 0.0,
+                "dropped_stale": self.dropped_stale,
+                "dropped_overflow": self.dropped_overflow,
+                "collapsed": self.collapsed,
+            }
+
+    def _drop_stale(self, now):
+        for priority, items in self.queues.items():
+            max_age = self.max_age.get(priority)
+            if max_age is None:
+                continue
+            # Items are in arrival order, so the stale ones are at the front
+            while items and now - items[0][1] > max_age:
+                self.queued_seconds -= items.pop(0)[2]
+                self.dropped_stale += 1
+
+    def _make_room(self, seconds, priority):
+        """Evict oldest items of equal or lower priority until seconds fit"""
+        for victim_priority in sorted(self.queues, reverse=True):
+            if victim_priority < priority:
+                break
+            items = self.queues[victim_priority]
+            while items and self.queued_seconds + seconds > self.max_queued_seconds:
+                evicted = items.pop(0)
+                self.queued_seconds -= evicted[2]
+                self.dropped_overflow += 1
@@ -0,0 +1,210 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ==========================================================
+# Building Blocks for the Threaded Camera Pipeline
+# ==========================================================
+class LatestSlot:
+    """Size-1 hand-off between pipeline stages where the newest item wins.
+
+    put() never blocks: an item the consumer has not taken yet is replaced
+    and counted as dropped. get() blocks until there is something new.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.item = None
+        self.has_item = False
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self.condition:
+            if self.has_item:
+                self.dropped += 1
+            self.item = item
+            self.has_item = True
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Return the newest item, or None on timeout or once closed"""
+        with self.condition:
+            if not self.has_item and not self.closed:
+                self.condition.wait(timeout)
+            if not self.has_item:
+                return None
+            item, self.item = self.item, None
+            self.has_item = False
+            return item
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class PreviewBuffers:
+    """Preallocated preview frames passed to the GUI thread, newest wins.
+
+    The producer fills a buffer from acquire() and publish()es it. A frame
+    the GUI has not taken yet goes back to the pool and counts as coalesced,
+    so at most one frame is ever pending. publish() returns True only when
+    nothing was pending, i.e. when the GUI needs a new notification. The GUI
+    take()s the pending buffer and release()s it once it has copied it.
+    Three buffers cover one being filled, one pending and one being shown.
+    """
+
+    def __init__(self, count=3):
+        self.count = count
+        self.lock = threading.Lock()
+        self.shape = None
+        self.free = []
+        self.pending = None
+        self.coalesced = 0
+
+    def acquire(self, shape):
+        """A free (height, width, 3) uint8 buffer, or None if all are in use"""
+        with self.lock:
+            if shape != self.shape:
+                # Buffers of the old size still out are dropped on release
+                self.shape = shape
+                self.free = [np.empty(shape, dtype=np.uint8) for _ in range(self.count)]
+            return self.free.pop() if self.free else None
+
+    def publish(self, buffer):
+        with self.lock:
+            notify = self.pending is None
+            if not notify:
+                self._recycle(self.pending)
+                self.coalesced += 1
+            self.pending = buffer
+            return notify
+
+    def take(self):
+        """The pending buffer (now owned by the caller), or None"""
+        with self.lock:
+            buffer, self.pending = self.pending, None
+            return buffer
+
+    def release(self, buffer):
+        with self.lock:
+            self._recycle(buffer)
+
+    def _recycle(self, buffer):
+        if buffer.shape == self.shape:
+            self.free.append(buffer)
+
+
+class StageStats:
+    """Frames-per-second meter for one pipeline stage"""
+
+    def __init__(self, name, interval=1.0):
+        self.name = name
+        self.interval = interval
+        self.fps = 0.0
+        self.count = 0
+        self.window_start = time.perf_counter()
+
+    def tick(self):
+        self.count += 1
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= self.interval:
+            self.fps = self.count / elapsed
+            self.count = 0
+            self.window_start = now
+
+
+class InferenceGovernor:
+    """Choose how often to run the detector from its measured CPU cost.
+
+    The stride is the smallest n such that running the detector on every
+    n-th captured frame keeps it within cpu_budget (share of one core).
+    A hand entering the frame or moving forces every frame to be processed
+    for boost_frames inferences, so responsiveness is kept where it matters.
+    """
+
+    def __init__(self, cpu_budget=0.5, max_stride=6, boost_frames=15, motion_threshold=0.08):
+        self.cpu_budget = cpu_budget
+        self.max_stride = max_stride
+        self.boost_frames = boost_frames
+        self.motion_threshold = motion_threshold
+        self.stride = 1
+        self.processing_time = 0.0  # Smoothed CPU seconds per inferred frame
+        self.frames_since_inference = 0
+        self.boost_remaining = 0
+        self.last_box = None
+
+    def should_infer(self):
+        """Call once per captured frame; True if the detector should run on it"""
+        self.frames_since_inference += 1
+        if self.boost_remaining > 0 or self.frames_since_inference >= self.stride:
+            self.frames_since_inference = 0
+            return True
+        return False
+
+    def record(self, cpu_seconds, capture_fps, hand_box):
+        """Update cost, motion and stride after an inference"""
+        self.processing_time = 0.8 * self.processing_time + 0.2 * cpu_seconds
+
+        entering = hand_box is not None and self.last_box is None
+        moving = False
+        if hand_box is not None and self.last_box is not None:
+            x, y, w, h = hand_box
+            px, py, pw, ph = self.last_box
+            shift = abs((x + w / 2) - (px + pw / 2)) + abs((y + h / 2) - (py + ph / 2))
+            moving = shift > self.motion_threshold * max(w + h, 1)
+        self.last_box = hand_box
+        if entering or moving:
+            self.boost_remaining = self.boost_frames
+        elif self.boost_remaining > 0:
+            self.boost_remaining -= 1
+
+        if capture_fps > 0:
+            budget_per_frame = self.cpu_budget / capture_fps
+            needed = int(self.processing_time / budget_per_frame) + 1
+            self.stride = max(1, min(self.max_stride, needed))
+
+
+class MotionGate:
+    """Skip the detector when the scene has not changed since it last ran.
+
+    Frames are reduced to a small grayscale thumbnail and compared with the
+    thumbnail of the last frame that was processed. Only when more than
+    changed_fraction of its pixels differ by over pixel_threshold does the
+    frame count as changed. A refresh is forced after max_skip frames.
+    """
+
+    def __init__(self, size=(80, 60), pixel_threshold=18, changed_fraction=0.01, max_skip=60):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.changed_fraction = changed_fraction
+        self.max_skip = max_skip
+        self.reference = None
+        self.skipped_in_row = 0
+        self.frames = 0
+        self.skipped = 0
+
+    def changed(self, frame):
+        """True if frame should be processed; False means reuse the last result"""
+        self.frames += 1
+        thumbnail = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.size,
+                               interpolation=cv2.INTER_AREA)
+        if self.reference is not None and self.skipped_in_row < self.max_skip:
+            diff = cv2.absdiff(thumbnail, self.reference)
+            moving = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255,
+                                                    cv2.THRESH_BINARY)[1])
+            if moving <= self.changed_fraction * diff.size:
+                self.skipped += 1
+                self.skipped_in_row += 1
+                return False
+        self.reference = thumbnail
+        self.skipped_in_row = 0
+        return True
+
+    @property
+    def skip_ratio(self):
+        return self.skipped / self.frames if self.frames else 0.0